@@ -1,3 +1,5 @@
+from .aio import AsyncRISC
 from .main import RISC
+from .utils import RiscAssessmentsError, RiscPageError
 
-__all__ = ["RISC"]
+__all__ = ["AsyncRISC", "RISC", "RiscAssessmentsError", "RiscPageError"]
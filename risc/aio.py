@@ -0,0 +1,728 @@
+# -*- coding: utf-8 -*-
+"""Define the RISC asyncio client module."""
+import asyncio
+import logging
+import os
+from collections import deque
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Deque,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Tuple,
+)
+
+from requests.models import Response
+
+from risc.cache import DiskCacheBackend, ResponseCache, TokenCache
+from risc.models import (
+    RiscAssessment,
+    RiscAssessments,
+    RiscDeviceConnectivity,
+    RiscDeviceConnectivityParent,
+    RiscStackConnectivityParent,
+    RiscStacks,
+)
+from risc.transport import RetryPolicy
+from risc.utils import build_auth_payload, decode_json, get_user_agent, page_records
+
+try:
+    import httpx
+except ImportError:  # pragma: no cover
+    httpx = None
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncRISC:
+    """Define the asyncio RISC client.
+
+    The client mirrors the RISC API surface of :class:`risc.main.RISC`, but every API method
+    is a coroutine. Requests share a pooled ``httpx.AsyncClient`` and are bounded by a semaphore,
+    so many stack and device queries can be fanned out concurrently from a single event loop.
+    Retries, re-authentication on 401 and the token and response caches behave as they do for
+    the synchronous client.
+
+    Example:
+        async with AsyncRISC() as risc:
+            summary = await risc.assets_get_summary()
+
+    """
+
+    def __init__(
+        self,
+        api_token: str = "",
+        user_id: str = "",
+        password: str = "",
+        max_concurrency: int = 0,
+        max_connections: int = 0,
+        client: Any = None,
+        token_cache: Any = None,
+        response_cache: Any = None,
+        retry_policy: Optional[RetryPolicy] = None,
+    ) -> None:
+        """Initialize the AsyncRISC class.
+
+        Args:
+            api_token (str): The RISC API token. Defaults to: RISC_API_TOKEN.
+            user_id (str): The RISC user ID. Defaults to: RISC_USERNAME.
+            password (str): The RISC user password. Defaults to: RISC_PASSWORD.
+            max_concurrency (int): The maximum number of requests in flight.
+                Defaults to: RISC_MAX_CONCURRENCY or 50.
+            max_connections (int): The maximum number of pooled connections.
+                Defaults to: RISC_MAX_CONNECTIONS or 100.
+            client (httpx.AsyncClient): A preconfigured HTTP client to use. Defaults to: None.
+            token_cache (TokenCache or bool): The token cache used to share authentication tokens
+                across processes. Pass True to use the default cache location.
+                Defaults to: enabled when RISC_TOKEN_CACHE is set.
+            response_cache (ResponseCache or bool): The cache used for read-only endpoints.
+                Pass True to use an in-memory cache. Defaults to: an in-memory cache backed by
+                disk when RISC_CACHE_DIR is set, otherwise disabled.
+            retry_policy (RetryPolicy): The retry policy applied to every request.
+                Defaults to: RetryPolicy(total=RISC_MAX_RETRIES or 3).
+
+        """
+        if httpx is None and client is None:
+            raise ImportError(
+                "httpx is currently not installed! Install risc[async] for AsyncRISC support!"
+            )
+
+        self.api_host: str = os.environ.get(
+            "RISC_API_HOST", "https://api.riscnetworks.com"
+        )
+        self.api_version: str = os.environ.get("RISC_API_VERSION", "1_0")
+        self.api_endpoint: str = os.environ.get(
+            "RISC_API_ENDPOINT", f"{self.api_host}/{self.api_version}"
+        )
+        self.assessment_code: str = os.environ.get("RISC_ASSESSMENT_CODE", "")
+        self.assessment_filters: Dict[str, str] = dict(
+            zip(*[iter(os.environ.get("RISC_ASSESSMENT_FILTERS", "").split(","))] * 2)
+        )
+        self.max_concurrency: int = max_concurrency or int(
+            os.environ.get("RISC_MAX_CONCURRENCY", "50")
+        )
+        self.max_connections: int = max_connections or int(
+            os.environ.get("RISC_MAX_CONNECTIONS", "100")
+        )
+
+        self.auth: Dict[str, str] = {
+            "user_id": user_id or os.environ.get("RISC_USERNAME", ""),
+            "password": password or os.environ.get("RISC_PASSWORD", ""),
+            "api_token": api_token or os.environ.get("RISC_API_TOKEN", ""),
+        }
+        self.token: str = ""
+        self.assessment: Optional[RiscAssessment] = None
+        if token_cache is True or (
+            token_cache is None and os.environ.get("RISC_TOKEN_CACHE")
+        ):
+            token_cache = TokenCache()
+        self.token_cache: Optional[TokenCache] = token_cache or None
+        if response_cache is None and os.environ.get("RISC_CACHE_DIR"):
+            response_cache = ResponseCache(backend=DiskCacheBackend())
+        elif response_cache is True:
+            response_cache = ResponseCache()
+        self.response_cache: Optional[ResponseCache] = response_cache or None
+        self.retry_policy: RetryPolicy = retry_policy or RetryPolicy(
+            total=int(os.environ.get("RISC_MAX_RETRIES", "3"))
+        )
+        self.stack_data: Dict[str, Any] = {}
+        self.stacks: RiscStacks = RiscStacks()
+        self.client = client or httpx.AsyncClient(
+            headers={"User-Agent": get_user_agent()},
+            limits=httpx.Limits(
+                max_connections=self.max_connections,
+                max_keepalive_connections=self.max_connections,
+            ),
+        )
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._auth_lock: Optional[asyncio.Lock] = None
+
+    def __repr__(self):
+        """Provide the representation for the AsyncRISC object."""
+        if self.assessment_code:
+            return f"<AsyncRISC - User: {self.auth.get('user_id', '')} - Assessment: {self.assessment_code}>"
+        return f"<AsyncRISC - User: {self.auth.get('user_id', '')}>"
+
+    async def __aenter__(self) -> "AsyncRISC":
+        """Connect the client when entering the async context."""
+        await self.connect()
+        return self
+
+    async def __aexit__(self, *args) -> None:
+        """Close the client when exiting the async context."""
+        await self.close()
+
+    @property
+    def semaphore(self) -> asyncio.Semaphore:
+        """Get the semaphore bounding the number of concurrent requests."""
+        # Created lazily, so the semaphore is bound to the running event loop.
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._semaphore
+
+    @property
+    def auth_lock(self) -> asyncio.Lock:
+        """Get the lock serializing authentication."""
+        if self._auth_lock is None:
+            self._auth_lock = asyncio.Lock()
+        return self._auth_lock
+
+    @property
+    def auth_headers(self) -> Dict[str, str]:
+        """Get the headers used to authenticate requests against the RISC API."""
+        headers: Dict[str, str] = {}
+        if self.token:
+            headers["token"] = self.token
+        if self.assessment_code:
+            headers["assessmentcode"] = self.assessment_code
+        return headers
+
+    async def connect(self) -> None:
+        """Resolve the assessment, authenticate and fetch the stack summary."""
+        if not await self.authenticate():
+            return
+
+        try:
+            self.stack_data = decode_json(
+                await self.stacks_get_summary(use_cache=False)
+            )
+            self.stacks = RiscStacks(stacks=self.stack_data.get("assets", []))
+        except Exception as e:
+            logger.error(
+                "Error encountered while attempting to fetch RISC stack data! Error: (%s)"
+                % e
+            )
+
+    async def close(self) -> None:
+        """Close the underlying HTTP connection pool."""
+        await self.client.aclose()
+
+    async def authenticate(self) -> str:
+        """Resolve the assessment code and fetch the authentication token.
+
+        Returns:
+            str: The authentication token, or an empty string if authentication failed.
+
+        """
+        async with self.auth_lock:
+            return await self._authenticate()
+
+    async def _authenticate(self) -> str:
+        """Authenticate while holding the authentication lock."""
+        if self.assessment_filters and self.assessment is None:
+            self.assessment = await self.get_assessment(**self.assessment_filters)
+            self.assessment_code = self.assessment.assessment_code
+
+        if not self.assessment_code:
+            logger.error("You must configure the assessment code or filter criteria!")
+            return ""
+
+        user_id: str = self.auth.get("user_id", "")
+        if self.token_cache:
+            self.token = self.token_cache.get(user_id, self.assessment_code)
+            if self.token:
+                return self.token
+
+        self.token = await self.get_auth_token()
+        if self.token and self.token_cache:
+            self.token_cache.set(user_id, self.assessment_code, self.token)
+        return self.token
+
+    async def reauthenticate(self, stale_token: str = "") -> str:
+        """Discard the current token and authenticate again.
+
+        Args:
+            stale_token (str): The token that was rejected. If another task already replaced it,
+                the new token is reused instead of authenticating again.
+
+        Returns:
+            str: The new authentication token.
+
+        """
+        async with self.auth_lock:
+            if stale_token and self.token != stale_token:
+                return self.token
+            if self.token_cache:
+                self.token_cache.invalidate(
+                    self.auth.get("user_id", ""),
+                    self.assessment_code,
+                    stale_token=stale_token or self.token,
+                )
+            self.token = ""
+            return await self._authenticate()
+
+    async def _request(
+        self,
+        method: str,
+        url: str,
+        headers: Optional[Dict[str, str]] = None,
+        authenticated: bool = True,
+        use_cache: bool = False,
+        **kwargs,
+    ) -> Any:
+        """Send a request to the RISC API.
+
+        A 401 response triggers a single re-authentication and retry, as it does for the
+        synchronous client.
+
+        Args:
+            method (str): The HTTP method to use.
+            url (str): The full URL to request.
+            headers (dict): The additional headers to send with this request only.
+            authenticated (bool): Whether or not to include the authentication headers.
+                Defaults to: True.
+            use_cache (bool): Whether or not to serve the GET request from the response cache,
+                if one is configured. Defaults to: False.
+            **kwargs: The additional keyword arguments passed to the HTTP client request.
+
+        Returns:
+            httpx.Response: The response returned by the RISC API.
+
+        """
+        cache_key: str = ""
+        # The key differs from the RISC one, as a shared disk cache restores httpx responses.
+        if use_cache and self.response_cache and method.upper() == "GET":
+            cache_key = (
+                f"aio:{self.assessment_code}:{method.upper()}:{url}:{headers or {}}"
+            )
+            cached: Any = self.response_cache.get(cache_key)
+            if cached is not None:
+                return cached
+
+        request_headers: Dict[str, str] = self.auth_headers if authenticated else {}
+        request_headers.update(headers or {})
+        response = await self._send(method, url, headers=request_headers, **kwargs)
+
+        # The token expired or was revoked, so authenticate again and retry once.
+        if authenticated and response.status_code == 401 and self.token:
+            logger.info("Authentication token rejected! Re-authenticating...")
+            if await self.reauthenticate(stale_token=request_headers.get("token", "")):
+                request_headers.update(self.auth_headers)
+                response = await self._send(
+                    method, url, headers=request_headers, **kwargs
+                )
+
+        if cache_key and self.response_cache and response.status_code == 200:
+            self.response_cache.set(cache_key, response)
+        return response
+
+    async def _send(self, method: str, url: str, **kwargs) -> Any:
+        """Send a single request, bounded by the client semaphore and the retry policy.
+
+        The semaphore is released while backing off, so a retrying request doesn't hold a
+        slot other requests could use.
+
+        Returns:
+            httpx.Response: The final response returned by the RISC API.
+
+        """
+        attempt = 0
+        while True:
+            try:
+                async with self.semaphore:
+                    response = await self.client.request(method, url, **kwargs)
+            except Exception as e:
+                if not self.retry_policy.should_retry(method, attempt, error=e):
+                    raise
+                delay = self.retry_policy.backoff(attempt)
+                logger.warning(
+                    "Request failed: (%s %s) - Error: (%s) - Retrying in %.2fs..."
+                    % (method, url, e, delay)
+                )
+            else:
+                if not self.retry_policy.should_retry(
+                    method, attempt, response=response
+                ):
+                    return response
+                delay = self.retry_policy.backoff(attempt, response=response)
+                logger.warning(
+                    "Request failed: (%s %s) - Status: (%s) - Retrying in %.2fs..."
+                    % (method, url, response.status_code, delay)
+                )
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    def build_auth(self) -> Dict[str, str]:
+        """Build the API authentication token."""
+        user_id: str = self.auth.get("user_id", "")
+        logger.info("Building authentication dictionary for user: %s" % user_id)
+        return build_auth_payload(
+            user_id=user_id,
+            password=self.auth.get("password", ""),
+            api_token=self.auth.get("api_token", ""),
+            assessment_code=self.assessment_code,
+        )
+
+    async def get_assessments(self, use_cache: bool = True) -> RiscAssessments:
+        """Get the RISC assessments available to the user.
+
+        Args:
+            use_cache (bool): Whether or not to serve the assessments from the response cache.
+                Defaults to: True.
+
+        Returns:
+            RiscAssessments: The RISC assessments.
+
+        """
+        response = await self._request(
+            "GET",
+            f"{self.api_endpoint}/getAssessments",
+            headers=self.build_auth(),
+            authenticated=False,
+            use_cache=use_cache,
+        )
+
+        if response.status_code != 200:
+            logger.error("Unable to retrieve the assessment code!")
+            return RiscAssessments()
+
+        assessment_items = decode_json(response).get("assessments", [])
+        return RiscAssessments(assessments=assessment_items)
+
+    async def get_assessment(self, **kwargs) -> RiscAssessment:
+        """Get the first non-demo RISC assessment matching the provided filter criteria.
+
+        Returns:
+            RiscAssessment: The matching assessment, or an empty assessment if none match.
+
+        """
+        response_data: RiscAssessments = await self.get_assessments()
+        return response_data.select(**(kwargs or self.assessment_filters))
+
+    async def get_auth_token(self) -> str:
+        """Authenticate with RISC.
+
+        Returns:
+            str: The final authentication token to be used with subsequent requests.
+
+        """
+        token: str = ""
+        response = await self._request(
+            "POST",
+            f"{self.api_endpoint}/getAuthToken",
+            json=self.build_auth(),
+            authenticated=False,
+        )
+
+        if response.status_code != 200:
+            logger.info("Unable to get the authentication token!")
+            return token
+
+        try:
+            token = decode_json(response).get("token", "")
+        except Exception as e:
+            logger.error(
+                "Error encountered while fetching the authentication token: %s" % e
+            )
+        return token
+
+    def lookup_stack_id(self, name: str, case_sensitive: bool = True):
+        """Look up the stack ID of the provided stack name using the stack index."""
+        if not self.stack_data:
+            logger.error("Stack data unavailable!")
+            return ""
+        stack = self.stacks.get_by_name(name, case_sensitive=case_sensitive)
+        return stack.stackid if stack is not None else ""
+
+    async def assets_get_summary(self, use_cache: bool = True):
+        """Use to retrieve a list of device types and counts."""
+        return await self._request(
+            "GET", f"{self.api_endpoint}/assets/getSummary", use_cache=use_cache
+        )
+
+    async def assets_get_assets(
+        self,
+        device_type: str = "",
+        stack_id: int = 0,
+        device_id: str = "",
+        tag_id: str = "",
+        page: int = 0,
+    ):
+        """Use to retrieve a list of assets by type, stack, device or tag."""
+        uri_base = (
+            f"{self.api_endpoint}/assets/getAssets{'/paginated/' if page else ''}"
+        )
+        headers: Dict[str, str] = {"page": str(page)} if page else {}
+
+        if device_type:
+            uri = f"{uri_base}/byType/{device_type}"
+        elif stack_id:
+            uri = f"{uri_base}/byStack/{stack_id}"
+        elif device_id:
+            uri = f"{uri_base}/byDevice/{device_id}"
+        elif tag_id:
+            uri = f"{uri_base}/byTag/{tag_id}"
+        else:
+            logger.error("No filter criteria specified! You must pass in an option!")
+            return Response()
+
+        return await self._request("GET", uri, headers=headers)
+
+    async def assets_search(self, search: str = ""):
+        """Search RISC assets."""
+        return await self._request("GET", f"{self.api_endpoint}/assets/search/{search}")
+
+    async def stacks_get_summary(self, use_cache: bool = True):
+        """Use to retrieve a list of stacks."""
+        return await self._request(
+            "GET", f"{self.api_endpoint}/stacks/getSummary", use_cache=use_cache
+        )
+
+    async def stacks_get_summary_cost(self, provider_id: str):
+        """Use to retrieve a list of stack costs."""
+        return await self._request(
+            "GET", f"{self.api_endpoint}/stacks/getSummaryWithCost/{provider_id}"
+        )
+
+    async def stacks_get_connectivity(
+        self, stack_id: str = "", use_cache: bool = True
+    ) -> RiscStackConnectivityParent:
+        """Use to retrieve a list of connected stacks."""
+        response = await self._request(
+            "GET",
+            f"{self.api_endpoint}/stacks/getConnectivity/{stack_id}",
+            use_cache=use_cache,
+        )
+        if response.status_code != 200:
+            return RiscStackConnectivityParent(response=response)
+        return RiscStackConnectivityParent(response=response, **decode_json(response))
+
+    async def stacks_get_device_connectivity(
+        self, stack_id: int, connectivity_type: str = "internal", page: int = 0
+    ) -> RiscDeviceConnectivityParent:
+        """Use to retrieve a list of connected devices in a stack."""
+        if connectivity_type.lower() not in ["internal", "external"]:
+            return RiscDeviceConnectivityParent()
+
+        headers: Dict[str, str] = {"page": str(page)} if page else {}
+        base_uri = f"{self.api_endpoint}/stacks/get{connectivity_type.title()}DeviceConnectivity"
+        uri = f"{base_uri}/{'paginated/' if page else ''}{stack_id}"
+
+        response = await self._request("GET", uri, headers=headers)
+        if response.status_code != 200:
+            return RiscDeviceConnectivityParent(response=response)
+        return RiscDeviceConnectivityParent(response=response, **decode_json(response))
+
+    async def stacks_get_listeners(self, stack_id: int):
+        """Use to retrieve a list of listeners in a stack."""
+        return await self._request(
+            "GET", f"{self.api_endpoint}/stacks/getListeners/{stack_id}"
+        )
+
+    async def iaas_get_providers(self, use_cache: bool = True):
+        """Use to retrieve a list of IaaS providers."""
+        return await self._request(
+            "GET", f"{self.api_endpoint}/iaas/getProviders", use_cache=use_cache
+        )
+
+    async def iaas_pricing(self, payload: Dict[str, str]):
+        """Use to retrieve a list of IaaS pricing."""
+        return await self._request(
+            "POST", f"{self.api_endpoint}/iaas/pricing", json=payload
+        )
+
+    async def tags_get_tags(self, payload: Dict[str, str]):
+        """Use to retrieve a list of tags."""
+        return await self._request(
+            "GET", f"{self.api_endpoint}/tags/getTags", json=payload
+        )
+
+    async def tags_add_tags(self, payload: Dict[str, str]):
+        """Use to add tags to devices."""
+        return await self._request(
+            "POST", f"{self.api_endpoint}/tags/addTags", json=payload
+        )
+
+    async def ucel_get_checks(self, device_id: str = "", use_cache: bool = True):
+        """Use to retrieve a list of checks that have been run against devices."""
+        return await self._request(
+            "GET",
+            f"{self.api_endpoint}/ucel/getChecks{'/' + device_id if device_id else ''}",
+            use_cache=use_cache,
+        )
+
+    async def ucel_get_assets(self, check_id: str = ""):
+        """Use to retrieve data on the device(s) by check."""
+        return await self._request(
+            "GET", f"{self.api_endpoint}/ucel/getAssets/{check_id}"
+        )
+
+    async def ucel_get_assets_paginated(self, check_id: str = "", page: int = 1):
+        """Use to retrieve data on the device(s) by check."""
+        return await self._request(
+            "GET",
+            f"{self.api_endpoint}/ucel/getAssets/paginated/{check_id}",
+            headers={"page": str(page)},
+        )
+
+    def _page_records(self, response: Any, key: str) -> List[Any]:
+        """Get the list of records stored under the provided key of a page response.
+
+        Raises:
+            RiscPageError: If the page could not be retrieved or decoded.
+
+        """
+        return page_records(response, key)
+
+    async def _iter_pages(
+        self,
+        fetch_page: Callable[[int], Awaitable[List[Any]]],
+        start_page: int = 1,
+        prefetch: bool = False,
+    ) -> AsyncIterator[Any]:
+        """Yield records page by page until the API returns an empty page.
+
+        A page that fails raises RiscPageError rather than ending the iteration.
+
+        Args:
+            fetch_page (callable): The coroutine function used to fetch the records for a page number.
+            start_page (int): The first page to fetch. Defaults to: 1.
+            prefetch (bool): Whether or not to request the next page while the records of the
+                current page are being consumed. Defaults to: False.
+
+        Yields:
+            The records of each page, in order.
+
+        """
+        page = start_page
+        next_page = asyncio.ensure_future(fetch_page(page)) if prefetch else None
+        try:
+            while True:
+                if next_page is not None:
+                    records = await next_page
+                    next_page = None
+                else:
+                    records = await fetch_page(page)
+                if not records:
+                    return
+                page += 1
+                if prefetch:
+                    next_page = asyncio.ensure_future(fetch_page(page))
+                for record in records:
+                    yield record
+        finally:
+            if next_page is not None:
+                next_page.cancel()
+
+    def iter_assets(
+        self,
+        device_type: str = "",
+        stack_id: int = 0,
+        device_id: str = "",
+        tag_id: str = "",
+        start_page: int = 1,
+        prefetch: bool = False,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Iterate asynchronously through all asset pages for the provided filter criteria."""
+
+        async def fetch_page(page: int) -> List[Any]:
+            response = await self.assets_get_assets(
+                device_type=device_type,
+                stack_id=stack_id,
+                device_id=device_id,
+                tag_id=tag_id,
+                page=page,
+            )
+            return self._page_records(response, "assets")
+
+        return self._iter_pages(fetch_page, start_page=start_page, prefetch=prefetch)
+
+    def iter_device_connectivity(
+        self,
+        stack_id: int,
+        connectivity_type: str = "internal",
+        start_page: int = 1,
+        prefetch: bool = False,
+    ) -> AsyncIterator[RiscDeviceConnectivity]:
+        """Iterate asynchronously through all device connectivity pages for the provided stack."""
+
+        async def fetch_page(page: int) -> List[Any]:
+            if connectivity_type.lower() not in ["internal", "external"]:
+                return []
+            parent = await self.stacks_get_device_connectivity(
+                stack_id=stack_id, connectivity_type=connectivity_type, page=page
+            )
+            if parent.response.status_code != 200:
+                self._page_records(parent.response, "connectivity")
+            return parent.connectivity
+
+        return self._iter_pages(fetch_page, start_page=start_page, prefetch=prefetch)
+
+    def iter_ucel_assets(
+        self, check_id: str = "", start_page: int = 1, prefetch: bool = False
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Iterate asynchronously through all UCEL asset pages for the provided check."""
+
+        async def fetch_page(page: int) -> List[Any]:
+            response = await self.ucel_get_assets_paginated(
+                check_id=check_id, page=page
+            )
+            return self._page_records(response, "assets")
+
+        return self._iter_pages(fetch_page, start_page=start_page, prefetch=prefetch)
+
+    async def map_concurrent(
+        self,
+        func: Callable[[Any], Awaitable[Any]],
+        items: Iterable[Any],
+        ordered: bool = True,
+        workers: int = 0,
+    ) -> AsyncIterator[Tuple[Any, Any]]:
+        """Await the provided coroutine function for each item concurrently.
+
+        At most ``workers`` tasks exist at any time, so ``items`` may be a lazy or unbounded
+        iterable. The number of requests in flight is also bounded by the client semaphore.
+
+        Args:
+            func (callable): The coroutine function to call for each item, e.g. a bound AsyncRISC method.
+            items (iterable): The items to pass to the coroutine function.
+            ordered (bool): Whether or not to yield results in the order of the provided items.
+                If set to: False, results are yielded as they complete. Defaults to: True.
+            workers (int): The maximum number of concurrent tasks.
+                Defaults to: the AsyncRISC max_concurrency setting.
+
+        Yields:
+            tuple: The item and the result of the coroutine function for that item.
+
+        """
+
+        async def run(item: Any) -> Tuple[Any, Any]:
+            return item, await func(item)
+
+        workers = max(int(workers or self.max_concurrency), 1)
+        items_iter = iter(items)
+        pending: Deque["asyncio.Future[Tuple[Any, Any]]"] = deque()
+
+        def submit_next() -> bool:
+            try:
+                item = next(items_iter)
+            except StopIteration:
+                return False
+            pending.append(asyncio.ensure_future(run(item)))
+            return True
+
+        try:
+            for _ in range(workers):
+                if not submit_next():
+                    break
+
+            while pending:
+                if ordered:
+                    task = pending.popleft()
+                else:
+                    done, _ = await asyncio.wait(
+                        pending, return_when=asyncio.FIRST_COMPLETED
+                    )
+                    task = next(entry for entry in pending if entry in done)
+                    pending.remove(task)
+                result = await task
+                submit_next()
+                yield result
+        finally:
+            for task in pending:
+                task.cancel()
@@ -0,0 +1,446 @@
+# -*- coding: utf-8 -*-
+"""Define the RISC caching module."""
+import base64
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from requests.models import Response
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover
+    fcntl = None
+
+try:
+    import httpx
+except ImportError:  # pragma: no cover
+    httpx = None
+
+logger = logging.getLogger(__name__)
+
+
+@contextmanager
+def file_lock(path: str) -> Iterator[None]:
+    """Hold an exclusive advisory lock on the provided lock file path.
+
+    On platforms without ``fcntl`` the lock is a no-op and writers rely on atomic replaces only.
+
+    """
+    with open(path, "a") as lock_file:
+        if fcntl is not None:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+
+def atomic_write(path: str, data: bytes, mode: int = 0o600) -> None:
+    """Write the provided data to path by replacing it with a fully written temporary file."""
+    directory = os.path.dirname(path) or "."
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".tmp-")
+    try:
+        with os.fdopen(fd, "wb") as tmp_file:
+            tmp_file.write(data)
+        os.chmod(tmp_path, mode)
+        os.replace(tmp_path, path)
+    except Exception:
+        os.unlink(tmp_path)
+        raise
+
+
+class TokenCache:
+    """Define the on-disk RISC authentication token cache.
+
+    Tokens are keyed by user and assessment code and stored in a single JSON file, which is
+    shared safely between processes using a lock file and atomic replaces.
+
+    Args:
+        path (str): The path of the token cache file.
+            Defaults to: RISC_TOKEN_CACHE or ~/.risc/tokens.json.
+        ttl (int): The number of seconds a cached token remains valid.
+            Defaults to: RISC_TOKEN_TTL or 3000.
+
+    """
+
+    def __init__(self, path: str = "", ttl: int = 0) -> None:
+        """Initialize the TokenCache class."""
+        self.path: str = path or os.environ.get(
+            "RISC_TOKEN_CACHE",
+            os.path.join(os.path.expanduser("~"), ".risc", "tokens.json"),
+        )
+        self.ttl: int = ttl or int(os.environ.get("RISC_TOKEN_TTL", "3000"))
+
+    def __repr__(self):
+        """Provide the representation for the TokenCache object."""
+        return f"<TokenCache - Path: {self.path}>"
+
+    @staticmethod
+    def key(user_id: str, assessment_code: str) -> str:
+        """Get the cache key for the provided user and assessment code."""
+        return hashlib.sha256(f"{user_id}:{assessment_code}".encode()).hexdigest()
+
+    @property
+    def lock_path(self) -> str:
+        """Get the path of the lock file guarding the token cache file."""
+        return f"{self.path}.lock"
+
+    def _read(self) -> Dict[str, Any]:
+        """Read the cached token entries from disk."""
+        try:
+            with open(self.path, "rb") as cache_file:
+                return json.loads(cache_file.read() or b"{}")
+        except FileNotFoundError:
+            return {}
+        except Exception as e:
+            logger.error(
+                "Unable to read the token cache: (%s) - Error: (%s)" % (self.path, e)
+            )
+            return {}
+
+    def _update(self, key: str, entry: Any, stale_token: str = "") -> None:
+        """Replace or remove (if entry is None) a single cached token entry.
+
+        When removing with a stale token, the entry is only removed if it still holds that token,
+        so a token refreshed by another process is kept.
+
+        """
+        os.makedirs(os.path.dirname(self.path) or ".", mode=0o700, exist_ok=True)
+        with file_lock(self.lock_path):
+            entries = self._read()
+            now = time.time()
+            entries = {k: v for k, v in entries.items() if v.get("expires", 0) > now}
+            if entry is not None:
+                entries[key] = entry
+            elif not stale_token or entries.get(key, {}).get("token") == stale_token:
+                entries.pop(key, None)
+            atomic_write(self.path, json.dumps(entries).encode())
+
+    def get(self, user_id: str, assessment_code: str) -> str:
+        """Get the cached token for the provided user and assessment code, if still valid.
+
+        Returns:
+            str: The cached token, or an empty string if none is cached or it has expired.
+
+        """
+        entry = self._read().get(self.key(user_id, assessment_code), {})
+        if entry.get("expires", 0) <= time.time():
+            return ""
+        return entry.get("token", "")
+
+    def set(self, user_id: str, assessment_code: str, token: str) -> None:
+        """Cache the token for the provided user and assessment code."""
+        try:
+            self._update(
+                self.key(user_id, assessment_code),
+                {"token": token, "expires": time.time() + self.ttl},
+            )
+        except Exception as e:
+            logger.error(
+                "Unable to write the token cache: (%s) - Error: (%s)" % (self.path, e)
+            )
+
+    def invalidate(
+        self, user_id: str, assessment_code: str, stale_token: str = ""
+    ) -> None:
+        """Remove the cached token for the provided user and assessment code.
+
+        Args:
+            user_id (str): The RISC user ID.
+            assessment_code (str): The RISC assessment code.
+            stale_token (str): If provided, only remove the cached token if it matches.
+
+        """
+        try:
+            self._update(self.key(user_id, assessment_code), None, stale_token)
+        except Exception as e:
+            logger.error(
+                "Unable to write the token cache: (%s) - Error: (%s)" % (self.path, e)
+            )
+
+
+class DiskCacheBackend:
+    """Define the on-disk response cache backend.
+
+    Each entry is written as JSON to its own file in the cache directory, so entries survive
+    across processes and report runs. Responses are stored as their status code, headers, URL
+    and body rather than pickled, and expired entries are removed when read. Once the
+    directory holds more than ``max_entries`` files, the least recently used are removed.
+
+    Args:
+        path (str): The cache directory. Defaults to: RISC_CACHE_DIR or ~/.risc/cache.
+        max_entries (int): The maximum number of cached entries.
+            Defaults to: RISC_CACHE_MAX_ENTRIES or 1024.
+
+    """
+
+    def __init__(self, path: str = "", max_entries: int = 0) -> None:
+        """Initialize the DiskCacheBackend class."""
+        self.path: str = path or os.environ.get(
+            "RISC_CACHE_DIR", os.path.join(os.path.expanduser("~"), ".risc", "cache")
+        )
+        self.max_entries: int = max_entries or int(
+            os.environ.get("RISC_CACHE_MAX_ENTRIES", "1024")
+        )
+        os.makedirs(self.path, mode=0o700, exist_ok=True)
+
+    def __repr__(self):
+        """Provide the representation for the DiskCacheBackend object."""
+        return (
+            f"<DiskCacheBackend - Path: {self.path} - Max Entries: {self.max_entries}>"
+        )
+
+    def _entry_path(self, key: str) -> str:
+        """Get the file path of the provided cache key."""
+        return os.path.join(self.path, hashlib.sha256(key.encode()).hexdigest())
+
+    def _entry_paths(self) -> List[str]:
+        """Get the file paths of the cached entries, skipping partially written files."""
+        return [
+            os.path.join(self.path, name)
+            for name in os.listdir(self.path)
+            if not name.startswith(".")
+        ]
+
+    @staticmethod
+    def encode(value: Any) -> Dict[str, Any]:
+        """Encode the provided value as a JSON serializable dictionary.
+
+        Responses of the requests and httpx clients are reduced to their status code, headers,
+        URL, encoding and base64 encoded body. Any other value must be JSON serializable.
+
+        """
+        if isinstance(value, Response) or (
+            httpx is not None and isinstance(value, httpx.Response)
+        ):
+            return {
+                "type": "requests" if isinstance(value, Response) else "httpx",
+                "status_code": value.status_code,
+                "headers": dict(value.headers),
+                "url": str(value.url),
+                "encoding": value.encoding,
+                "content": base64.b64encode(value.content).decode(),
+            }
+        return {"type": "json", "value": value}
+
+    @staticmethod
+    def decode(data: Dict[str, Any]) -> Any:
+        """Decode a value encoded by :meth:`encode`."""
+        if data["type"] == "json":
+            return data["value"]
+        content = base64.b64decode(data["content"])
+        if data["type"] == "httpx":
+            if httpx is None:
+                raise ValueError("The httpx package is required to decode the entry!")
+            response = httpx.Response(
+                data["status_code"],
+                headers=data["headers"],
+                content=content,
+                request=httpx.Request("GET", data["url"]),
+            )
+            if data["encoding"]:
+                response.encoding = data["encoding"]
+            return response
+        response = Response()
+        response.status_code = data["status_code"]
+        response.headers.update(data["headers"])
+        response.url = data["url"]
+        response.encoding = data["encoding"]
+        response._content = content
+        response._content_consumed = True
+        return response
+
+    def get(self, key: str) -> Optional[Tuple[float, Any]]:
+        """Get the (expires, value) entry of the provided key, if cached and not expired."""
+        path = self._entry_path(key)
+        try:
+            with open(path, "rb") as entry_file:
+                data = json.loads(entry_file.read())
+            if data["expires"] <= time.time():
+                self.delete(key)
+                return None
+            value = self.decode(data["value"])
+            os.utime(path)
+            return data["expires"], value
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.error(
+                "Unable to read the cache entry: (%s) - Error: (%s)" % (key, e)
+            )
+            self.delete(key)
+            return None
+
+    def set(self, key: str, entry: Tuple[float, Any]) -> None:
+        """Store the (expires, value) entry of the provided key."""
+        try:
+            data = {"expires": entry[0], "value": self.encode(entry[1])}
+            atomic_write(self._entry_path(key), json.dumps(data).encode())
+            self.prune()
+        except Exception as e:
+            logger.error(
+                "Unable to write the cache entry: (%s) - Error: (%s)" % (key, e)
+            )
+
+    def prune(self) -> None:
+        """Remove the least recently used entries beyond the maximum entry count."""
+        paths = self._entry_paths()
+        if len(paths) <= self.max_entries:
+            return
+        mtimes: Dict[str, float] = {}
+        for path in paths:
+            try:
+                mtimes[path] = os.path.getmtime(path)
+            except FileNotFoundError:
+                pass
+        for path in sorted(mtimes, key=mtimes.get)[: len(mtimes) - self.max_entries]:
+            try:
+                os.unlink(path)
+            except FileNotFoundError:
+                pass
+
+    def delete(self, key: str) -> None:
+        """Remove the entry of the provided key."""
+        try:
+            os.unlink(self._entry_path(key))
+        except FileNotFoundError:
+            pass
+
+    def clear(self) -> None:
+        """Remove all cached entries."""
+        for path in self._entry_paths():
+            try:
+                os.unlink(path)
+            except FileNotFoundError:
+                pass
+
+
+class ResponseCache:
+    """Define the RISC response cache.
+
+    Responses are held in a size-bounded, in-memory LRU and optionally written through to a
+    backend such as :class:`DiskCacheBackend`. Each entry expires after the TTL of the longest
+    endpoint in ``ttls`` contained in its URL, or ``default_ttl`` if none match.
+
+    Args:
+        maxsize (int): The maximum number of responses held in memory. Defaults to: 256.
+        default_ttl (int): The TTL, in seconds, of endpoints missing from ttls. Defaults to: 300.
+        ttls (dict): The mapping of endpoint path to TTL, in seconds. Defaults to: DEFAULT_TTLS.
+        backend (DiskCacheBackend): The optional persistent backend. Defaults to: None.
+
+    """
+
+    DEFAULT_TTLS: Dict[str, int] = {
+        "assets/getSummary": 900,
+        "getAssessments": 900,
+        "iaas/getProviders": 86400,
+        "stacks/getConnectivity": 3600,
+        "stacks/getSummary": 900,
+        "stacks/getSummaryWithCost": 3600,
+        "ucel/getChecks": 3600,
+    }
+
+    def __init__(
+        self,
+        maxsize: int = 256,
+        default_ttl: int = 300,
+        ttls: Optional[Dict[str, int]] = None,
+        backend: Optional[DiskCacheBackend] = None,
+    ) -> None:
+        """Initialize the ResponseCache class."""
+        self.maxsize: int = maxsize
+        self.default_ttl: int = default_ttl
+        self.ttls: Dict[str, int] = dict(self.DEFAULT_TTLS if ttls is None else ttls)
+        self.backend: Optional[DiskCacheBackend] = backend
+        self.hits: int = 0
+        self.misses: int = 0
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __repr__(self):
+        """Provide the representation for the ResponseCache object."""
+        return f"<ResponseCache - Size: {self.size} - Hits: {self.hits} - Misses: {self.misses}>"
+
+    @property
+    def size(self) -> int:
+        """Get the number of responses held in memory."""
+        return len(self._entries)
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        """Get the cache hit, miss and size counters."""
+        return {"hits": self.hits, "misses": self.misses, "size": self.size}
+
+    def ttl_for(self, url: str) -> int:
+        """Get the TTL, in seconds, of the provided URL."""
+        matches = [endpoint for endpoint in self.ttls if endpoint in url]
+        if not matches:
+            return self.default_ttl
+        return self.ttls[max(matches, key=len)]
+
+    def get(self, key: str) -> Any:
+        """Get the cached value of the provided key, or None if missing or expired."""
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > now:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            self._entries.pop(key, None)
+
+        entry = self.backend.get(key) if self.backend else None
+        with self._lock:
+            if entry is not None and entry[0] > now:
+                self._store(key, entry)
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+        return None
+
+    def set(self, key: str, value: Any, ttl: Optional[int] = None) -> None:
+        """Cache the value of the provided key.
+
+        Args:
+            key (str): The cache key, typically built from the request method, URL and headers.
+            value (any): The value to cache.
+            ttl (int): The TTL, in seconds. Defaults to: the TTL of the key's URL.
+
+        """
+        entry = (time.time() + (self.ttl_for(key) if ttl is None else ttl), value)
+        with self._lock:
+            self._store(key, entry)
+        if self.backend:
+            self.backend.set(key, entry)
+
+    def _store(self, key: str, entry: Tuple[float, Any]) -> None:
+        """Store an entry in memory, evicting the least recently used entries."""
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, key: str) -> None:
+        """Remove the cached value of the provided key."""
+        with self._lock:
+            self._entries.pop(key, None)
+        if self.backend:
+            self.backend.delete(key)
+
+    def clear(self) -> None:
+        """Remove all cached values and reset the counters."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+        if self.backend:
+            self.backend.clear()
@@ -0,0 +1,282 @@
+# -*- coding: utf-8 -*-
+"""Define the RISC columnar connectivity module.
+
+Connectivity rows are stored column by column instead of as one object per flow. Numeric
+columns live in typed arrays (NumPy when installed, the stdlib ``array`` module otherwise) and
+string columns are dictionary encoded, so each distinct value is stored once.
+
+"""
+import logging
+from array import array
+from dataclasses import fields
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from risc.models import RiscDeviceConnectivity, RiscResourceModel
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_COLUMNS: Tuple[str, ...] = (
+    "src_ip",
+    "dest_ip",
+    "dest_port",
+    "total_bytes",
+    "avg_rtt",
+)
+
+
+def column_types(model: Any = RiscDeviceConnectivity) -> Dict[str, Any]:
+    """Get the mapping of column name to Python type of the provided RISC model."""
+    base_fields = {item.name for item in fields(RiscResourceModel)}
+    return {
+        item.name: type(item.default)
+        for item in fields(model)
+        if item.name not in base_fields and item.default in (0, 0.0, "")
+    }
+
+
+class StringColumn:
+    """Define a dictionary encoded string column."""
+
+    __slots__ = ("codes", "values", "lookup")
+
+    def __init__(self, values: Optional[List[str]] = None) -> None:
+        """Initialize the StringColumn class."""
+        self.codes = array("l")
+        self.values: List[str] = list(values or [])
+        self.lookup: Dict[str, int] = {value: i for i, value in enumerate(self.values)}
+
+    def append(self, value: Any) -> None:
+        """Append a value, interning it if it was not seen before."""
+        value = "" if value is None else str(value)
+        code = self.lookup.get(value)
+        if code is None:
+            code = self.lookup[value] = len(self.values)
+            self.values.append(value)
+        self.codes.append(code)
+
+    def code_of(self, value: str) -> int:
+        """Get the code of the provided value, or -1 if it was never stored."""
+        return self.lookup.get(value, -1)
+
+
+class ConnectivityColumns:
+    """Define the columnar device connectivity container.
+
+    Example:
+        columns = risc.device_connectivity_columns(stack_ids=[1, 2])
+        columns.where(dest_port=443).group_sum("dest_ip", "total_bytes")
+
+    Args:
+        columns (sequence of str): The connectivity columns to store. Defaults to: DEFAULT_COLUMNS.
+
+    """
+
+    TYPECODES: Dict[Any, str] = {int: "q", float: "d"}
+
+    def __init__(self, columns: Sequence[str] = DEFAULT_COLUMNS) -> None:
+        """Initialize the ConnectivityColumns class."""
+        types = column_types()
+        unknown = [name for name in columns if name not in types]
+        if unknown:
+            raise ValueError(f"Unknown connectivity columns: {unknown}")
+        self.types: Dict[str, Any] = {name: types[name] for name in columns}
+        self.data: Dict[str, Any] = {
+            name: StringColumn()
+            if column_type is str
+            else array(self.TYPECODES[column_type])
+            for name, column_type in self.types.items()
+        }
+        self.length: int = 0
+
+    def __repr__(self):
+        """Provide the representation for the ConnectivityColumns object."""
+        return (
+            f"<ConnectivityColumns - Rows: {self.length} - Columns: {list(self.types)}>"
+        )
+
+    def __len__(self) -> int:
+        """Get the number of stored rows."""
+        return self.length
+
+    @classmethod
+    def from_rows(
+        cls, rows: Iterable[Dict[str, Any]], columns: Sequence[str] = DEFAULT_COLUMNS
+    ) -> "ConnectivityColumns":
+        """Build the container from decoded connectivity rows, as returned from the RISC API."""
+        container = cls(columns=columns)
+        container.extend(rows)
+        return container
+
+    def append(self, row: Dict[str, Any]) -> None:
+        """Append a decoded connectivity row."""
+        for name, column_type in self.types.items():
+            value = row.get(name)
+            if column_type is str:
+                self.data[name].append(value)
+                continue
+            try:
+                self.data[name].append(column_type(value or 0))
+            except (TypeError, ValueError):
+                self.data[name].append(column_type())
+        self.length += 1
+
+    def extend(self, rows: Iterable[Dict[str, Any]]) -> None:
+        """Append many decoded connectivity rows."""
+        for row in rows:
+            self.append(row)
+
+    def column(self, name: str) -> Any:
+        """Get a numeric column, or the codes of a string column.
+
+        Returns:
+            numpy.ndarray or array.array: The column values, as a zero-copy NumPy view when
+                NumPy is installed.
+
+        """
+        data = self.data[name]
+        values = data.codes if isinstance(data, StringColumn) else data
+        if np is not None:
+            return (
+                np.frombuffer(values, dtype=values.typecode) if values else np.array([])
+            )
+        return values
+
+    def values(self, name: str) -> List[Any]:
+        """Get the decoded values of a column."""
+        data = self.data[name]
+        if isinstance(data, StringColumn):
+            return [data.values[code] for code in data.codes]
+        return list(data)
+
+    def where(self, **conditions: Any) -> "ConnectivityColumns":
+        """Get the rows matching all of the provided column conditions.
+
+        Each condition is either a single value to match or a collection of accepted values,
+        e.g. ``where(dest_port=[80, 443], dest_ip="10.0.0.1")``.
+
+        """
+        return self.take(self.mask(**conditions))
+
+    def mask(self, **conditions: Any) -> Any:
+        """Get the boolean row mask of the provided column conditions.
+
+        Returns:
+            numpy.ndarray or list of bool: The row mask, as a NumPy array when NumPy is installed.
+
+        """
+        selected: Any = None
+        for name, expected in conditions.items():
+            accepted = (
+                set(expected)
+                if isinstance(expected, (list, tuple, set, frozenset))
+                else {expected}
+            )
+            data = self.data[name]
+            if isinstance(data, StringColumn):
+                accepted = {data.code_of(str(value)) for value in accepted}
+            column = self.column(name)
+            if np is not None:
+                matches = np.isin(column, list(accepted))
+                selected = matches if selected is None else selected & matches
+            else:
+                matches = [value in accepted for value in column]
+                selected = (
+                    matches
+                    if selected is None
+                    else [a and b for a, b in zip(selected, matches)]
+                )
+        if selected is None:
+            return (
+                np.ones(self.length, dtype=bool)
+                if np is not None
+                else [True] * self.length
+            )
+        return selected
+
+    def take(self, mask: Sequence[bool]) -> "ConnectivityColumns":
+        """Get a new container holding the rows selected by the provided boolean mask.
+
+        String columns of the new container share the value dictionaries of this one.
+
+        """
+        subset = ConnectivityColumns(columns=list(self.types))
+        if np is not None:
+            selected = np.asarray(mask, dtype=bool)
+            subset.length = int(selected.sum())
+        else:
+            indexes = [i for i, keep in enumerate(mask) if keep]
+            subset.length = len(indexes)
+        for name, data in self.data.items():
+            source = data.codes if isinstance(data, StringColumn) else data
+            if np is not None:
+                values = array(source.typecode)
+                if self.length:
+                    values.frombytes(self.column(name)[selected].tobytes())
+            else:
+                values = array(source.typecode, (source[i] for i in indexes))
+            if isinstance(data, StringColumn):
+                target = subset.data[name]
+                target.values = data.values
+                target.lookup = data.lookup
+                target.codes = values
+            else:
+                subset.data[name] = values
+        return subset
+
+    def sum(self, name: str) -> Any:
+        """Get the total of a numeric column."""
+        if np is not None:
+            return self.column(name).sum().item() if self.length else 0
+        return sum(self.data[name])
+
+    def group_sum(self, by: str, value: str) -> Dict[Any, Any]:
+        """Get the total of a numeric column for each value of another column.
+
+        Example:
+            columns.group_sum("dest_port", "total_bytes")
+
+        Returns:
+            dict: The mapping of group value to total, sorted by descending total.
+
+        """
+        keys = self.data[by]
+        totals: Dict[Any, Any] = {}
+        if np is not None and self.length:
+            key_column = self.column(by)
+            unique, inverse = np.unique(key_column, return_inverse=True)
+            sums = np.bincount(inverse, weights=self.column(value))
+            if self.types[value] is int:
+                sums = sums.astype("int64")
+            for key, total in zip(unique.tolist(), sums.tolist()):
+                totals[
+                    keys.values[key] if isinstance(keys, StringColumn) else key
+                ] = total
+        else:
+            key_values = keys.codes if isinstance(keys, StringColumn) else keys
+            for key, total in zip(key_values, self.data[value]):
+                totals[key] = totals.get(key, 0) + total
+            if isinstance(keys, StringColumn):
+                totals = {keys.values[key]: total for key, total in totals.items()}
+        return dict(sorted(totals.items(), key=lambda item: item[1], reverse=True))
+
+    def to_dataframe(self):
+        """Handle converting the columns to a pandas DataFrame with categorical string columns."""
+        try:
+            import pandas as pd
+        except ImportError:
+            logger.info("Pandas currently not installed! DataFrame support disabled!")
+            return None
+        frame = {}
+        for name, data in self.data.items():
+            if isinstance(data, StringColumn):
+                frame[name] = pd.Categorical.from_codes(
+                    list(data.codes), categories=data.values
+                )
+            else:
+                frame[name] = self.column(name)
+        return pd.DataFrame(frame)
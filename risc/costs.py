@@ -0,0 +1,281 @@
+# -*- coding: utf-8 -*-
+"""Define the RISC stack cost comparison module.
+
+The RISC API does not document the ``stacks/getSummaryWithCost`` response. It is assumed
+to match ``stacks/getSummary`` (stacks under ``assets``) with a numeric cost field per stack,
+the first of :data:`COST_FIELDS` found. Pass ``cost_field`` to use another field.
+
+"""
+import json
+import logging
+import math
+import time
+from array import array
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None
+
+logger = logging.getLogger(__name__)
+
+COST_FIELDS: Sequence[str] = ("total_cost", "monthly_cost", "cost", "price")
+PROVIDER_ID_FIELDS: Sequence[str] = ("providerid", "provider_id", "id")
+
+
+def get_provider_ids(providers: Iterable[Any]) -> List[str]:
+    """Get the provider IDs of decoded iaas/getProviders items."""
+    ids: List[str] = []
+    for provider in providers:
+        if not isinstance(provider, dict):
+            ids.append(str(provider))
+            continue
+        for name in PROVIDER_ID_FIELDS:
+            if provider.get(name) not in (None, ""):
+                ids.append(str(provider[name]))
+                break
+    return ids
+
+
+def stack_cost(stack: Dict[str, Any], cost_field: str = "") -> float:
+    """Get the cost of a decoded stack, or NaN if it has none."""
+    for name in (cost_field,) if cost_field else COST_FIELDS:
+        try:
+            return float(stack[name])
+        except (KeyError, TypeError, ValueError):
+            continue
+    return math.nan
+
+
+class StackCostComparison:
+    """Define the stack cost comparison table across IaaS providers.
+
+    Costs are held in one column per provider, aligned on the stack ID, with NaN where a
+    provider has no cost for a stack.
+
+    Example:
+        comparison = risc.compare_stack_costs()
+        comparison.cheapest()
+        comparison.totals()
+
+    Args:
+        providers (sequence of str): The provider IDs, one per cost column.
+
+    """
+
+    def __init__(self, providers: Sequence[str] = ()) -> None:
+        """Initialize the StackCostComparison class."""
+        self.providers: List[str] = list(providers)
+        self.stack_ids: List[int] = []
+        self.stack_names: List[str] = []
+        self.costs: Dict[str, Any] = {provider: array("d") for provider in providers}
+        self._rows: Dict[int, int] = {}
+
+    def __repr__(self):
+        """Provide the representation for the StackCostComparison object."""
+        return f"<StackCostComparison - Stacks: {len(self.stack_ids)} - Providers: {self.providers}>"
+
+    def _row(self, stack_id: int, stack_name: str = "") -> int:
+        """Get the row of the provided stack, adding it if needed."""
+        row = self._rows.get(stack_id)
+        if row is None:
+            row = self._rows[stack_id] = len(self.stack_ids)
+            self.stack_ids.append(stack_id)
+            self.stack_names.append(stack_name)
+            for column in self.costs.values():
+                column.append(math.nan)
+        elif stack_name and not self.stack_names[row]:
+            self.stack_names[row] = stack_name
+        return row
+
+    def add_provider(
+        self, provider: str, stacks: Iterable[Dict[str, Any]], cost_field: str = ""
+    ) -> None:
+        """Join the decoded stack cost summary of a provider on the stack ID."""
+        if provider not in self.costs:
+            self.providers.append(provider)
+            self.costs[provider] = array("d", [math.nan] * len(self.stack_ids))
+        column = self.costs[provider]
+        for stack in stacks:
+            stack_id = int(stack.get("stackid", 0) or 0)
+            if not stack_id:
+                continue
+            row = self._row(stack_id, stack.get("stack_name", "") or "")
+            column[row] = stack_cost(stack, cost_field)
+
+    def _matrix(self) -> Any:
+        """Get the (stacks, providers) cost matrix."""
+        return np.column_stack(
+            [
+                np.frombuffer(self.costs[provider], dtype="d")
+                for provider in self.providers
+            ]
+        )
+
+    def cheapest(self) -> Dict[int, Dict[str, Any]]:
+        """Get the cheapest provider and cost of each stack with at least one cost."""
+        results: Dict[int, Dict[str, Any]] = {}
+        if not self.stack_ids or not self.providers:
+            return results
+        if np is not None:
+            matrix = self._matrix()
+            priced = ~np.isnan(matrix).all(axis=1)
+            filled = np.where(np.isnan(matrix), np.inf, matrix)
+            best = filled.argmin(axis=1)
+            best_costs = filled[np.arange(len(best)), best]
+            for row in np.flatnonzero(priced).tolist():
+                results[self.stack_ids[row]] = {
+                    "provider": self.providers[int(best[row])],
+                    "cost": float(best_costs[row]),
+                }
+            return results
+
+        for row, stack_id in enumerate(self.stack_ids):
+            priced = [
+                (self.costs[provider][row], provider)
+                for provider in self.providers
+                if not math.isnan(self.costs[provider][row])
+            ]
+            if priced:
+                cost, provider = min(priced)
+                results[stack_id] = {"provider": provider, "cost": cost}
+        return results
+
+    def totals(self) -> Dict[str, Any]:
+        """Get the total cost per provider, the optimal mixed total and the cheapest provider.
+
+        Returns:
+            dict: The ``providers`` mapping of provider to total cost over its priced stacks,
+                the ``priced_stacks`` count per provider, the ``cheapest_provider`` among the
+                providers pricing the most stacks and the ``optimal`` total picking the
+                cheapest provider for every stack.
+
+        """
+        if np is not None and self.stack_ids and self.providers:
+            matrix = self._matrix()
+            provider_totals = dict(
+                zip(self.providers, np.nansum(matrix, axis=0).tolist())
+            )
+            priced = dict(zip(self.providers, (~np.isnan(matrix)).sum(axis=0).tolist()))
+        else:
+            provider_totals = {
+                provider: sum(
+                    cost for cost in self.costs[provider] if not math.isnan(cost)
+                )
+                for provider in self.providers
+            }
+            priced = {
+                provider: sum(not math.isnan(cost) for cost in self.costs[provider])
+                for provider in self.providers
+            }
+        # Providers missing stacks would look cheaper, so only compare full coverage.
+        coverage = max(priced.values(), default=0)
+        candidates = [provider for provider in priced if priced[provider] == coverage]
+        return {
+            "providers": provider_totals,
+            "priced_stacks": priced,
+            "cheapest_provider": min(candidates, key=provider_totals.get)
+            if candidates
+            else "",
+            "optimal": sum(item["cost"] for item in self.cheapest().values()),
+        }
+
+    def rows(self) -> Iterator[Dict[str, Any]]:
+        """Iterate through the per-stack rows, with one cost column per provider.
+
+        Yields:
+            dict: The stackid, stack_name, provider costs (None where missing),
+                cheapest_provider and cheapest_cost of a stack.
+
+        """
+        cheapest = self.cheapest()
+        for row, stack_id in enumerate(self.stack_ids):
+            data: Dict[str, Any] = {
+                "stackid": stack_id,
+                "stack_name": self.stack_names[row],
+            }
+            for provider in self.providers:
+                cost = self.costs[provider][row]
+                data[provider] = None if math.isnan(cost) else cost
+            best = cheapest.get(stack_id, {})
+            data["cheapest_provider"] = best.get("provider", "")
+            data["cheapest_cost"] = best.get("cost")
+            yield data
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Get the JSON serializable representation of the comparison, e.g. to cache it."""
+        return {
+            "providers": self.providers,
+            "stack_ids": self.stack_ids,
+            "stack_names": self.stack_names,
+            "costs": {
+                provider: [None if math.isnan(cost) else cost for cost in column]
+                for provider, column in self.costs.items()
+            },
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "StackCostComparison":
+        """Build the comparison from its dictionary representation."""
+        comparison = cls(providers=data.get("providers", []))
+        comparison.stack_ids = list(data.get("stack_ids", []))
+        comparison.stack_names = list(data.get("stack_names", []))
+        comparison._rows = {
+            stack_id: row for row, stack_id in enumerate(comparison.stack_ids)
+        }
+        for provider, column in data.get("costs", {}).items():
+            comparison.costs[provider] = array(
+                "d", (math.nan if cost is None else cost for cost in column)
+            )
+        return comparison
+
+    def save(self, path: str, key: str = "") -> None:
+        """Write the comparison to a JSON file, so it can be reloaded without any API calls.
+
+        Args:
+            path (str): The JSON file path.
+            key (str): The key identifying the comparison, e.g. its providers and cost field,
+                checked by load. Defaults to: None.
+
+        """
+        with open(path, "w") as output:
+            json.dump({"key": key, "saved_at": time.time(), **self.to_dict()}, output)
+
+    @classmethod
+    def load(
+        cls, path: str, max_age: float = 0, key: str = ""
+    ) -> Optional["StackCostComparison"]:
+        """Load a comparison written by save.
+
+        Args:
+            path (str): The JSON file path.
+            max_age (float): The maximum age, in seconds, of the saved comparison.
+                Defaults to: 0 (no limit).
+            key (str): The key the comparison must have been saved with. Defaults to: any key.
+
+        Returns:
+            StackCostComparison: The comparison, or None if the file is missing, invalid,
+                expired or saved with another key.
+
+        """
+        try:
+            with open(path) as cache_file:
+                data = json.load(cache_file)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.error(
+                "Unable to load the stack cost comparison: (%s) - Error: (%s)"
+                % (path, e)
+            )
+            return None
+        if key and data.get("key") != key:
+            logger.info(
+                "Ignoring the stack cost comparison of another query: (%s)" % path
+            )
+            return None
+        if max_age and time.time() - float(data.get("saved_at", 0) or 0) > max_age:
+            logger.info("Ignoring the expired stack cost comparison: (%s)" % path)
+            return None
+        return cls.from_dict(data)
@@ -0,0 +1,326 @@
+# -*- coding: utf-8 -*-
+"""Define the RISC streaming export module.
+
+Rows are written as they are read from the API, so memory stays bounded by a single page
+(or a single Parquet row group) regardless of the size of the export. API rows don't all
+share the same keys, so unless the columns (or Parquet schema) are provided, the CSV header
+and Parquet schema are inferred from the first ``infer_rows`` rows, which are held in memory.
+Keys first seen after those rows are dropped, with a warning.
+
+"""
+import bz2
+import csv
+import gzip
+import json
+import logging
+import lzma
+import sys
+import time
+from contextlib import contextmanager
+from itertools import chain, islice
+from typing import IO, Any, Dict, Iterable, Iterator, List, Optional, Sequence, Set
+
+logger = logging.getLogger(__name__)
+
+FORMATS: Dict[str, str] = {"ndjson": "ndjson", "csv": "csv", "parquet": "parquet"}
+COMPRESSION_OPENERS: Dict[str, Any] = {
+    "gzip": gzip.open,
+    "bz2": bz2.open,
+    "xz": lzma.open,
+}
+COMPRESSION_SUFFIXES: Dict[str, str] = {"gzip": ".gz", "bz2": ".bz2", "xz": ".xz"}
+INFER_ROWS: int = 1000
+
+
+def infer_compression(path: str) -> str:
+    """Infer the file compression from the suffix of the provided path."""
+    for compression, suffix in COMPRESSION_SUFFIXES.items():
+        if path.endswith(suffix):
+            return compression
+    return ""
+
+
+@contextmanager
+def open_output(path: str, compression: str = "") -> Iterator[IO[str]]:
+    """Open the provided path for writing text, compressing it if requested.
+
+    Args:
+        path (str): The output path, or ``-`` for stdout.
+        compression (str): The compression to apply.
+            Options are: gzip, bz2 and xz. Defaults to: inferred from the path suffix.
+
+    Yields:
+        file: The writable text file object.
+
+    """
+    if path == "-":
+        yield sys.stdout
+        return
+    compression = compression or infer_compression(path)
+    if compression and compression not in COMPRESSION_OPENERS:
+        raise ValueError(f"Unsupported compression: {compression}")
+    opener = COMPRESSION_OPENERS.get(compression, open)
+    with opener(path, "wt", encoding="utf-8", newline="") as output:
+        yield output
+
+
+def flatten_row(row: Dict[str, Any], prefix: str = "") -> Dict[str, Any]:
+    """Flatten nested dicts into dotted keys and encode lists as JSON strings.
+
+    Example:
+        flatten_row({"deviceid": 1, "data": {"hostname": "web01"}})
+        # {"deviceid": 1, "data.hostname": "web01"}
+
+    """
+    flat: Dict[str, Any] = {}
+    for key, value in row.items():
+        name = f"{prefix}{key}"
+        if isinstance(value, dict):
+            flat.update(flatten_row(value, prefix=f"{name}."))
+        elif isinstance(value, (list, tuple)):
+            flat[name] = json.dumps(value, default=str)
+        else:
+            flat[name] = value
+    return flat
+
+
+def write_ndjson(rows: Iterable[Dict[str, Any]], output: IO[str]) -> int:
+    """Write the provided rows as newline delimited JSON.
+
+    Returns:
+        int: The number of rows written.
+
+    """
+    count = 0
+    for row in rows:
+        output.write(json.dumps(row, default=str))
+        output.write("\n")
+        count += 1
+    return count
+
+
+def infer_columns(
+    flat_rows: Iterator[Dict[str, Any]], infer_rows: int = INFER_ROWS
+) -> Any:
+    """Infer the columns of flattened rows from the first rows.
+
+    Returns:
+        tuple: The sample rows, the columns of the sample in first-seen order and the iterator
+            of every row, starting with the sample.
+
+    """
+    sample = list(islice(flat_rows, max(infer_rows, 1)))
+    columns = list(dict.fromkeys(name for row in sample for name in row))
+    return sample, columns, chain(sample, flat_rows)
+
+
+def warn_unknown_columns(row: Dict[str, Any], known: Set[str], infer_rows: int) -> None:
+    """Log the keys of the row outside of the inferred columns, once per key."""
+    unknown = row.keys() - known
+    if unknown:
+        logger.warning(
+            "Dropping columns missing from the first %s rows: (%s) - Provide the columns "
+            "or a larger infer_rows to keep them." % (infer_rows, sorted(unknown))
+        )
+        known.update(unknown)
+
+
+def write_csv(
+    rows: Iterable[Dict[str, Any]],
+    output: IO[str],
+    columns: Optional[Sequence[str]] = None,
+    infer_rows: int = INFER_ROWS,
+) -> int:
+    """Write the provided rows as CSV, flattening nested values.
+
+    Keys outside of the columns are dropped. If ``columns`` isn't provided, the header holds
+    the keys of the first ``infer_rows`` rows, and later keys are dropped with a warning.
+
+    Returns:
+        int: The number of rows written.
+
+    """
+    flat_rows: Iterator[Dict[str, Any]] = (flatten_row(row) for row in rows)
+    known: Optional[Set[str]] = None
+    if not columns:
+        _, columns, flat_rows = infer_columns(flat_rows, infer_rows=infer_rows)
+        known = set(columns)
+        if not columns:
+            return 0
+    writer = csv.DictWriter(output, fieldnames=list(columns), extrasaction="ignore")
+    count = 0
+    for flat in flat_rows:
+        if not count:
+            writer.writeheader()
+        if known is not None:
+            warn_unknown_columns(flat, known, infer_rows)
+        writer.writerow(flat)
+        count += 1
+    return count
+
+
+def write_parquet(
+    rows: Iterable[Dict[str, Any]],
+    path: str,
+    batch_size: int = 10000,
+    compression: str = "",
+    columns: Optional[Sequence[str]] = None,
+    schema: Any = None,
+    infer_rows: int = INFER_ROWS,
+) -> int:
+    """Write the provided rows as Parquet, one row group per batch of rows.
+
+    If ``schema`` isn't provided, it is inferred from the first ``infer_rows`` rows. Mixed
+    integer and float columns are stored as float, columns that are null or of conflicting
+    types in those rows are stored as string, and keys first seen after them are dropped
+    with a warning. Values that can't be cast to the type of their column are written as null.
+
+    Args:
+        rows (iterable of dict): The rows to write.
+        path (str): The output path. Parquet can't be written to stdout.
+        batch_size (int): The number of rows per row group. Defaults to: 10000.
+        compression (str): The Parquet compression codec. Defaults to: snappy.
+        columns (sequence of str): The columns to keep. Defaults to: the columns of every row,
+            or of the schema if provided.
+        schema (pyarrow.Schema): The explicit schema of the file. Defaults to: inferred.
+        infer_rows (int): The number of rows the schema is inferred from. Defaults to: 1000.
+
+    Returns:
+        int: The number of rows written.
+
+    """
+    if path == "-":
+        raise ValueError("Parquet exports can't be written to stdout!")
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise ImportError("PyArrow currently not installed! Parquet export disabled!")
+
+    def infer_type(values: List[Any]) -> Any:
+        try:
+            kind = pa.array(values).type
+        except (pa.ArrowInvalid, pa.ArrowTypeError, pa.ArrowNotImplementedError):
+            return pa.string()
+        return pa.string() if pa.types.is_null(kind) else kind
+
+    def to_array(values: List[Any], kind: Any) -> Any:
+        if pa.types.is_string(kind):
+            values = [
+                value if value is None or isinstance(value, str) else str(value)
+                for value in values
+            ]
+        try:
+            return pa.array(values, type=kind)
+        except (pa.ArrowInvalid, pa.ArrowTypeError, pa.ArrowNotImplementedError):
+            pass
+        cast: List[Any] = []
+        for value in values:
+            try:
+                cast.append(pa.scalar(value, type=kind).as_py())
+            except (pa.ArrowInvalid, pa.ArrowTypeError, pa.ArrowNotImplementedError):
+                cast.append(None)
+        logger.warning(
+            "Writing %s values that don't match the column type (%s) as null!"
+            % (len([value for value in cast if value is None]), kind)
+        )
+        return pa.array(cast, type=kind)
+
+    flat_rows: Iterator[Dict[str, Any]] = (flatten_row(row) for row in rows)
+    known: Optional[Set[str]] = None
+    if schema is None:
+        sample, names, flat_rows = infer_columns(flat_rows, infer_rows=infer_rows)
+        names = list(columns or names)
+        if not sample or not names:
+            return 0
+        if not columns:
+            known = set(names)
+        schema = pa.schema(
+            [(name, infer_type([row.get(name) for row in sample])) for name in names]
+        )
+    elif columns:
+        schema = pa.schema([schema.field(name) for name in columns])
+
+    count = 0
+    writer = pq.ParquetWriter(path, schema, compression=compression or "snappy")
+    try:
+        while True:
+            batch = list(islice(flat_rows, batch_size))
+            if not batch:
+                break
+            if known is not None:
+                for row in batch:
+                    warn_unknown_columns(row, known, infer_rows)
+            arrays = [
+                to_array([row.get(field.name) for row in batch], field.type)
+                for field in schema
+            ]
+            writer.write_table(pa.Table.from_arrays(arrays, schema=schema))
+            count += len(batch)
+    finally:
+        writer.close()
+    return count
+
+
+def export_rows(
+    rows: Iterable[Dict[str, Any]],
+    out: str,
+    output_format: str = "ndjson",
+    compression: str = "",
+    batch_size: int = 10000,
+    columns: Optional[Sequence[str]] = None,
+    schema: Any = None,
+    infer_rows: int = INFER_ROWS,
+) -> Dict[str, Any]:
+    """Stream the provided rows to a file.
+
+    Args:
+        rows (iterable of dict): The rows to export.
+        out (str): The output path, or ``-`` for stdout (ndjson and csv only).
+        output_format (str): The output format. Options are: ndjson, csv and parquet.
+            Defaults to: ndjson.
+        compression (str): The compression to apply. Options are: gzip, bz2 and xz for ndjson
+            and csv, or any PyArrow codec for parquet. Defaults to: inferred from the path suffix.
+        batch_size (int): The number of rows per Parquet row group. Defaults to: 10000.
+        columns (sequence of str): The csv or parquet columns to write.
+            Defaults to: the columns of the first infer_rows rows.
+        schema (pyarrow.Schema): The explicit parquet schema.
+            Defaults to: inferred from the first infer_rows rows.
+        infer_rows (int): The number of rows held in memory to infer the csv columns or the
+            parquet schema from, when not provided. Defaults to: 1000.
+
+    Returns:
+        dict: The export summary, with the output path, format, compression, row count and duration.
+
+    """
+    output_format = output_format.lower()
+    if output_format not in FORMATS:
+        raise ValueError(f"Unsupported export format: {output_format}")
+
+    started = time.monotonic()
+    if output_format == "parquet":
+        count = write_parquet(
+            rows,
+            out,
+            batch_size=batch_size,
+            compression=compression,
+            columns=columns,
+            schema=schema,
+            infer_rows=infer_rows,
+        )
+    else:
+        compression = compression or infer_compression(out)
+        with open_output(out, compression=compression) as output:
+            if output_format == "csv":
+                count = write_csv(rows, output, columns=columns, infer_rows=infer_rows)
+            else:
+                count = write_ndjson(rows, output)
+    summary: Dict[str, Any] = {
+        "out": out,
+        "format": output_format,
+        "compression": compression or ("snappy" if output_format == "parquet" else ""),
+        "rows": count,
+        "seconds": round(time.monotonic() - started, 3),
+    }
+    logger.info("Export complete: (%s)" % summary)
+    return summary
@@ -0,0 +1,336 @@
+# -*- coding: utf-8 -*-
+"""Define the RISC connectivity graph module.
+
+Devices are interned to integer node IDs and edges are stored in typed arrays, so the graph
+holds tens of millions of edges without per-edge Python objects. The same connection may be
+reported by the internal and external connectivity, or by the stacks of both of its ends, so
+repeated rows are dropped before they are aggregated. Rows of the same device pair are then
+merged into one edge, and the compressed sparse row (CSR) adjacency used by the queries is
+built lazily, on the first query after new rows are added.
+
+"""
+import heapq
+import logging
+from array import array
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None
+
+logger = logging.getLogger(__name__)
+
+WEIGHTS: Tuple[str, ...] = ("total_bytes", "rows", "avg_rtt")
+
+
+def node_key(deviceid: Any, ip: Any) -> Any:
+    """Get the node key of a connection endpoint, preferring the device ID over the IP."""
+    return int(deviceid) if deviceid else ip or ""
+
+
+class ConnectivityGraph:
+    """Define the device connectivity graph.
+
+    Nodes are keyed by device ID, or by IP for endpoints without a device ID, such as
+    external hosts. Edges are directed from source to destination and weighted by
+    ``total_bytes``, ``rows`` (the number of distinct connectivity rows merged into the edge)
+    and the row-weighted ``avg_rtt``. Neighbor and component queries treat the graph as
+    undirected.
+
+    A row is a duplicate when its source, destination, destination port and processes match
+    an earlier row. Only a hash of those values is kept per row.
+
+    Example:
+        graph = risc.connectivity_graph()
+        graph.components()[0]
+        graph.top_pairs(10, weight="total_bytes")
+
+    """
+
+    def __init__(self) -> None:
+        """Initialize the ConnectivityGraph class."""
+        self.nodes: List[Any] = []
+        self.node_ids: Dict[Any, int] = {}
+        self.node_stacks = array("q")
+        self.sources = array("q")
+        self.dests = array("q")
+        self.total_bytes = array("q")
+        self.rows = array("q")
+        self.rtt_sum = array("d")
+        self.row_keys: Set[int] = set()
+        self.duplicate_rows: int = 0
+        self._merged: bool = True
+        self._csr: Optional[Tuple[Any, Any, Any]] = None
+
+    def __repr__(self):
+        """Provide the representation for the ConnectivityGraph object."""
+        return (
+            f"<ConnectivityGraph - Nodes: {len(self.nodes)} - Edges: {self.edge_count}>"
+        )
+
+    @property
+    def edge_count(self) -> int:
+        """Get the number of distinct edges."""
+        self._merge_edges()
+        return len(self.sources)
+
+    def node_id(self, key: Any, stack_id: int = 0) -> int:
+        """Get the integer ID of the provided node key, interning it if needed."""
+        node = self.node_ids.get(key)
+        if node is None:
+            node = self.node_ids[key] = len(self.nodes)
+            self.nodes.append(key)
+            self.node_stacks.append(stack_id)
+        elif stack_id and not self.node_stacks[node]:
+            self.node_stacks[node] = stack_id
+        return node
+
+    def node_stack(self, key: Any) -> int:
+        """Get the stack ID of the provided node, or 0 if it is unknown."""
+        node = self.node_ids.get(key)
+        return self.node_stacks[node] if node is not None else 0
+
+    def add_rows(self, rows: Iterable[Dict[str, Any]], stack_id: int = 0) -> None:
+        """Add decoded device connectivity rows, as returned from the RISC API.
+
+        Args:
+            rows (iterable of dict): The device connectivity rows.
+            stack_id (int): The stack the rows were retrieved for. It is assigned to the source
+                devices, since the destination may belong to another stack. Defaults to: 0.
+
+        """
+        for row in rows:
+            source = self.node_id(
+                node_key(row.get("source_deviceid"), row.get("src_ip")), stack_id
+            )
+            dest = self.node_id(node_key(row.get("dest_deviceid"), row.get("dest_ip")))
+            row_key = hash(
+                (
+                    source,
+                    dest,
+                    row.get("dest_port"),
+                    row.get("source_process"),
+                    row.get("dest_process"),
+                )
+            )
+            if row_key in self.row_keys:
+                self.duplicate_rows += 1
+                continue
+            self.row_keys.add(row_key)
+            self.sources.append(source)
+            self.dests.append(dest)
+            self.total_bytes.append(int(row.get("total_bytes") or 0))
+            self.rows.append(1)
+            self.rtt_sum.append(float(row.get("avg_rtt") or 0.0))
+            self._merged = False
+        self._csr = None
+
+    def _merge_edges(self) -> None:
+        """Merge duplicate (source, destination) edges, summing their weights."""
+        if self._merged:
+            return
+        size = max(len(self.nodes), 1)
+        if np is not None:
+            keys = np.frombuffer(self.sources, dtype="q") * size + np.frombuffer(
+                self.dests, dtype="q"
+            )
+            unique, inverse = np.unique(keys, return_inverse=True)
+            columns = {
+                "total_bytes": np.bincount(
+                    inverse, weights=np.frombuffer(self.total_bytes, dtype="q")
+                ).astype("q"),
+                "rows": np.bincount(
+                    inverse, weights=np.frombuffer(self.rows, dtype="q")
+                ).astype("q"),
+                "rtt_sum": np.bincount(
+                    inverse, weights=np.frombuffer(self.rtt_sum, dtype="d")
+                ),
+            }
+            self.sources = array("q", (unique // size).astype("q").tobytes())
+            self.dests = array("q", (unique % size).astype("q").tobytes())
+            for name, values in columns.items():
+                setattr(
+                    self, name, array(getattr(self, name).typecode, values.tobytes())
+                )
+        else:
+            merged: Dict[int, int] = {}
+            sources, dests = array("q"), array("q")
+            total_bytes, rows, rtt_sum = array("q"), array("q"), array("d")
+            for i in range(len(self.sources)):
+                key = self.sources[i] * size + self.dests[i]
+                edge = merged.get(key)
+                if edge is None:
+                    merged[key] = len(sources)
+                    sources.append(self.sources[i])
+                    dests.append(self.dests[i])
+                    total_bytes.append(self.total_bytes[i])
+                    rows.append(self.rows[i])
+                    rtt_sum.append(self.rtt_sum[i])
+                else:
+                    total_bytes[edge] += self.total_bytes[i]
+                    rows[edge] += self.rows[i]
+                    rtt_sum[edge] += self.rtt_sum[i]
+            self.sources, self.dests = sources, dests
+            self.total_bytes, self.rows, self.rtt_sum = (
+                total_bytes,
+                rows,
+                rtt_sum,
+            )
+        self._merged = True
+
+    def _build_csr(self) -> Tuple[Any, Any, Any]:
+        """Build the undirected CSR adjacency as (offsets, neighbors, edges) arrays."""
+        self._merge_edges()
+        if self._csr is not None:
+            return self._csr
+        size = len(self.nodes)
+        edge_count = len(self.sources)
+        if np is not None and edge_count:
+            ends = np.concatenate(
+                [
+                    np.frombuffer(self.sources, dtype="q"),
+                    np.frombuffer(self.dests, dtype="q"),
+                ]
+            )
+            others = np.concatenate(
+                [
+                    np.frombuffer(self.dests, dtype="q"),
+                    np.frombuffer(self.sources, dtype="q"),
+                ]
+            )
+            edges = np.concatenate([np.arange(edge_count)] * 2)
+            order = np.argsort(ends, kind="stable")
+            offsets = np.zeros(size + 1, dtype="q")
+            np.cumsum(np.bincount(ends, minlength=size), out=offsets[1:])
+            self._csr = (offsets, others[order], edges[order])
+            return self._csr
+
+        degrees = [0] * (size + 1)
+        for node in self.sources:
+            degrees[node + 1] += 1
+        for node in self.dests:
+            degrees[node + 1] += 1
+        for i in range(size):
+            degrees[i + 1] += degrees[i]
+        offsets = array("q", degrees)
+        cursor = list(degrees[:size])
+        neighbors = array("q", bytes(8 * 2 * edge_count))
+        edges = array("q", bytes(8 * 2 * edge_count))
+        for edge in range(edge_count):
+            source, dest = self.sources[edge], self.dests[edge]
+            for node, other in ((source, dest), (dest, source)):
+                neighbors[cursor[node]] = other
+                edges[cursor[node]] = edge
+                cursor[node] += 1
+        self._csr = (offsets, neighbors, edges)
+        return self._csr
+
+    def edge(self, edge: int) -> Dict[str, Any]:
+        """Get the dictionary representation of the provided edge index."""
+        rows = self.rows[edge]
+        return {
+            "source": self.nodes[self.sources[edge]],
+            "dest": self.nodes[self.dests[edge]],
+            "total_bytes": self.total_bytes[edge],
+            "rows": rows,
+            "avg_rtt": self.rtt_sum[edge] / rows if rows else 0.0,
+        }
+
+    def edges(self) -> Iterator[Dict[str, Any]]:
+        """Iterate through all distinct edges."""
+        self._merge_edges()
+        for edge in range(len(self.sources)):
+            yield self.edge(edge)
+
+    def neighbors(self, key: Any) -> List[Dict[str, Any]]:
+        """Get the edges connecting the provided node to its neighbors, in either direction.
+
+        Returns:
+            list of dict: The edges, with the neighbor node key stored under ``node``.
+
+        """
+        node = self.node_ids.get(key)
+        if node is None:
+            return []
+        offsets, neighbors, edges = self._build_csr()
+        results: List[Dict[str, Any]] = []
+        for i in range(int(offsets[node]), int(offsets[node + 1])):
+            data = self.edge(int(edges[i]))
+            data["node"] = self.nodes[int(neighbors[i])]
+            results.append(data)
+        return results
+
+    def components(self, min_size: int = 1) -> List[List[Any]]:
+        """Get the connected components of the graph, e.g. to seed migration move groups.
+
+        Args:
+            min_size (int): The minimum number of nodes of returned components. Defaults to: 1.
+
+        Returns:
+            list of list: The node keys of each component, largest component first.
+
+        """
+        self._merge_edges()
+        parents = list(range(len(self.nodes)))
+
+        def find(node: int) -> int:
+            while parents[node] != node:
+                parents[node] = parents[parents[node]]
+                node = parents[node]
+            return node
+
+        for source, dest in zip(self.sources, self.dests):
+            root_source, root_dest = find(source), find(dest)
+            if root_source != root_dest:
+                parents[max(root_source, root_dest)] = min(root_source, root_dest)
+
+        groups: Dict[int, List[Any]] = {}
+        for node, key in enumerate(self.nodes):
+            groups.setdefault(find(node), []).append(key)
+        components = [group for group in groups.values() if len(group) >= min_size]
+        return sorted(components, key=len, reverse=True)
+
+    def cut_edges(self) -> Iterator[Dict[str, Any]]:
+        """Iterate through the edges connecting devices of two different known stacks.
+
+        Yields:
+            dict: The edge, with the source and destination stack IDs.
+
+        """
+        self._merge_edges()
+        for edge in range(len(self.sources)):
+            source_stack = self.node_stacks[self.sources[edge]]
+            dest_stack = self.node_stacks[self.dests[edge]]
+            if source_stack and dest_stack and source_stack != dest_stack:
+                data = self.edge(edge)
+                data["source_stack"] = source_stack
+                data["dest_stack"] = dest_stack
+                yield data
+
+    def top_pairs(
+        self, n: int = 10, weight: str = "total_bytes"
+    ) -> List[Dict[str, Any]]:
+        """Get the N chattiest device pairs.
+
+        Args:
+            n (int): The number of pairs to return. Defaults to: 10.
+            weight (str): The edge weight to rank by.
+                Options are: total_bytes, rows and avg_rtt. Defaults to: total_bytes.
+
+        Returns:
+            list of dict: The top edges, highest weight first.
+
+        """
+        if weight not in WEIGHTS:
+            raise ValueError(f"Unsupported edge weight: {weight}")
+        self._merge_edges()
+        if weight == "avg_rtt":
+            values: Any = (
+                self.rtt_sum[i] / self.rows[i] if self.rows[i] else 0.0
+                for i in range(len(self.sources))
+            )
+        else:
+            values = getattr(self, weight)
+        top = heapq.nlargest(n, enumerate(values), key=lambda item: item[1])
+        return [self.edge(edge) for edge, _ in top]
@@ -1,23 +1,65 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
 """Define the RISC primary module."""
-import hashlib
 import logging
 import os
-from typing import Any, Dict, List
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from itertools import count
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
 
 import fire
-import requests
+from requests.adapters import HTTPAdapter
 from requests.models import Response
 from requests.sessions import Session
 
+from risc.cache import DiskCacheBackend, ResponseCache, TokenCache
+from risc.columnar import DEFAULT_COLUMNS, ConnectivityColumns
+from risc.costs import StackCostComparison, get_provider_ids
+from risc.export import COMPRESSION_SUFFIXES, INFER_ROWS, export_rows
+from risc.graph import ConnectivityGraph
 from risc.models import (
     RiscAssessment,
     RiscAssessments,
     RiscDeviceConnectivityParent,
     RiscStackConnectivityParent,
+    RiscStacks,
+)
+from risc.pricing import PricingService
+from risc.records import DeviceConnectivityRecord, StackConnectivityRecord
+from risc.sizing import DiskSizing, host_deviceid
+from risc.snapshot import SNAPSHOT_COMPARE_KEYS, RiscSnapshot, asset_records
+from risc.tags import (
+    SPLIT_STATUSES,
+    build_tags_payload,
+    dedupe_operations,
+    existing_tags,
+)
+from risc.transport import RateLimiter, RetryPolicy, build_session
+from risc.utils import (
+    RiscAssessmentsError,
+    build_auth_payload,
+    decode_json,
+    get_user_agent,
+    handle_disk_sizing,
+    iter_json_items,
+    map_concurrent,
+    page_records,
+    split_ints,
+    split_values,
 )
-from risc.utils import get_user_agent, handle_disk_sizing
 
 logger = logging.getLogger(__name__)
 
@@ -26,9 +68,63 @@ class RISC:
     """Define the RISC toplevel class."""
 
     def __init__(
-        self, api_token: str = "", user_id: str = "", password: str = ""
+        self,
+        api_token: str = "",
+        user_id: str = "",
+        password: str = "",
+        max_workers: int = 0,
+        lazy: bool = False,
+        token_cache: Any = None,
+        response_cache: Any = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        rate_limit: Union[float, RateLimiter] = 0,
+        pool_connections: int = 0,
+        pool_maxsize: int = 0,
+        timeout: Union[float, Tuple[float, float]] = 0,
+        keep_alive: Optional[bool] = None,
+        session: Optional[Session] = None,
+        adapter: Optional[HTTPAdapter] = None,
+        snapshot_path: str = "",
     ) -> None:
-        """Initialize the RISC class."""
+        """Initialize the RISC class.
+
+        Args:
+            api_token (str): The RISC API token. Defaults to: RISC_API_TOKEN.
+            user_id (str): The RISC user ID. Defaults to: RISC_USERNAME.
+            password (str): The RISC user password. Defaults to: RISC_PASSWORD.
+            max_workers (int): The maximum number of concurrent requests used by bulk methods.
+                Defaults to: RISC_MAX_WORKERS or 8.
+            lazy (bool): Whether or not to defer authentication until the first authenticated
+                call and the stack data fetch until it is first accessed. Defaults to: RISC_LAZY.
+            token_cache (TokenCache or bool): The token cache used to share authentication tokens
+                across processes. Pass True to use the default cache location.
+                Defaults to: enabled when RISC_TOKEN_CACHE is set.
+            response_cache (ResponseCache or bool): The cache used for read-only endpoints.
+                Pass True to use an in-memory cache. Defaults to: an in-memory cache backed by
+                disk when RISC_CACHE_DIR is set, otherwise disabled.
+            retry_policy (RetryPolicy): The retry policy applied to every request.
+                Defaults to: RetryPolicy(total=RISC_MAX_RETRIES or 3).
+            rate_limit (float or RateLimiter): The maximum number of requests per second, or a
+                RateLimiter shared with other clients. Defaults to: RISC_RATE_LIMIT or unlimited.
+            pool_connections (int): The number of per-host connection pools to cache.
+                Defaults to: RISC_POOL_CONNECTIONS or 10.
+            pool_maxsize (int): The maximum number of connections kept per host.
+                Defaults to: RISC_POOL_MAXSIZE or the larger of max_workers and 10.
+                With a provided session, an adapter is only mounted for pool sizes set
+                explicitly or through the environment.
+            timeout (float or tuple): The request timeout, in seconds, or a (connect, read) tuple.
+                Defaults to: (RISC_CONNECT_TIMEOUT or 10, RISC_READ_TIMEOUT or 120).
+            keep_alive (bool): Whether or not to keep connections open between requests.
+                Defaults to: RISC_KEEP_ALIVE or True.
+            session (Session): A preconfigured requests session to use. Its headers are never
+                modified, as the client headers are sent with each request. Defaults to: None.
+            adapter (HTTPAdapter): A preconfigured transport adapter to mount. Defaults to: None.
+            snapshot_path (str): The path of a local snapshot of the assessment, used to serve
+                lookup_stack_id, get_server and get_application_ips without any request.
+                Defaults to: RISC_SNAPSHOT_PATH, otherwise the RISC API is queried.
+
+
+        """
         self.api_host: str = os.environ.get(
             "RISC_API_HOST", "https://api.riscnetworks.com"
         )
@@ -37,48 +133,340 @@ class RISC:
             "RISC_API_ENDPOINT", f"{self.api_host}/{self.api_version}"
         )
         self.assessment_code: str = os.environ.get("RISC_ASSESSMENT_CODE", "")
+        self.max_workers: int = max_workers or int(
+            os.environ.get("RISC_MAX_WORKERS", "8")
+        )
         self.assessment_filters: Dict[str, str] = dict(
             zip(*[iter(os.environ.get("RISC_ASSESSMENT_FILTERS", "").split(","))] * 2)
         )
+        self.lazy: bool = lazy or os.environ.get("RISC_LAZY", "").lower() in (
+            "1",
+            "true",
+            "yes",
+        )
 
         self.auth: Dict[str, str] = {
             "user_id": user_id or os.environ.get("RISC_USERNAME", ""),
             "password": password or os.environ.get("RISC_PASSWORD", ""),
             "api_token": api_token or os.environ.get("RISC_API_TOKEN", ""),
         }
-        self.session: Session = requests.Session()
-        self.session.headers.update({"User-Agent": get_user_agent()})
+        self.token: str = ""
+        self.assessment: Optional[RiscAssessment] = None
+        if token_cache is True or (
+            token_cache is None and os.environ.get("RISC_TOKEN_CACHE")
+        ):
+            token_cache = TokenCache()
+        self.token_cache: Optional[TokenCache] = token_cache or None
+        if response_cache is None and os.environ.get("RISC_CACHE_DIR"):
+            response_cache = ResponseCache(backend=DiskCacheBackend())
+        elif response_cache is True:
+            response_cache = ResponseCache()
+        self.response_cache: Optional[ResponseCache] = response_cache or None
+        self.retry_policy: RetryPolicy = retry_policy or RetryPolicy(
+            total=int(os.environ.get("RISC_MAX_RETRIES", "3"))
+        )
+        rate_limit = rate_limit or float(os.environ.get("RISC_RATE_LIMIT", "0"))
+        if rate_limit and not isinstance(rate_limit, RateLimiter):
+            rate_limit = RateLimiter(rate_limit)
+        self.rate_limiter: Optional[RateLimiter] = rate_limit or None
+        self.timeout: Union[float, Tuple[float, float]] = timeout or (
+            float(os.environ.get("RISC_CONNECT_TIMEOUT", "10")),
+            float(os.environ.get("RISC_READ_TIMEOUT", "120")),
+        )
+        if keep_alive is None:
+            keep_alive = os.environ.get("RISC_KEEP_ALIVE", "true").lower() not in (
+                "0",
+                "false",
+                "no",
+            )
+        self.keep_alive: bool = keep_alive
+        pool_maxsize = pool_maxsize or int(os.environ.get("RISC_POOL_MAXSIZE", "0"))
+        self.session: Session = build_session(
+            pool_connections=pool_connections
+            or int(os.environ.get("RISC_POOL_CONNECTIONS", "0")),
+            pool_maxsize=pool_maxsize
+            or (max(self.max_workers, 10) if session is None else 0),
+            adapter=adapter,
+            session=session,
+        )
+
+        self.snapshot_path: str = snapshot_path or os.environ.get(
+            "RISC_SNAPSHOT_PATH", ""
+        )
+
+        self._auth_lock = threading.RLock()
+        self._assessments: Optional[RiscAssessments] = None
+        self._assessments_lock = threading.Lock()
+        self._assessment_clients: Dict[str, "RISC"] = {}
+        self._pricing: Optional[PricingService] = None
+        self._stack_data: Optional[Dict[str, Any]] = None
+        self._stacks: Optional[RiscStacks] = None
+        self._local_snapshot: Optional[RiscSnapshot] = None
+
+        if self.lazy:
+            return
 
-        if self.assessment_filters:
-            self.assessment = self.get_assessment(**self.assessment_filters)
-            self.assessment_code = self.assessment.assessment_code
+        if not self.authenticate():
+            return
+
+        self.refresh_stack_data()
 
+    def __repr__(self):
+        """Provide the representation for the RISC object."""
+        if self.assessment:
+            return f"<RISC - User: {self.auth.get('user_id', '')} - Assessment: {self.assessment.assessment_code}>"
+        return f"<RISC - User: {self.auth.get('user_id', '')}>"
+
+    @property
+    def stack_data(self) -> Dict[str, Any]:
+        """Get the stack summary data, fetching it on first access."""
+        if self._stack_data is None:
+            self.refresh_stack_data()
+        return self._stack_data or {}
+
+    @stack_data.setter
+    def stack_data(self, value: Dict[str, Any]) -> None:
+        """Set the stack summary data and drop the stale stack index."""
+        self._stack_data = value
+        self._stacks = None
+
+    @property
+    def stacks(self) -> RiscStacks:
+        """Get the indexed stacks of the stack summary data.
+
+        The index is rebuilt whenever the stack data is refreshed.
+
+        """
+        if self._stacks is None:
+            self._stacks = RiscStacks(stacks=self.stack_data.get("assets", []))
+        return self._stacks
+
+    @property
+    def local_snapshot(self) -> Optional[RiscSnapshot]:
+        """Get the configured local snapshot, if it was taken from the client assessment.
+
+        The snapshot is opened on first access. A missing, empty or foreign snapshot is not used,
+        so lookups fall back to the RISC API.
+
+        """
+        if not self.snapshot_path:
+            return None
+        with self._auth_lock:
+            if self._local_snapshot is None:
+                if not os.path.exists(self.snapshot_path):
+                    logger.error(
+                        "Snapshot not found: (%s) - Querying the RISC API instead!"
+                        % self.snapshot_path
+                    )
+                    self.snapshot_path = ""
+                    return None
+                self._local_snapshot = RiscSnapshot(self.snapshot_path)
+        snapshot = self._local_snapshot
         if (
-            not self.assessment_code
-            and not self.assessment_filters
-            or (self.assessment_filters and not self.assessment_code)
+            not snapshot.refreshed_at
+            or snapshot.assessment_code != self.assessment_code
         ):
-            logger.error("You must configure the assessment code or filter criteria!")
-            return
+            return None
+        return snapshot
 
-        self.token = self.get_auth_token()
-        self.session.headers.update(
-            {"token": self.token, "assessmentcode": self.assessment_code}
-        )
+    def refresh_stack_data(self) -> Dict[str, Any]:
+        """Fetch the stack summary data from RISC, replacing any cached copy.
 
+        Returns:
+            dict: The stack summary data.
+
+        """
         try:
-            self.stack_data = self.stacks_get_summary().json()
+            self.stack_data = decode_json(self.stacks_get_summary(use_cache=False))
         except Exception as e:
             logger.error(
                 "Error encountered while attempting to fetch RISC stack data! Error: (%s)"
                 % e
             )
+            self.stack_data = {}
+        return self.stack_data
 
-    def __repr__(self):
-        """Provide the representation for the RISC object."""
-        if self.assessment:
-            return f"<RISC - User: {self.auth.get('user_id', '')} - Assessment: {self.assessment.assessment_code}>"
-        return f"<RISC - User: {self.auth.get('user_id', '')}>"
+    def authenticate(self) -> str:
+        """Resolve the assessment code and fetch the authentication token.
+
+        Returns:
+            str: The authentication token, or an empty string if authentication failed.
+
+        """
+        with self._auth_lock:
+            if self.assessment_filters and self.assessment is None:
+                self.assessment = self.get_assessment(**self.assessment_filters)
+                self.assessment_code = self.assessment.assessment_code
+
+            if not self.assessment_code:
+                logger.error(
+                    "You must configure the assessment code or filter criteria!"
+                )
+                return ""
+
+            user_id: str = self.auth.get("user_id", "")
+            if self.token_cache:
+                self.token = self.token_cache.get(user_id, self.assessment_code)
+                if self.token:
+                    return self.token
+
+            self.token = self.get_auth_token()
+            if self.token and self.token_cache:
+                self.token_cache.set(user_id, self.assessment_code, self.token)
+            return self.token
+
+    def reauthenticate(self, stale_token: str = "") -> str:
+        """Discard the current token and authenticate again.
+
+        Args:
+            stale_token (str): The token that was rejected. If another thread already replaced it,
+                the new token is reused instead of authenticating again.
+
+        Returns:
+            str: The new authentication token.
+
+        """
+        with self._auth_lock:
+            if stale_token and self.token != stale_token:
+                return self.token
+            if self.token_cache:
+                self.token_cache.invalidate(
+                    self.auth.get("user_id", ""),
+                    self.assessment_code,
+                    stale_token=stale_token or self.token,
+                )
+            self.token = ""
+            return self.authenticate()
+
+    def _ensure_authenticated(self) -> None:
+        """Authenticate on the first authenticated call, and again until it succeeds.
+
+        Nothing is latched on failure, so a transient getAuthToken error is retried by the
+        next authenticated request instead of leaving the client without a token.
+
+        """
+        if self.token:
+            return
+        with self._auth_lock:
+            if not self.token:
+                self.authenticate()
+
+    @property
+    def client_headers(self) -> Dict[str, str]:
+        """Get the headers sent with every request, authenticated or not."""
+        headers: Dict[str, str] = {"User-Agent": get_user_agent()}
+        if not self.keep_alive:
+            headers["Connection"] = "close"
+        return headers
+
+    @property
+    def auth_headers(self) -> Dict[str, str]:
+        """Get the headers used to authenticate requests against the RISC API."""
+        headers: Dict[str, str] = {}
+        if self.token:
+            headers["token"] = self.token
+        if self.assessment_code:
+            headers["assessmentcode"] = self.assessment_code
+        return headers
+
+    def _request(
+        self,
+        method: str,
+        url: str,
+        headers: Optional[Dict[str, str]] = None,
+        authenticated: bool = True,
+        use_cache: bool = False,
+        **kwargs,
+    ) -> Response:
+        """Send a request to the RISC API.
+
+        All per-call state, including the authentication and page headers, is passed with
+        the individual request rather than stored on the shared session, which allows a
+        single RISC instance to be used from multiple threads. A 401 response triggers a
+        single re-authentication and retry.
+
+        Args:
+            method (str): The HTTP method to use.
+            url (str): The full URL to request.
+            headers (dict): The additional headers to send with this request only.
+            authenticated (bool): Whether or not to include the authentication headers.
+                Defaults to: True.
+            use_cache (bool): Whether or not to serve the GET request from the response cache,
+                if one is configured. Defaults to: False.
+            **kwargs: The additional keyword arguments passed to the session request.
+
+        Returns:
+            Response: The response returned by the RISC API.
+
+        """
+        cache_key: str = ""
+        # Streamed bodies are read once by the caller, so they are never cached.
+        if kwargs.get("stream"):
+            use_cache = False
+        if use_cache and self.response_cache and method.upper() == "GET":
+            cache_key = f"{self.assessment_code}:{method.upper()}:{url}:{headers or {}}"
+            cached: Optional[Response] = self.response_cache.get(cache_key)
+            if cached is not None:
+                return cached
+
+        if authenticated:
+            self._ensure_authenticated()
+        request_headers: Dict[str, str] = self.client_headers
+        if authenticated:
+            request_headers.update(self.auth_headers)
+        request_headers.update(headers or {})
+        response: Response = self._send(method, url, headers=request_headers, **kwargs)
+
+        # The token expired or was revoked, so authenticate again and retry once.
+        if authenticated and response.status_code == 401 and self.token:
+            logger.info("Authentication token rejected! Re-authenticating...")
+            if self.reauthenticate(stale_token=request_headers.get("token", "")):
+                response.close()
+                request_headers.update(self.auth_headers)
+                response = self._send(method, url, headers=request_headers, **kwargs)
+
+        if cache_key and self.response_cache and response.status_code == 200:
+            self.response_cache.set(cache_key, response)
+        return response
+
+    def _send(self, method: str, url: str, **kwargs) -> Response:
+        """Send a single request, applying the rate limiter and retry policy.
+
+        Retries back off exponentially with jitter, honoring any Retry-After header sent with
+        429 and 5xx responses.
+
+        Returns:
+            Response: The final response returned by the RISC API.
+
+        """
+        attempt = 0
+        while True:
+            kwargs.setdefault("timeout", self.timeout)
+            if self.rate_limiter:
+                self.rate_limiter.acquire()
+            try:
+                response: Response = self.session.request(method, url, **kwargs)
+            except Exception as e:
+                if not self.retry_policy.should_retry(method, attempt, error=e):
+                    raise
+                delay = self.retry_policy.backoff(attempt)
+                logger.warning(
+                    "Request failed: (%s %s) - Error: (%s) - Retrying in %.2fs..."
+                    % (method, url, e, delay)
+                )
+            else:
+                if not self.retry_policy.should_retry(
+                    method, attempt, response=response
+                ):
+                    return response
+                delay = self.retry_policy.backoff(attempt, response=response)
+                response.close()
+                logger.warning(
+                    "Request failed: (%s %s) - Status: (%s) - Retrying in %.2fs..."
+                    % (method, url, response.status_code, delay)
+                )
+            time.sleep(delay)
+            attempt += 1
 
     def build_auth(self) -> Dict[str, str]:
         """Build the API authentication token."""
@@ -86,53 +474,199 @@ class RISC:
         _api_token: str = self.auth.get("api_token", "")
         _password: str = self.auth.get("password", "")
         logger.info("Building authentication dictionary for user: %s" % user_id)
+        return build_auth_payload(
+            user_id=user_id,
+            password=_password,
+            api_token=_api_token,
+            assessment_code=self.assessment_code,
+        )
 
-        md5_password: str = hashlib.md5(_password.encode()).hexdigest().upper()
-        md5_api_token: str = f"{_api_token}{md5_password}"
-        auth_string: str = hashlib.md5(md5_api_token.encode()).hexdigest()
-        logger.info("Authentication md5 hash: %s" % auth_string)
-        auth = {"userid": user_id, "password": auth_string}
+    def get_assessments(self, use_cache: bool = True) -> RiscAssessments:
+        """Get the indexed RISC assessments available to the user.
 
-        if self.assessment_code:
-            auth["assessmentcode"] = self.assessment_code
-        return auth
+        The assessments are fetched once per RISC instance (and once per user across instances
+        sharing a response cache) and indexed for filtering. Concurrent calls share one fetch.
 
-    def get_assessments(self) -> RiscAssessments:
-        """Get the RISC assessment code.
+        Args:
+            use_cache (bool): Whether or not to reuse the previously fetched assessments.
+                Defaults to: True.
 
         Returns:
-            str: The RISC assessment code.
+            RiscAssessments: The RISC assessments.
 
         """
+        # Concurrent callers, e.g. the across_assessments workers, wait for a single fetch.
+        with self._assessments_lock:
+            if use_cache and self._assessments is not None:
+                return self._assessments
+
+            payload = self.build_auth()
+            response: Response = self._request(
+                "GET",
+                f"{self.api_endpoint}/getAssessments",
+                headers=payload,
+                authenticated=False,
+                use_cache=use_cache,
+            )
+
+            if response.status_code != 200:
+                logger.error("Unable to retrieve the assessment code!")
+                return RiscAssessments()
+
+            assessment_items = decode_json(response).get("assessments", [])
+            self._assessments = RiscAssessments(
+                response=response, assessments=assessment_items
+            )
+            return self._assessments
+
         payload = self.build_auth()
-        response: Response = self.session.get(
-            f"{self.api_endpoint}/getAssessments", headers=payload
+        response: Response = self._request(
+            "GET",
+            f"{self.api_endpoint}/getAssessments",
+            headers=payload,
+            authenticated=False,
+            use_cache=use_cache,
         )
 
         if response.status_code != 200:
             logger.error("Unable to retrieve the assessment code!")
             return RiscAssessments()
 
-        assessment_items = response.json().get("assessments", [])
-        _assessments = RiscAssessments(assessments=assessment_items)
-        return _assessments
+        assessment_items = decode_json(response).get("assessments", [])
+        self._assessments = RiscAssessments(
+            response=response, assessments=assessment_items
+        )
+        return self._assessments
 
     def get_assessment(self, **kwargs) -> RiscAssessment:
-        """Get the RISC assessment code.
+        """Get the first non-demo RISC assessment matching the provided filter criteria.
+
+        Example:
+            risc.get_assessment(company_name="Acme", assessment_stage_name="Active")
+
+        Args:
+            **kwargs: The RiscAssessment field values to match, ignoring case.
+                Defaults to: RISC_ASSESSMENT_FILTERS.
 
         Returns:
-            str: The RISC assessment code.
+            RiscAssessment: The matching assessment, or an empty assessment if none match.
 
         """
-        response_data: RiscAssessments = self.get_assessments()
-        if not response_data:
-            return RiscAssessment()
+        return self.get_assessments().select(**(kwargs or self.assessment_filters))
+
+    def for_assessment(self, assessment: Union[str, RiscAssessment]) -> "RISC":
+        """Get a lazy RISC client bound to another assessment of the same user.
 
-        if len(response_data.assessments) > 1:
-            logger.warn(
-                "Multiple assessments found for the provided filter criteria! Returning the first result..."
+        The client shares this instance's credentials, session (and its connection pool),
+        token and response caches, rate limiter, retry policy and timeout. Clients are kept
+        per assessment code, so their tokens are reused across calls.
+
+        Args:
+            assessment (str or RiscAssessment): The assessment, or its assessment code.
+
+        Returns:
+            RISC: The client bound to the assessment.
+
+        """
+        if isinstance(assessment, RiscAssessment):
+            code = assessment.assessment_code
+        else:
+            code = assessment
+            assessment = self.get_assessments().get_by_code(code) or RiscAssessment(
+                assessment_code=code
             )
-        return next(item for item in response_data.assessments if not item.is_demo)
+
+        with self._auth_lock:
+            client = self._assessment_clients.get(code)
+            if client is None:
+                client = RISC(
+                    api_token=self.auth.get("api_token", ""),
+                    user_id=self.auth.get("user_id", ""),
+                    password=self.auth.get("password", ""),
+                    max_workers=self.max_workers,
+                    lazy=True,
+                    token_cache=self.token_cache or False,
+                    response_cache=self.response_cache or False,
+                    retry_policy=self.retry_policy,
+                    rate_limit=self.rate_limiter or 0,
+                    timeout=self.timeout,
+                    session=self.session,
+                )
+                # Bind the assessment directly, so RISC_ASSESSMENT_FILTERS isn't applied.
+                client.assessment = assessment
+                client.assessment_code = code
+                self._assessment_clients[code] = client
+        return client
+
+    def across_assessments(
+        self,
+        method: Union[str, Callable[["RISC"], Any]],
+        assessment_codes: Union[str, Iterable[str]] = (),
+        include_demo: bool = False,
+        workers: int = 0,
+        **kwargs,
+    ) -> Dict[str, Any]:
+        """Run the same query across many assessments concurrently.
+
+        Example:
+            risc.across_assessments("stacks_get_summary_cost", provider_id="aws")
+
+        Args:
+            method (str or callable): The name of the RISC method to call, or a callable
+                receiving the per-assessment client.
+            assessment_codes (str or iterable of str): The assessment codes to query, either as
+                an iterable or a comma-separated string.
+                Defaults to: all assessments available to the user.
+            include_demo (bool): Whether or not to include demo assessments when querying all
+                assessments. Defaults to: False.
+            workers (int): The maximum number of concurrent assessments.
+                Defaults to: the RISC max_workers setting.
+            **kwargs: The keyword arguments passed to the method.
+
+        Returns:
+            dict: The mapping of assessment code to the method result.
+
+        Raises:
+            RiscAssessmentsError: If the query raised an error for any assessment, once every
+                query has completed. Its errors and results attributes map each assessment code
+                to the raised error or the successful result.
+
+        """
+        assessment_codes = split_values(assessment_codes)
+        if assessment_codes:
+            assessments: List[Any] = assessment_codes
+        else:
+            assessments = [
+                item
+                for item in self.get_assessments().assessments
+                if include_demo or not item.is_demo
+            ]
+
+        def run(assessment: Any) -> Any:
+            client = self.for_assessment(assessment)
+            try:
+                if callable(method):
+                    return client.assessment_code, method(client, **kwargs)
+                return client.assessment_code, getattr(client, method)(**kwargs)
+            except Exception as e:
+                logger.error(
+                    "Query failed for assessment: (%s) - Error: (%s)"
+                    % (client.assessment_code, e)
+                )
+                return client.assessment_code, e
+
+        results: Dict[str, Any] = {}
+        errors: Dict[str, Exception] = {}
+        for _, (code, result) in self.map_concurrent(
+            run, assessments, workers=workers, ordered=False
+        ):
+            if isinstance(result, Exception):
+                errors[code] = result
+            else:
+                results[code] = result
+        if errors:
+            raise RiscAssessmentsError(errors, results)
+        return results
 
     def get_auth_token(self):
         """Authenticate with RISC.
@@ -143,8 +677,11 @@ class RISC:
         """
         token: str = ""
         payload: Dict[str, str] = self.build_auth()
-        response: Response = self.session.post(
-            f"{self.api_endpoint}/getAuthToken", json=payload
+        response: Response = self._request(
+            "POST",
+            f"{self.api_endpoint}/getAuthToken",
+            json=payload,
+            authenticated=False,
         )
 
         if response.status_code != 200:
@@ -152,30 +689,43 @@ class RISC:
             return token
 
         try:
-            token = response.json().get("token", "")
+            token = decode_json(response).get("token", "")
         except Exception as e:
             logger.error(
                 "Error encountered while fetching the authentication token: %s" % e
             )
         return token
 
-    def assets_get_summary(self):
+    def assets_get_summary(self, use_cache: bool = True):
         """Use to retrieve a list of device types and counts."""
-        response: Response = self.session.get(f"{self.api_endpoint}/assets/getSummary")
+        response: Response = self._request(
+            "GET", f"{self.api_endpoint}/assets/getSummary", use_cache=use_cache
+        )
         return response
 
-    def lookup_stack_id(self, name: str):
+    def lookup_stack_id(self, name: str, case_sensitive: bool = True):
+        """Look up the stack ID of the provided stack name using the stack index.
+
+        Args:
+            name (str): The stack name, as identified in RISC.
+            case_sensitive (bool): Whether or not the name must match exactly. Defaults to: True.
+
+        Returns:
+            int: The stack ID, or an empty string if no stack matches.
+
+        """
+        if self.local_snapshot is not None:
+            return self.local_snapshot.lookup_stack_id(
+                name, case_sensitive=case_sensitive
+            )
         if not self.stack_data:
             logger.error("Stack data unavailable!")
             return {}
-        try:
-            stack_id = next(
-                item for item in self.stack_data["assets"] if item["stack_name"] == name
-            )["stackid"]
-        except Exception as e:
-            print(f"No stack_id found for: {name} - Exception: {e}")
+        stack = self.stacks.get_by_name(name, case_sensitive=case_sensitive)
+        if stack is None:
+            logger.error("No stack_id found for: %s" % name)
             return ""
-        return stack_id
+        return stack.stackid
 
     def assets_get_assets(
         self,
@@ -190,8 +740,7 @@ class RISC:
             f"{self.api_endpoint}/assets/getAssets{'/paginated/' if page else ''}"
         )
 
-        if page:
-            self.session.headers.update({"page": str(page)})
+        headers: Dict[str, str] = {"page": str(page)} if page else {}
 
         if device_type:
             uri = f"{uri_base}/byType/{device_type}"
@@ -205,135 +754,958 @@ class RISC:
             logger.error("No filter criteria specified! You must pass in an option!")
             return Response()
 
-        response: Response = self.session.get(uri)
-
-        if page:
-            del self.session.headers["page"]
-
+        response: Response = self._request("GET", uri, headers=headers)
         return response
 
-    def stacks_get_summary(self):
+    def stacks_get_summary(self, use_cache: bool = True):
         """Use to retrieve a list of stacks."""
-        response: Response = self.session.get(f"{self.api_endpoint}/stacks/getSummary")
+        response: Response = self._request(
+            "GET", f"{self.api_endpoint}/stacks/getSummary", use_cache=use_cache
+        )
         return response
 
     def stacks_get_summary_cost(self, provider_id: str):
         """Use to retrieve a list of stack costs."""
-        response: Response = self.session.get(
-            f"{self.api_endpoint}/stacks/getSummaryWithCost/{provider_id}"
+        response: Response = self._request(
+            "GET", f"{self.api_endpoint}/stacks/getSummaryWithCost/{provider_id}"
         )
         return response
 
     def stacks_get_connectivity(
-        self, stack_id: str = ""
+        self, stack_id: str = "", use_cache: bool = True, compact: bool = False
     ) -> RiscStackConnectivityParent:
-        """Use to retrieve a list of connected stacks."""
-        response: Response = self.session.get(
-            f"{self.api_endpoint}/stacks/getConnectivity/{stack_id}"
+        """Use to retrieve a list of connected stacks.
+
+        If compact is set, the connectivity list holds slotted StackConnectivityRecord objects
+        instead of RiscStackConnectivity models.
+
+        """
+        response: Response = self._request(
+            "GET",
+            f"{self.api_endpoint}/stacks/getConnectivity/{stack_id}",
+            use_cache=use_cache,
         )
         if response.status_code != 200:
             return RiscStackConnectivityParent(response=response)
 
-        connectivity_data = response.json()
+        connectivity_data = decode_json(response)
+        if compact:
+            connectivity_data["connectivity"] = StackConnectivityRecord.from_dicts(
+                connectivity_data.get("connectivity", [])
+            )
         return RiscStackConnectivityParent(response=response, **connectivity_data)
 
+    def _device_connectivity_response(
+        self,
+        stack_id: int,
+        connectivity_type: str = "internal",
+        page: int = 0,
+        stream: bool = False,
+    ) -> Response:
+        """Request the raw device connectivity response of a stack."""
+        headers: Dict[str, str] = {"page": str(page)} if page else {}
+        base_uri = f"{self.api_endpoint}/stacks/get{connectivity_type.title()}DeviceConnectivity"
+        uri = f"{base_uri}/{'paginated/' if page else ''}{stack_id}"
+        return self._request("GET", uri, headers=headers, stream=stream)
+
     def stacks_get_device_connectivity(
-        self, stack_id: int, connectivity_type: str = "internal", page: int = 0
+        self,
+        stack_id: int,
+        connectivity_type: str = "internal",
+        page: int = 0,
+        compact: bool = False,
     ) -> RiscDeviceConnectivityParent:
-        """Use to retrieve a list of connected stacks."""
-        if connectivity_type.lower() not in ["internal", "external"]:
-            return RiscDeviceConnectivityParent()
-
-        if page:
-            self.session.headers.update({"page": str(page)})
+        """Use to retrieve a list of connected stacks.
 
-        base_uri = f"{self.api_endpoint}/stacks/get{connectivity_type.title()}DeviceConnectivity"
-        uri = f"{base_uri}/{'paginated/' if page else ''}{stack_id}"
+        If compact is set, the connectivity list holds slotted DeviceConnectivityRecord objects
+        instead of RiscDeviceConnectivity models.
 
-        response: Response = self.session.get(uri)
+        """
+        if connectivity_type.lower() not in ["internal", "external"]:
+            return RiscDeviceConnectivityParent()
 
-        if page:
-            del self.session.headers["page"]
+        response: Response = self._device_connectivity_response(
+            stack_id=stack_id, connectivity_type=connectivity_type, page=page
+        )
 
         if response.status_code != 200:
             return RiscDeviceConnectivityParent(response=response)
 
-        connectivity_data = response.json()
+        connectivity_data = decode_json(response)
+        if compact:
+            connectivity_data["connectivity"] = DeviceConnectivityRecord.from_dicts(
+                connectivity_data.get("connectivity", [])
+            )
         return RiscDeviceConnectivityParent(response=response, **connectivity_data)
 
-    def iaas_get_providers(self):
+    def iaas_get_providers(self, use_cache: bool = True):
         """Use to retrieve a list of IaaS providers."""
-        response: Response = self.session.get(f"{self.api_endpoint}/iaas/getProviders")
+        response: Response = self._request(
+            "GET", f"{self.api_endpoint}/iaas/getProviders", use_cache=use_cache
+        )
         return response
 
     def iaas_pricing(self, payload: Dict[str, str]):
         """Use to retrieve a list of IaaS pricing."""
-        response: Response = self.session.post(
-            f"{self.api_endpoint}/iaas/pricing", json=payload
+        response: Response = self._request(
+            "POST", f"{self.api_endpoint}/iaas/pricing", json=payload
         )
         return response
 
+    @property
+    def pricing(self) -> PricingService:
+        """Get the memoized IaaS pricing service of this client."""
+        with self._auth_lock:
+            if self._pricing is None:
+                self._pricing = PricingService(self)
+        return self._pricing
+
+    def iaas_pricing_bulk(self, payloads: Iterable[Dict[str, Any]]) -> List[Any]:
+        """Price many payloads, requesting each distinct pricing shape once per TTL.
+
+        Args:
+            payloads (iterable of dict): The iaas/pricing payloads.
+
+        Returns:
+            list: The decoded quote of each payload, in order, or None where pricing failed.
+
+        """
+        return self.pricing.quote_many(payloads)
+
     def tags_get_tags(self, payload: Dict[str, str]):
         """Use to retrieve a list of IaaS providers."""
-        response: Response = self.session.get(
-            f"{self.api_endpoint}/tags/getTags", json=payload
+        response: Response = self._request(
+            "GET", f"{self.api_endpoint}/tags/getTags", json=payload
         )
         return response
 
     def tags_add_tags(self, payload: Dict[str, str]):
         """Use to retrieve a list of IaaS providers."""
-        response: Response = self.session.post(
-            f"{self.api_endpoint}/tags/addTags", json=payload
+        response: Response = self._request(
+            "POST", f"{self.api_endpoint}/tags/addTags", json=payload
         )
         return response
 
+    def tags_add_tags_bulk(
+        self,
+        operations: Iterable[Any],
+        batch_size: int = 100,
+        workers: int = 0,
+        skip_existing: bool = True,
+        existing: Optional[Dict[Tuple[str, str], str]] = None,
+        payload_factory: Callable[
+            [List[Tuple[str, str, str]]], Any
+        ] = build_tags_payload,
+    ) -> List[Dict[str, Any]]:
+        """Add many device tags in concurrent batches.
+
+        Operations setting the same device and key are reduced to the last one, and
+        operations setting a tag to the value it already has are skipped. When a batch fails
+        validation (see risc.tags.SPLIT_STATUSES), it is split in half and resent until the
+        failing operations are isolated, so every operation gets its own result. Any other
+        failure marks the whole batch failed. See :mod:`risc.tags` for the assumed payloads.
+
+        Example:
+            risc.tags_add_tags_bulk([("1234", "wave", "1"), ("5678", "wave", "2")])
+
+        Args:
+            operations (iterable): The (deviceid, tagkey, tagvalue) tuples or dicts to apply.
+            batch_size (int): The maximum number of operations per request. Defaults to: 100.
+            workers (int): The maximum number of concurrent requests.
+                Defaults to: the RISC max_workers setting.
+            skip_existing (bool): Whether or not to skip tags already set to the same value.
+                Defaults to: True.
+            existing (dict): The mapping of (deviceid, tagkey) to current tag value.
+                Defaults to: the tags returned by tags_get_tags.
+            payload_factory (callable): The callable building the request payload of a batch.
+                Defaults to: risc.tags.build_tags_payload.
+
+        Returns:
+            list of dict: The deviceid, tagkey, tagvalue, status (added, skipped or failed)
+                and error of each operation.
+
+        """
+        pending = dedupe_operations(operations)
+        report: Dict[Tuple[str, str, str], Dict[str, Any]] = {
+            operation: {
+                "deviceid": operation[0],
+                "tagkey": operation[1],
+                "tagvalue": operation[2],
+                "status": "pending",
+                "error": "",
+            }
+            for operation in pending
+        }
+
+        if skip_existing:
+            if existing is None:
+                response: Response = self.tags_get_tags({})
+                if response.status_code == 200:
+                    existing = existing_tags(decode_json(response))
+                else:
+                    logger.warning(
+                        "Unable to retrieve the existing tags! Sending all tag operations..."
+                    )
+            for operation in pending:
+                if (existing or {}).get(operation[:2]) == operation[2]:
+                    report[operation]["status"] = "skipped"
+            pending = [item for item in pending if report[item]["status"] == "pending"]
+
+        def send(batch: List[Tuple[str, str, str]]) -> None:
+            error = ""
+            split = False
+            try:
+                response = self.tags_add_tags(payload_factory(batch))
+                if not 200 <= response.status_code < 300:
+                    error = f"HTTP {response.status_code}: {response.text[:200]}"
+                    split = response.status_code in SPLIT_STATUSES
+            except Exception as e:
+                error = str(e)
+            if split and len(batch) > 1:
+                send(batch[: len(batch) // 2])
+                send(batch[len(batch) // 2 :])
+                return
+            for operation in batch:
+                report[operation]["status"] = "failed" if error else "added"
+                report[operation]["error"] = error
+
+        batch_size = max(int(batch_size), 1)
+        batches = [
+            pending[i : i + batch_size] for i in range(0, len(pending), batch_size)
+        ]
+        for _ in self.map_concurrent(send, batches, workers=workers, ordered=False):
+            pass
+        return list(report.values())
+
     def assets_search(self, search: str = ""):
         """Get RISC assessment data."""
-        response: Response = self.session.get(
-            f"{self.api_endpoint}/assets/search/{search}"
+        response: Response = self._request(
+            "GET", f"{self.api_endpoint}/assets/search/{search}"
         )
         if response.status_code != 200:
             logger.error("Failed to retrieve asset data - Asset: (%s)!" % search)
             return {}
         return response
 
-    def ucel_get_checks(self, device_id: str = ""):
+    def ucel_get_checks(self, device_id: str = "", use_cache: bool = True):
         """Use to retrieve a list of checks that have been run against devices."""
-        response: Response = self.session.get(
-            f"{self.api_endpoint}/ucel/getChecks{'/' + device_id if device_id else ''}"
+        response: Response = self._request(
+            "GET",
+            f"{self.api_endpoint}/ucel/getChecks{'/' + device_id if device_id else ''}",
+            use_cache=use_cache,
         )
         return response
 
     def ucel_get_assets(self, check_id: str = ""):
         """Use to retrieve data on the device(s) by check."""
-        response: Response = self.session.get(
-            f"{self.api_endpoint}/ucel/getAssets/{check_id}"
+        response: Response = self._request(
+            "GET", f"{self.api_endpoint}/ucel/getAssets/{check_id}"
         )
         return response
 
     def ucel_get_assets_paginated(self, check_id: str = "", page: int = 1):
         """Use to retrieve data on the device(s) by check."""
-        self.session.headers.update({"page": str(page)})
-        response: Response = self.session.get(
-            f"{self.api_endpoint}/ucel/getAssets/paginated/{check_id}"
+        response: Response = self._request(
+            "GET",
+            f"{self.api_endpoint}/ucel/getAssets/paginated/{check_id}",
+            headers={"page": str(page)},
         )
-        del self.session.headers["page"]
         return response
 
     def stacks_get_listeners(self, stack_id: int):
         """Use to retrieve a list of listeners in a stack."""
-        response: Response = self.session.get(
-            f"{self.api_endpoint}/stacks/getListeners/{stack_id}"
+        response: Response = self._request(
+            "GET", f"{self.api_endpoint}/stacks/getListeners/{stack_id}"
         )
         return response
 
+    def _page_records(self, response: Response, key: str) -> List[Any]:
+        """Get the list of records stored under the provided key of a page response.
+
+        Raises:
+            RiscPageError: If the page could not be retrieved or decoded.
+
+        """
+        return page_records(response, key)
+
+    def _iter_pages(
+        self,
+        fetch_page: Callable[[int], List[Any]],
+        start_page: int = 1,
+        prefetch: bool = False,
+        workers: int = 1,
+    ) -> Iterator[Any]:
+        """Yield records page by page until the API returns an empty page.
+
+        A page that fails after its retries raises RiscPageError rather than ending the
+        iteration, so a partial listing is never mistaken for a complete one.
+
+        Args:
+            fetch_page (callable): The callable used to fetch the list of records for a page number.
+            start_page (int): The first page to fetch. Defaults to: 1.
+            prefetch (bool): Whether or not to fetch the next page in a background thread
+                while the records of the current page are being consumed. Defaults to: False.
+            workers (int): The number of pages to fetch concurrently. Pages are still yielded
+                in order. Defaults to: 1.
+
+        Yields:
+            The records of each page, in order.
+
+        """
+        page = start_page
+        if workers > 1:
+            pages = map_concurrent(fetch_page, count(start_page), workers=workers)
+            try:
+                for _, records in pages:
+                    if not records:
+                        return
+                    yield from records
+            finally:
+                pages.close()
+            return
+
+        if not prefetch:
+            while True:
+                records = fetch_page(page)
+                if not records:
+                    return
+                yield from records
+                page += 1
+
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            future = executor.submit(fetch_page, page)
+            while True:
+                records = future.result()
+                if not records:
+                    return
+                page += 1
+                future = executor.submit(fetch_page, page)
+                yield from records
+
+    def iter_assets(
+        self,
+        device_type: str = "",
+        stack_id: int = 0,
+        device_id: str = "",
+        tag_id: str = "",
+        start_page: int = 1,
+        prefetch: bool = False,
+        workers: int = 1,
+    ) -> Iterator[Dict[str, Any]]:
+        """Iterate through all asset pages for the provided filter criteria.
+
+        Args:
+            device_type (str): The device type to filter assets by.
+            stack_id (int): The stack ID to filter assets by.
+            device_id (str): The device ID to filter assets by.
+            tag_id (str): The tag ID to filter assets by.
+            start_page (int): The first page to fetch. Defaults to: 1.
+            prefetch (bool): Whether or not to fetch the next page while the current one is consumed.
+                Defaults to: False.
+            workers (int): The number of pages to fetch concurrently. Defaults to: 1.
+
+        Yields:
+            dict: The asset object, as returned from the RISC API.
+
+        """
+
+        def fetch_page(page: int) -> List[Any]:
+            response = self.assets_get_assets(
+                device_type=device_type,
+                stack_id=stack_id,
+                device_id=device_id,
+                tag_id=tag_id,
+                page=page,
+            )
+            return self._page_records(response, "assets")
+
+        return self._iter_pages(
+            fetch_page, start_page=start_page, prefetch=prefetch, workers=workers
+        )
+
+    def iter_device_connectivity(
+        self,
+        stack_id: int,
+        connectivity_type: str = "internal",
+        start_page: int = 1,
+        prefetch: bool = False,
+        workers: int = 1,
+        raw: bool = False,
+        compact: bool = False,
+    ) -> Iterator[Any]:
+        """Iterate through all device connectivity pages for the provided stack.
+
+        Args:
+            stack_id (int): The stack ID to retrieve device connectivity for.
+            connectivity_type (str): The type of connectivity to retrieve.
+                Options are: internal and external. Defaults to: internal.
+            start_page (int): The first page to fetch. Defaults to: 1.
+            prefetch (bool): Whether or not to fetch the next page while the current one is consumed.
+                Defaults to: False.
+            workers (int): The number of pages to fetch concurrently. Defaults to: 1.
+            raw (bool): Whether or not to yield the decoded JSON rows instead of model objects.
+                Defaults to: False.
+            compact (bool): Whether or not to yield slotted DeviceConnectivityRecord objects
+                instead of model objects. Defaults to: False.
+
+        Yields:
+            RiscDeviceConnectivity: The device connectivity object, its record if compact is set
+                or its dict if raw is set.
+
+        """
+        if connectivity_type.lower() not in ["internal", "external"]:
+            return iter(())
+
+        def fetch_page(page: int) -> List[Any]:
+            if raw:
+                response = self._device_connectivity_response(
+                    stack_id=stack_id, connectivity_type=connectivity_type, page=page
+                )
+                return self._page_records(response, "connectivity")
+            parent = self.stacks_get_device_connectivity(
+                stack_id=stack_id,
+                connectivity_type=connectivity_type,
+                page=page,
+                compact=compact,
+            )
+            if parent.response.status_code != 200:
+                self._page_records(parent.response, "connectivity")
+            return parent.connectivity
+
+        return self._iter_pages(
+            fetch_page, start_page=start_page, prefetch=prefetch, workers=workers
+        )
+
+    def stream_device_connectivity(
+        self, stack_id: int, connectivity_type: str = "internal", page: int = 0
+    ) -> Iterator[Dict[str, Any]]:
+        """Stream the device connectivity of a stack, decoding records as they arrive.
+
+        The response is requested with ``stream=True`` and parsed incrementally when ijson is
+        installed, so very large responses never have to be held in memory as a whole.
+        Without ijson, the full body is decoded once and its records are yielded.
+
+        Args:
+            stack_id (int): The stack ID to retrieve device connectivity for.
+            connectivity_type (str): The type of connectivity to retrieve.
+                Options are: internal and external. Defaults to: internal.
+            page (int): The page to retrieve. Defaults to: 0 (unpaginated).
+
+        Yields:
+            dict: The device connectivity record, as returned from the RISC API.
+
+        """
+        if connectivity_type.lower() not in ["internal", "external"]:
+            return
+        response: Response = self._device_connectivity_response(
+            stack_id=stack_id,
+            connectivity_type=connectivity_type,
+            page=page,
+            stream=True,
+        )
+        if response.status_code != 200:
+            response.close()
+            return
+        yield from iter_json_items(response, "connectivity")
+
+    def iter_ucel_assets(
+        self,
+        check_id: str = "",
+        start_page: int = 1,
+        prefetch: bool = False,
+        workers: int = 1,
+    ) -> Iterator[Dict[str, Any]]:
+        """Iterate through all UCEL asset pages for the provided check.
+
+        Args:
+            check_id (str): The UCEL check ID to retrieve device data for.
+            start_page (int): The first page to fetch. Defaults to: 1.
+            prefetch (bool): Whether or not to fetch the next page while the current one is consumed.
+                Defaults to: False.
+            workers (int): The number of pages to fetch concurrently. Defaults to: 1.
+
+        Yields:
+            dict: The UCEL asset object, as returned from the RISC API.
+
+        """
+
+        def fetch_page(page: int) -> List[Any]:
+            response = self.ucel_get_assets_paginated(check_id=check_id, page=page)
+            return self._page_records(response, "assets")
+
+        return self._iter_pages(
+            fetch_page, start_page=start_page, prefetch=prefetch, workers=workers
+        )
+
+    def map_concurrent(
+        self,
+        func: Callable[[Any], Any],
+        items: Iterable[Any],
+        workers: int = 0,
+        ordered: bool = True,
+    ) -> Iterator[Tuple[Any, Any]]:
+        """Call the provided callable for each item using the bounded RISC worker pool.
+
+        Args:
+            func (callable): The callable to apply to each item, e.g. a bound RISC method.
+            items (iterable): The items to pass to the callable.
+            workers (int): The maximum number of concurrent calls.
+                Defaults to: the RISC max_workers setting.
+            ordered (bool): Whether or not to yield results in the order of the provided items.
+                If set to: False, results are yielded as they complete. Defaults to: True.
+
+        Yields:
+            tuple: The item and the result of the callable for that item.
+
+        """
+        return map_concurrent(
+            func, items, workers=workers or self.max_workers, ordered=ordered
+        )
+
+    def assets_get_assets_bulk(
+        self,
+        stack_ids: Union[int, str, Iterable[int]] = (),
+        device_ids: Union[str, Iterable[str]] = (),
+        page: int = 0,
+        workers: int = 0,
+        ordered: bool = True,
+    ) -> Iterator[Tuple[Any, Response]]:
+        """Retrieve the assets of many stacks or devices concurrently.
+
+        Args:
+            stack_ids (iterable of int or str): The stack IDs to retrieve assets for, as an
+                iterable or a comma separated string.
+            device_ids (iterable of str or str): The device IDs to retrieve assets for, as an
+                iterable or a comma separated string.
+            page (int): The page to retrieve for each stack or device. Defaults to: 0 (unpaginated).
+            workers (int): The maximum number of concurrent requests.
+                Defaults to: the RISC max_workers setting.
+            ordered (bool): Whether or not to yield responses in the order of the provided IDs.
+                Defaults to: True.
+
+        Yields:
+            tuple: The stack or device ID and its assets response.
+
+        """
+        stack_ids = split_ints(stack_ids)
+        ids = stack_ids or split_values(device_ids)
+        key = "stack_id" if stack_ids else "device_id"
+        return self.map_concurrent(
+            lambda item: self.assets_get_assets(page=page, **{key: item}),
+            ids,
+            workers=workers,
+            ordered=ordered,
+        )
+
+    def stacks_get_device_connectivity_bulk(
+        self,
+        stack_ids: Union[int, str, Iterable[int]],
+        connectivity_type: str = "internal",
+        page: int = 0,
+        workers: int = 0,
+        ordered: bool = True,
+    ) -> Iterator[Tuple[int, RiscDeviceConnectivityParent]]:
+        """Retrieve the device connectivity of many stacks concurrently.
+
+        Args:
+            stack_ids (iterable of int or str): The stack IDs to retrieve device connectivity
+                for, as an iterable or a comma separated string.
+            connectivity_type (str): The type of connectivity to retrieve.
+                Options are: internal and external. Defaults to: internal.
+            page (int): The page to retrieve for each stack. Defaults to: 0 (unpaginated).
+            workers (int): The maximum number of concurrent requests.
+                Defaults to: the RISC max_workers setting.
+            ordered (bool): Whether or not to yield results in the order of the provided stack IDs.
+                Defaults to: True.
+
+        Yields:
+            tuple: The stack ID and its device connectivity.
+
+        """
+        return self.map_concurrent(
+            lambda stack_id: self.stacks_get_device_connectivity(
+                stack_id=stack_id, connectivity_type=connectivity_type, page=page
+            ),
+            split_ints(stack_ids),
+            workers=workers,
+            ordered=ordered,
+        )
+
+    def device_connectivity_columns(
+        self,
+        stack_ids: Union[str, int, Iterable[int]],
+        connectivity_type: str = "internal",
+        columns: Sequence[str] = DEFAULT_COLUMNS,
+        workers: int = 0,
+    ) -> ConnectivityColumns:
+        """Retrieve the device connectivity of many stacks into a columnar container.
+
+        Rows are appended straight from the decoded JSON pages, so no per-row objects are built.
+
+        Args:
+            stack_ids (str or iterable of int): The stack IDs to retrieve device connectivity
+                for, either as an iterable or a comma-separated string.
+            connectivity_type (str): The type of connectivity to retrieve.
+                Options are: internal and external. Defaults to: internal.
+            columns (sequence of str): The connectivity columns to keep.
+                Defaults to: src_ip, dest_ip, dest_port, total_bytes and avg_rtt.
+            workers (int): The maximum number of concurrent requests.
+                Defaults to: the RISC max_workers setting.
+
+        Returns:
+            ConnectivityColumns: The device connectivity of all provided stacks.
+
+        """
+        container = ConnectivityColumns(columns=columns)
+        stack_ids = split_ints(stack_ids)
+        results = self.map_concurrent(
+            lambda stack_id: list(
+                self.iter_device_connectivity(
+                    stack_id=stack_id, connectivity_type=connectivity_type, raw=True
+                )
+            ),
+            stack_ids,
+            workers=workers,
+            ordered=False,
+        )
+        for _, rows in results:
+            container.extend(rows)
+        return container
+
+    def connectivity_graph(
+        self,
+        stack_ids: Optional[Union[str, int, Iterable[int]]] = None,
+        connectivity_types: Union[str, Sequence[str]] = ("internal", "external"),
+        workers: int = 0,
+    ) -> ConnectivityGraph:
+        """Build the assessment-wide device connectivity graph.
+
+        The device connectivity of every stack and connectivity type is fetched concurrently
+        and added to the graph as each stack completes.
+
+        Args:
+            stack_ids (str or iterable of int): The stack IDs to include, either as an iterable
+                or a comma-separated string. Defaults to: all stacks.
+            connectivity_types (str or sequence of str): The types of connectivity to include,
+                either as a sequence or a comma-separated string.
+                Defaults to: internal and external.
+            workers (int): The maximum number of concurrent requests.
+                Defaults to: the RISC max_workers setting.
+
+        Returns:
+            ConnectivityGraph: The device connectivity graph.
+
+        """
+        if stack_ids is None:
+            stack_ids = list(self.stacks.by_id)
+        else:
+            stack_ids = split_ints(stack_ids)
+        connectivity_types = split_values(connectivity_types)
+        graph = ConnectivityGraph()
+        results = self.map_concurrent(
+            lambda item: list(
+                self.iter_device_connectivity(
+                    stack_id=item[0], connectivity_type=item[1], raw=True
+                )
+            ),
+            [
+                (stack_id, connectivity_type)
+                for stack_id in stack_ids
+                for connectivity_type in connectivity_types
+            ],
+            workers=workers,
+            ordered=False,
+        )
+        for (stack_id, _), rows in results:
+            graph.add_rows(rows, stack_id=stack_id)
+        return graph
+
+    def compare_stack_costs(
+        self,
+        provider_ids: Union[str, Iterable[str]] = (),
+        cost_field: str = "",
+        workers: int = 0,
+        use_cache: bool = True,
+        cache_path: str = "",
+        cache_ttl: int = 0,
+        out: str = "",
+        output_format: str = "csv",
+    ) -> StackCostComparison:
+        """Compare the cost of every stack across IaaS providers.
+
+        The stack cost summaries of all providers are fetched concurrently and joined on the
+        stack ID. If every provider was retrieved, the result is cached in the response cache,
+        if one is configured, and in cache_path, if provided, so it can be reloaded without any
+        API calls until it expires.
+
+        Example:
+            risc compare_stack_costs --provider_ids aws,azure --out costs.csv - totals
+
+        Args:
+            provider_ids (iterable of str or str): The providers to compare, as an iterable or a
+                comma separated string. Defaults to: all providers returned by iaas_get_providers.
+            cost_field (str): The stack cost field to compare. Defaults to: the first of
+                risc.costs.COST_FIELDS present.
+            workers (int): The maximum number of concurrent requests.
+                Defaults to: the RISC max_workers setting.
+            use_cache (bool): Whether or not to reuse a cached comparison. Defaults to: True.
+            cache_path (str): The JSON file to load the comparison from and save it to.
+                Defaults to: None.
+            cache_ttl (int): The number of seconds a cached comparison remains valid.
+                Defaults to: the response cache TTL of stacks/getSummaryWithCost.
+            out (str): The path to export the per-stack table to. Defaults to: None.
+            output_format (str): The export format. Options are: ndjson, csv and parquet.
+                Defaults to: csv.
+
+        Returns:
+            StackCostComparison: The stack cost comparison.
+
+        """
+        provider_ids = split_values(provider_ids) or get_provider_ids(
+            self.pricing.providers()
+        )
+        cache_key = (
+            f"{self.assessment_code}:stacks/getSummaryWithCost:"
+            f"{','.join(sorted(provider_ids))}:{cost_field}"
+        )
+        if not cache_ttl:
+            cache_ttl = (
+                self.response_cache.ttl_for(cache_key)
+                if self.response_cache
+                else ResponseCache.DEFAULT_TTLS["stacks/getSummaryWithCost"]
+            )
+
+        comparison: Optional[StackCostComparison] = None
+        cached: Any = None
+        if use_cache and self.response_cache:
+            cached = self.response_cache.get(cache_key)
+        if cached is not None:
+            comparison = StackCostComparison.from_dict(cached)
+        else:
+            complete = True
+            if use_cache and cache_path:
+                comparison = StackCostComparison.load(
+                    cache_path, max_age=cache_ttl, key=cache_key
+                )
+            if comparison is None:
+                comparison = StackCostComparison(providers=provider_ids)
+                failed: List[str] = []
+                for provider_id, response in self.map_concurrent(
+                    self.stacks_get_summary_cost, provider_ids, workers=workers
+                ):
+                    if response.status_code != 200:
+                        logger.error(
+                            "Unable to retrieve the stack costs of provider: (%s)"
+                            % provider_id
+                        )
+                        failed.append(provider_id)
+                        continue
+                    comparison.add_provider(
+                        provider_id,
+                        decode_json(response).get("assets", []) or [],
+                        cost_field=cost_field,
+                    )
+                # A partial comparison is returned, but never cached.
+                complete = not failed
+                if cache_path and complete:
+                    comparison.save(cache_path, key=cache_key)
+            if self.response_cache and complete:
+                self.response_cache.set(cache_key, comparison.to_dict(), ttl=cache_ttl)
+        if out:
+            export_rows(comparison.rows(), out=out, output_format=output_format)
+        return comparison
+
+    def snapshot(
+        self,
+        path: str = "risc-snapshot.db",
+        connectivity: bool = True,
+        workers: int = 0,
+        incremental: bool = False,
+    ) -> RiscSnapshot:
+        """Pull the assessment into a local SQLite snapshot for offline, indexed queries.
+
+        Args:
+            path (str): The path of the SQLite snapshot file. Defaults to: risc-snapshot.db.
+            connectivity (bool): Whether or not to include device connectivity. Defaults to: True.
+            workers (int): The maximum number of concurrent requests.
+                Defaults to: the RISC max_workers setting.
+            incremental (bool): Whether or not to only re-fetch stacks that changed since the
+                snapshot was last synced. Defaults to: False.
+
+        Returns:
+            RiscSnapshot: The refreshed snapshot.
+
+        """
+        snapshot = RiscSnapshot(path)
+        if incremental:
+            snapshot.sync(self, connectivity=connectivity, workers=workers)
+            return snapshot
+        return snapshot.refresh(self, connectivity=connectivity, workers=workers)
+
+    def export(
+        self,
+        kind: str,
+        output_format: str = "ndjson",
+        out: str = "",
+        compression: str = "",
+        stack_id: int = 0,
+        device_type: str = "",
+        connectivity_type: str = "internal",
+        check_id: str = "",
+        workers: int = 1,
+        batch_size: int = 10000,
+        columns: Optional[Sequence[str]] = None,
+        infer_rows: int = INFER_ROWS,
+    ) -> Dict[str, Any]:
+        """Stream RISC data to an NDJSON, CSV or Parquet file with bounded memory.
+
+        Example:
+            risc export device-connectivity --output_format parquet --out connectivity.parquet
+
+        Args:
+            kind (str): The data to export.
+                Options are: assets, device-connectivity and ucel.
+            output_format (str): The output format. Options are: ndjson, csv and parquet.
+                Defaults to: ndjson.
+            out (str): The output path, or ``-`` for stdout.
+                Defaults to: risc-<kind>.<output_format>.
+            compression (str): The compression to apply. Options are: gzip, bz2 and xz for ndjson
+                and csv, or any PyArrow codec for parquet. Defaults to: inferred from the path suffix.
+            stack_id (int): The stack ID to export assets or device connectivity for.
+                If neither stack_id nor device_type are provided, all stacks are exported
+                one at a time, with the stack ID added to each row.
+            device_type (str): The device type to filter assets by.
+            connectivity_type (str): The type of device connectivity to export.
+                Options are: internal and external. Defaults to: internal.
+            check_id (str): The UCEL check ID to export assets for. Required for ucel.
+            workers (int): The number of pages to fetch concurrently. Defaults to: 1.
+            batch_size (int): The number of rows per Parquet row group. Defaults to: 10000.
+            columns (sequence of str or str): The csv or parquet columns to write, as a sequence
+                or a comma separated string. Defaults to: the columns of the first infer_rows rows.
+            infer_rows (int): Without columns, the csv header and parquet schema are inferred from
+                this many leading rows, held in memory. Keys first seen after them are dropped
+                and parquet values not matching the inferred types are written as null, so pass
+                the columns or a larger value for heterogeneous data, at the cost of memory.
+                Defaults to: 1000.
+
+        Returns:
+            dict: The export summary, with the output path, format, compression, row count and duration.
+
+        """
+        kind = kind.lower().replace("_", "-")
+        rows: Iterable[Dict[str, Any]]
+        if kind == "assets" and (stack_id or device_type):
+            rows = self.iter_assets(
+                device_type=device_type, stack_id=stack_id, workers=workers
+            )
+        elif kind == "assets":
+            rows = self._iter_stack_rows(
+                lambda item: self.iter_assets(stack_id=item, workers=workers),
+                stack_ids=list(self.stacks.by_id),
+            )
+        elif kind == "device-connectivity":
+            rows = self._iter_stack_rows(
+                lambda item: self.iter_device_connectivity(
+                    stack_id=item,
+                    connectivity_type=connectivity_type,
+                    workers=workers,
+                    raw=True,
+                ),
+                stack_ids=[stack_id] if stack_id else list(self.stacks.by_id),
+                tag_stack=not stack_id,
+            )
+        elif kind == "ucel":
+            if not check_id:
+                raise ValueError("A check_id is required to export UCEL assets!")
+            rows = self.iter_ucel_assets(check_id=check_id, workers=workers)
+        else:
+            raise ValueError(f"Unsupported export kind: {kind}")
+
+        if not out:
+            suffix = COMPRESSION_SUFFIXES.get(compression, "")
+            out = f"risc-{kind}.{output_format.lower()}{suffix}"
+        return export_rows(
+            rows,
+            out=out,
+            output_format=output_format,
+            compression=compression,
+            batch_size=batch_size,
+            columns=split_values(columns) or None,
+            infer_rows=infer_rows,
+        )
+
+    def _iter_stack_rows(
+        self,
+        iter_rows: Callable[[int], Iterator[Dict[str, Any]]],
+        stack_ids: Iterable[int],
+        tag_stack: bool = True,
+    ) -> Iterator[Dict[str, Any]]:
+        """Iterate through the rows of many stacks, one stack at a time.
+
+        Args:
+            iter_rows (callable): The callable returning the row iterator of a stack ID.
+            stack_ids (iterable of int): The stack IDs to iterate through.
+            tag_stack (bool): Whether or not to add the stack ID to each row. Defaults to: True.
+
+        Yields:
+            dict: The row, as returned from the RISC API.
+
+        """
+        for stack_id in stack_ids:
+            for row in iter_rows(stack_id):
+                if tag_stack:
+                    row["stackid"] = stack_id
+                yield row
+
     def get_swagger(self):
         """Fetch the swagger API configuration file."""
-        swagger_resource: Response = self.session.get(
-            "https://api.riscnetworks.com/docs/_/resource_list.json"
+        swagger_resource: Response = self._request(
+            "GET",
+            "https://api.riscnetworks.com/docs/_/resource_list.json",
+            authenticated=False,
         )
         return swagger_resource
 
+    @staticmethod
+    def index_servers(
+        host_data: List[Dict[str, Any]], compare: str = "hostname"
+    ) -> Dict[str, Any]:
+        """Index the provided asset search results by the lowercased compare value.
+
+        Asset search responses nest device data inconsistently, so the index resolves, in order of
+        precedence: items of list data, assets whose top-level compare value matches (returning
+        their data) and, as a fallback, assets whose data holds the compare value.
+
+        Args:
+            host_data (list of dict): The assets returned from the asset search API endpoint.
+            compare (str): The key used to index each asset. Defaults to: hostname.
+
+        Returns:
+            dict: The mapping of lowercased compare value to device asset object.
+
+        """
+        index: Dict[str, Any] = {}
+        fallback: Dict[str, Any] = {}
+        for asset in host_data:
+            asset_val = asset.get("data")
+            if isinstance(asset_val, list):
+                matches: Dict[str, Any] = {}
+                for item in asset_val:
+                    value = item.get(compare, "") if isinstance(item, dict) else ""
+                    if isinstance(value, str) and value:
+                        matches.setdefault(value.lower(), item)
+                index.update(matches)
+            elif isinstance(asset_val, dict):
+                value = asset.get(compare, "")
+                if isinstance(value, str) and value:
+                    index[value.lower()] = asset_val
+                value = asset_val.get(compare, "")
+                if isinstance(value, str) and value:
+                    fallback.setdefault(value.lower(), asset)
+        for key, asset in fallback.items():
+            index.setdefault(key, asset)
+        return index
+
     def get_server(self, search: str = "", compare: str = "hostname") -> Dict[str, Any]:
         """Sift through the asset search response and only return the relevant host.
 
@@ -347,49 +1719,80 @@ class RISC:
             dict: The device asset object, as returned from the RISC API.
 
         """
-        return_data: Dict[str, Any] = {}
+        if self.local_snapshot is not None and compare in SNAPSHOT_COMPARE_KEYS:
+            return self.local_snapshot.get_server(search=search, compare=compare)
         response: Response = self.assets_search(search=search)
-        if response.status_code != 200:
+        if not response or response.status_code != 200:
             logger.error("Failure fetching host data!")
             return {}
 
-        host_data = response.json().get("assets", [])
-        search = search.lower()
-        for asset in host_data:
-            asset_val = asset.get("data")
-            if isinstance(asset_val, list):
-                try:
-                    return_data = next(
-                        item
-                        for item in asset_val
-                        if item.get(compare, "").lower() == search
-                    )
-                except (KeyError, IndexError, StopIteration):
-                    pass
-                except Exception as e:
-                    logger.error(
-                        "Unhandled exception encountered attempting to retrieve server data: (%s) - Error: (%s)"
-                        % (search, e)
-                    )
-            elif isinstance(asset_val, dict):
-                asset_val = asset.get("data", {})
-                found_hostname = asset.get(compare, "").lower()
-                if found_hostname == search:
-                    return_data = asset_val
+        host_data = decode_json(response).get("assets", [])
+        return_data = self.index_servers(host_data, compare=compare).get(
+            search.lower(), {}
+        )
         if not return_data:
-            try:
-                return_data = next(
-                    item
-                    for item in host_data
-                    if item["data"][compare].lower() == search
-                )
-            except (KeyError, IndexError, StopIteration):
-                logger.error(
-                    "Unable to find the specified server: (%s) - Defaulting to empty dict!"
-                    % search
-                )
+            logger.error(
+                "Unable to find the specified server: (%s) - Defaulting to empty dict!"
+                % search
+            )
         return return_data
 
+    def get_servers(
+        self,
+        hostnames: Union[str, Iterable[str]],
+        compare: str = "hostname",
+        workers: int = 0,
+    ) -> Dict[str, Dict[str, Any]]:
+        """Resolve many hosts concurrently.
+
+        Duplicate inputs are searched once, and every search result is added to a shared index
+        keyed by the compare value. Hosts already found in an earlier search result are resolved
+        from the index without another request.
+
+        Args:
+            hostnames (iterable of str or str): The values to search for, e.g. hostnames or IP
+                addresses, as an iterable or a comma separated string.
+            compare (str): The key to be used to match each search value with.
+                Defaults to: hostname.
+            workers (int): The maximum number of concurrent searches.
+                Defaults to: the RISC max_workers setting.
+
+        Returns:
+            dict: The mapping of each provided value to its device asset object, or an empty dict
+                if the host could not be found.
+
+        """
+        hostnames = split_values(hostnames)
+        searches: Dict[str, str] = {}
+        for hostname in hostnames:
+            searches.setdefault(hostname.strip().lower(), hostname.strip())
+        index: Dict[str, Any] = {}
+        index_lock = threading.Lock()
+
+        def resolve(key: str) -> None:
+            with index_lock:
+                if key in index:
+                    return
+            response: Response = self.assets_search(search=searches[key])
+            if not response or response.status_code != 200:
+                return
+            found = self.index_servers(
+                decode_json(response).get("assets", []), compare=compare
+            )
+            with index_lock:
+                for found_key, asset in found.items():
+                    index.setdefault(found_key, asset)
+
+        for _ in self.map_concurrent(resolve, searches, workers=workers, ordered=False):
+            pass
+
+        servers: Dict[str, Dict[str, Any]] = {}
+        for hostname in hostnames:
+            servers[hostname] = index.get(hostname.strip().lower(), {})
+            if not servers[hostname]:
+                logger.error("Unable to find the specified server: (%s)" % hostname)
+        return servers
+
     def get_application_ips(
         self, application: str, identifying_ips_only: bool = True
     ) -> List[Any]:
@@ -405,6 +1808,10 @@ class RISC:
             list of str: The list of device IP addresses present in the application stack.
 
         """
+        if self.local_snapshot is not None:
+            return self.local_snapshot.get_application_ips(
+                application, identifying_ips_only=identifying_ips_only
+            )
         ip_addresses: List[str] = []
         stack_id = self.lookup_stack_id(application)
         if not stack_id:
@@ -416,7 +1823,7 @@ class RISC:
             )
             return ip_addresses
 
-        for asset in stack_assets.json().get("assets", []):
+        for asset in decode_json(stack_assets).get("assets", []):
             asset_data = asset.get("data", {})
             if identifying_ips_only:
                 # Handle dict and list types differently, because this API has no standard responses or models...
@@ -464,8 +1871,155 @@ class RISC:
             dict: The mapping of disk data provided by RISC and additional drive usage data.
 
         """
-        data = {}
         asset = self.get_server(search=search)
+        return self._disk_data(asset, fudge_factor, only_local_disks)
+
+    def get_disks_bulk(
+        self,
+        hostnames: Union[str, Iterable[str]],
+        fudge_factor: float = 1.5,
+        only_local_disks: bool = True,
+        workers: int = 0,
+    ) -> Dict[str, Dict[str, Any]]:
+        """Get disk data for many assets, resolving the hosts concurrently.
+
+        Args:
+            hostnames (iterable of str or str): The asset hostnames to lookup, as an iterable
+                or a comma separated string.
+            fudge_factor (float): The value multiplier to be used when calculating volume size.
+                Defaults to: 1.5.
+            only_local_disks (bool): Whether or not to include only local disks. Defaults to: True.
+            workers (int): The maximum number of concurrent searches.
+                Defaults to: the RISC max_workers setting.
+
+        Returns:
+            dict: The mapping of each hostname to its disk data, as returned by get_disks.
+
+        """
+        servers = self.get_servers(hostnames, workers=workers)
+        return {
+            hostname: self._disk_data(asset, fudge_factor, only_local_disks)
+            for hostname, asset in servers.items()
+        }
+
+    def get_device_stacks(
+        self,
+        stack_ids: Union[int, str, Iterable[int]] = (),
+        device_ids: Union[str, Iterable[str]] = (),
+        workers: int = 0,
+    ) -> Dict[str, List[int]]:
+        """Get the stack membership of devices, from the assets of the provided stacks.
+
+        The RISC API can't look up the stacks of a device, so without stack IDs the membership
+        of the device IDs is read from the local snapshot, if one is configured. The stacks of
+        the assessment are never all fetched implicitly.
+
+        Args:
+            stack_ids (str or iterable of int): The stacks to list the devices of, either as an
+                iterable or a comma-separated string. Defaults to: None.
+            device_ids (str or iterable of str): The devices to resolve the membership of, either
+                as an iterable or a comma-separated string. Defaults to: all devices of the stacks.
+            workers (int): The maximum number of concurrent stacks fetched.
+                Defaults to: the RISC max_workers setting.
+
+        Returns:
+            dict: The mapping of device ID to the IDs of the stacks it belongs to.
+
+        """
+        stack_ids = split_ints(stack_ids)
+        wanted = {str(deviceid) for deviceid in split_values(device_ids)}
+        if not stack_ids:
+            if not wanted:
+                raise ValueError("Either stack_ids or device_ids must be provided!")
+            snapshot = self.local_snapshot
+            if snapshot is None:
+                logger.error(
+                    "No stack IDs or local snapshot to resolve the stacks of (%s) devices!"
+                    % len(wanted)
+                )
+                return {}
+            return snapshot.get_device_stacks(wanted)
+
+        device_stacks: Dict[str, List[int]] = {}
+        for stack_id, assets in self.map_concurrent(
+            lambda item: list(self.iter_assets(stack_id=item)),
+            stack_ids,
+            workers=workers,
+        ):
+            for asset in assets:
+                for record in asset_records(asset):
+                    deviceid = record["deviceid"]
+                    if not deviceid or (wanted and deviceid not in wanted):
+                        continue
+                    stacks = device_stacks.setdefault(deviceid, [])
+                    if stack_id not in stacks:
+                        stacks.append(stack_id)
+        return device_stacks
+
+    def size_disks(
+        self,
+        hostnames: Union[str, Iterable[str]] = (),
+        snapshot: Union[str, RiscSnapshot] = "",
+        fudge_factor: float = 1.5,
+        only_local_disks: bool = True,
+        workers: int = 0,
+        stack_ids: Union[int, str, Iterable[int]] = (),
+    ) -> DiskSizing:
+        """Size the logical disks of many hosts, e.g. a migration wave, in one vectorized pass.
+
+        Asset search results don't hold stack membership, so the stacks of the resolved hosts
+        are looked up from the assets of the provided stacks, or the local snapshot.
+
+        Args:
+            hostnames (iterable of str or str): The asset hostnames to resolve and size, as an
+                iterable or a comma separated string.
+            snapshot (str or RiscSnapshot): A local snapshot, or its path, to size all stored
+                devices from instead of resolving hostnames. Defaults to: None.
+            fudge_factor (float): The used space multiplier. Defaults to: 1.5.
+            only_local_disks (bool): Whether or not to only include local disks. Defaults to: True.
+            workers (int): The maximum number of concurrent requests.
+                Defaults to: the RISC max_workers setting.
+            stack_ids (iterable of int or str): The stacks to look up the hosts' membership in.
+                Defaults to: the client local snapshot, if configured.
+
+        Returns:
+            DiskSizing: The sizing table, with per-disk rows and per-host and per-stack totals.
+                Hosts of unknown membership are totaled under stack 0.
+
+        """
+        if snapshot:
+            if not isinstance(snapshot, RiscSnapshot):
+                snapshot = RiscSnapshot(snapshot)
+            return DiskSizing.from_snapshot(
+                snapshot, fudge_factor=fudge_factor, only_local_disks=only_local_disks
+            )
+        servers = self.get_servers(split_values(hostnames), workers=workers)
+        host_deviceids = {
+            hostname: host_deviceid(asset) for hostname, asset in servers.items()
+        }
+        device_ids = [deviceid for deviceid in host_deviceids.values() if deviceid]
+        device_stacks = (
+            self.get_device_stacks(
+                stack_ids=stack_ids, device_ids=device_ids, workers=workers
+            )
+            if device_ids
+            else {}
+        )
+        return DiskSizing.from_hosts(
+            servers,
+            fudge_factor=fudge_factor,
+            only_local_disks=only_local_disks,
+            stack_ids={
+                hostname: device_stacks.get(deviceid, [])
+                for hostname, deviceid in host_deviceids.items()
+            },
+        )
+
+    def _disk_data(
+        self, asset: Dict[str, Any], fudge_factor: float, only_local_disks: bool
+    ) -> Dict[str, Any]:
+        """Build the disk usage and sizing data of the provided device asset object."""
+        data = {}
         disks = asset.get("data", {})
         if disks:
             _disks = disks.get("disks_logical", [])
@@ -2,8 +2,8 @@
 """Define the RISC models module."""
 import logging
 import uuid as _uuid
-from dataclasses import dataclass, field
-from typing import Any, Dict, List
+from dataclasses import dataclass, field, fields
+from typing import Any, ClassVar, Dict, Iterable, List, Optional, Tuple
 
 from requests.models import Response
 from requests.sessions import Session
@@ -32,6 +32,12 @@ class AbstractRiscModel:
         items = self.to_dict_items
         return dict(items)
 
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> Any:
+        """Build the model from a dictionary, ignoring keys that are not model fields."""
+        names = {item.name for item in fields(cls) if item.init}
+        return cls(**{key: value for key, value in data.items() if key in names})
+
     def to_list_factory(self, class_type: Any, factory_objects: List[Any]) -> List[Any]:
         """Handle the casting of lists to a list of the provided object type."""
         factories_data: List[Any] = []
@@ -39,10 +45,11 @@ class AbstractRiscModel:
         if not factory_objects:
             return factories_data
 
-        if isinstance(factory_objects[0], class_type):
+        # Objects that were already built, e.g. slotted records, are kept as-is.
+        if not isinstance(factory_objects[0], dict):
             factories_data = factory_objects
         else:
-            factories_data = [class_type(**item) for item in factory_objects]
+            factories_data = [class_type.from_dict(item) for item in factory_objects]
 
         return factories_data
 
@@ -116,28 +123,241 @@ class RiscAssessment(RiscResourceModel):
 
 @dataclass
 class RiscAssessments(RiscResponse):
-    """Define the Assessments resource model schema."""
+    """Define the Assessments resource model schema.
+
+    Assessments are indexed by their lowercased assessment code, company name and stage fields
+    on initialization, so filtering on those fields doesn't scan the whole list.
+
+    """
+
+    INDEXED_FIELDS: ClassVar[Tuple[str, ...]] = (
+        "assessment_code",
+        "company_name",
+        "assessment_stage_name",
+        "assessment_stage_description",
+    )
 
     assessments: List[Any] = field(default_factory=list)
+    index: Dict[str, Dict[str, List[Any]]] = field(
+        default_factory=dict, init=False, repr=False
+    )
 
     def __post_init__(self):
         """Handle post initialization steps."""
         self.assessments: List[RiscAssessment] = self.to_list_factory(
             class_type=RiscAssessment, factory_objects=self.assessments
         )
+        self.build_index()
+
+    def build_index(self) -> None:
+        """Build the indexes of the assessment code, company name and stage fields."""
+        self.index = {name: {} for name in self.INDEXED_FIELDS}
+        for assessment in self.assessments:
+            for name, values in self.index.items():
+                key = str(getattr(assessment, name, "")).lower()
+                values.setdefault(key, []).append(assessment)
+
+    def get_by_code(self, assessment_code: str) -> Optional["RiscAssessment"]:
+        """Get the assessment with the provided assessment code, if any."""
+        matches = self.index.get("assessment_code", {}).get(assessment_code.lower(), [])
+        return matches[0] if matches else None
+
+    def filter(self, **kwargs) -> List["RiscAssessment"]:
+        """Get the assessments matching all of the provided field values, ignoring case.
+
+        Indexed fields are resolved through their index, and any other RiscAssessment field
+        is then compared on the remaining candidates only.
+
+        Example:
+            assessments.filter(company_name="Acme", assessment_stage_name="Active")
+
+        Returns:
+            list of RiscAssessment: The matching assessments, in their original order.
+
+        """
+        candidates: Optional[List[RiscAssessment]] = None
+        for name in self.INDEXED_FIELDS:
+            if name not in kwargs:
+                continue
+            matches = self.index[name].get(str(kwargs[name]).lower(), [])
+            if candidates is None:
+                candidates = matches
+            else:
+                ids = {id(item) for item in matches}
+                candidates = [item for item in candidates if id(item) in ids]
+
+        others = {
+            name: str(value).lower()
+            for name, value in kwargs.items()
+            if name not in self.INDEXED_FIELDS
+        }
+        names = {item.name for item in fields(RiscAssessment)}
+        unknown = [name for name in others if name not in names]
+        if unknown:
+            logger.error("Unknown assessment filter fields: (%s)" % unknown)
+            return []
+        return [
+            item
+            for item in (self.assessments if candidates is None else candidates)
+            if all(
+                str(getattr(item, name, "")).lower() == value
+                for name, value in others.items()
+            )
+        ]
+
+    def select(self, **kwargs) -> "RiscAssessment":
+        """Get the first non-demo assessment matching the provided field values.
+
+        Demo assessments are only returned when selected by their assessment code.
+
+        Returns:
+            RiscAssessment: The matching assessment, or an empty assessment if none match.
+
+        """
+        matches = self.filter(**kwargs)
+        if "assessment_code" not in kwargs:
+            matches = [item for item in matches if not item.is_demo]
+        if not matches:
+            logger.error("No assessment found for the filter criteria: (%s)" % kwargs)
+            return RiscAssessment()
+        if len(matches) > 1:
+            logger.warning(
+                "Multiple assessments found for the provided filter criteria! Returning the first result..."
+            )
+        return matches[0]
 
 
 @dataclass
 class RiscStacks(RiscResponse):
-    """Define the Stacks resource model schema."""
+    """Define the Stacks resource model schema.
+
+    Stacks are indexed by ID, name and lowercased name on initialization, so lookups are O(1).
+
+    """
 
     stacks: List[Any] = field(default_factory=list)
+    by_id: Dict[int, Any] = field(default_factory=dict, init=False, repr=False)
+    by_name: Dict[str, Any] = field(default_factory=dict, init=False, repr=False)
+    by_name_lower: Dict[str, Any] = field(default_factory=dict, init=False, repr=False)
 
     def __post_init__(self):
         """Handle post initialization steps."""
-        self.stacks: List[RiscStack] = self.to_list_factory(
-            class_type=RiscStack, factory_objects=self.stacks
-        )
+        self.stacks: List[RiscStack] = [
+            item if isinstance(item, RiscStack) else RiscStack.from_dict(item)
+            for item in self.stacks
+        ]
+        self.build_index()
+
+    def build_index(self) -> None:
+        """Build the stack ID and name indexes."""
+        self.by_id = {}
+        self.by_name = {}
+        self.by_name_lower = {}
+        for stack in self.stacks:
+            self.by_id[stack.stackid] = stack
+            self.by_name.setdefault(stack.stack_name, stack)
+            self.by_name_lower.setdefault(stack.stack_name.lower(), stack)
+
+    def get_by_id(self, stack_id: int) -> Optional["RiscStack"]:
+        """Get the stack with the provided ID, if any."""
+        return self.by_id.get(int(stack_id))
+
+    def get_by_name(
+        self, name: str, case_sensitive: bool = True
+    ) -> Optional["RiscStack"]:
+        """Get the stack with the provided name, if any.
+
+        Args:
+            name (str): The stack name.
+            case_sensitive (bool): Whether or not the name must match exactly. Defaults to: True.
+
+        Returns:
+            RiscStack: The matching stack, or None if no stack matches.
+
+        """
+        if case_sensitive:
+            return self.by_name.get(name)
+        return self.by_name_lower.get(name.lower())
+
+
+def model_dtypes(model: Any, narrow: bool = False) -> Dict[str, str]:
+    """Get the pandas dtype of each data field of the provided RISC model.
+
+    String fields map to ``category``, float fields to ``float64`` and integer fields to
+    ``int64``. When narrowed, float fields map to ``float32`` and integer fields to
+    ``integer``, which is downcast to the smallest integer width holding the column.
+
+    """
+    base_fields = {item.name for item in fields(RiscResourceModel)}
+    dtypes = {str: "category", float: "float64", int: "int64"}
+    if narrow:
+        dtypes.update({float: "float32", int: "integer"})
+    return {
+        item.name: dtypes[type(item.default)]
+        for item in fields(model)
+        if item.name not in base_fields and type(item.default) in dtypes
+    }
+
+
+def build_dataframe(
+    rows: Iterable[Any],
+    model: Any,
+    keys: Optional[Iterable[Any]] = None,
+    key_name: str = "key",
+    narrow: bool = False,
+):
+    """Build a typed pandas DataFrame from already decoded RISC rows.
+
+    Columns are built one at a time from the rows, which may be dicts, models or records, so
+    the response body is never decoded again and no intermediate frames are created. Keys of
+    dict rows missing from the model are kept as untyped columns after the model columns.
+
+    Args:
+        rows (iterable): The decoded rows.
+        model (RiscResourceModel): The model defining the typed columns and their dtypes.
+        keys (iterable): An optional key per row, e.g. the stack ID, added as the first column.
+        key_name (str): The name of the key column. Defaults to: key.
+        narrow (bool): Whether or not to store floats as float32 and downcast integers to the
+            smallest width holding each column, which loses precision on large values.
+            Defaults to: False.
+
+    Returns:
+        DataFrame: The typed DataFrame, or None if pandas is not installed.
+
+    """
+    try:
+        import pandas as pd
+    except ImportError:
+        logger.info("Pandas currently not installed! DataFrame support disabled!")
+        return None
+    rows = list(rows)
+    if not rows:
+        return pd.DataFrame()
+
+    def get_value(row: Any, name: str) -> Any:
+        if isinstance(row, dict):
+            return row.get(name)
+        return getattr(row, name, None)
+
+    data: Dict[str, Any] = {}
+    if keys is not None:
+        data[key_name] = pd.Categorical(list(keys))
+    dtypes = model_dtypes(model, narrow=narrow)
+    for name, dtype in dtypes.items():
+        values = [get_value(row, name) for row in rows]
+        if dtype == "category":
+            data[name] = pd.Categorical(values)
+        elif dtype == "integer":
+            data[name] = pd.to_numeric(pd.Series(values), downcast="integer")
+        elif dtype == "int64":
+            data[name] = pd.to_numeric(pd.Series(values))
+        else:
+            data[name] = pd.Series(values, dtype=dtype)
+    extra = dict.fromkeys(name for row in rows if isinstance(row, dict) for name in row)
+    for name in extra:
+        if name not in data:
+            data[name] = pd.Series([get_value(row, name) for row in rows])
+    return pd.DataFrame(data)
 
 
 @dataclass
@@ -163,33 +383,100 @@ class RiscStackConnectivity(RiscResourceModel):
 
 
 @dataclass
-class RiscStackConnectivityParent(RiscResourceModel):
-    """Define the parent Stack Connectivity resource model schema."""
+class RiscConnectivityParent(RiscResourceModel):
+    """Abstract parent model of the RISC connectivity responses."""
+
+    model: ClassVar[Any] = None
 
     connectivity: List[Any] = field(default_factory=list)
     returnStatus: str = ""
     returnStatusDetail: str = ""
+    _rows: List[Dict[str, Any]] = field(
+        default_factory=list, init=False, repr=False, compare=False
+    )
+    _dataframe: Any = field(default=None, init=False, repr=False, compare=False)
 
     def __post_init__(self):
         """Handle post initialization steps."""
+        # The decoded rows are kept for the DataFrame, which includes the keys the model lacks.
+        if self.connectivity and isinstance(self.connectivity[0], dict):
+            self._rows = self.connectivity
         self.connectivity = self.to_list_factory(
-            class_type=RiscStackConnectivity, factory_objects=self.connectivity
+            class_type=self.model, factory_objects=self.connectivity
         )
 
+    @property
+    def rows(self) -> List[Any]:
+        """Get the decoded connectivity rows, or the connectivity objects if none were kept."""
+        return self._rows or self.connectivity
+
     @property
     def dataframe(self):
-        """Handle converting the connectivity list of objects to a pandas DataFrame."""
-        try:
-            import pandas as pd
-        except ImportError:
-            logger.info("Pandas currently not installed! DataFrame support disabled!")
-            return None
-        connectivity_dict: List[Dict[str, Any]] = self.response.json().get(
-            "connectivity", []
+        """Handle converting the connectivity to a typed pandas DataFrame.
+
+        The frame is built from the already decoded connectivity and cached on the model.
+
+        """
+        if self._dataframe is None:
+            self._dataframe = self.to_dataframe()
+        return self._dataframe
+
+    def to_dataframe(self, narrow: bool = False):
+        """Build a typed pandas DataFrame from the decoded connectivity.
+
+        Args:
+            narrow (bool): Whether or not to narrow the numeric dtypes. Defaults to: False.
+
+        Returns:
+            DataFrame: The typed DataFrame, or None if pandas is not installed.
+
+        """
+        return build_dataframe(self.rows, model=self.model, narrow=narrow)
+
+    @classmethod
+    def concat_dataframes(
+        cls,
+        parents: Iterable[Any],
+        keys: Optional[Iterable[Any]] = None,
+        key_name: str = "stackid",
+        narrow: bool = False,
+    ):
+        """Build a single typed DataFrame from the connectivity of many pages or stacks.
+
+        Example:
+            results = risc.stacks_get_device_connectivity_bulk(stack_ids)
+            stack_ids, parents = zip(*results)
+            RiscDeviceConnectivityParent.concat_dataframes(parents, keys=stack_ids)
+
+        Args:
+            parents (iterable): The connectivity parent models to combine.
+            keys (iterable): An optional key per parent, e.g. its stack ID. Defaults to: None.
+            key_name (str): The name of the key column. Defaults to: stackid.
+            narrow (bool): Whether or not to narrow the numeric dtypes. Defaults to: False.
+
+        Returns:
+            DataFrame: The combined DataFrame, or None if pandas is not installed.
+
+        """
+        parents = list(parents)
+        rows = [row for parent in parents for row in parent.rows]
+        row_keys = None
+        if keys is not None:
+            row_keys = [
+                key
+                for key, parent in zip(keys, parents)
+                for _ in range(len(parent.rows))
+            ]
+        return build_dataframe(
+            rows, model=cls.model, keys=row_keys, key_name=key_name, narrow=narrow
         )
-        if not connectivity_dict:
-            return pd.DataFrame()
-        return pd.DataFrame.from_dict(connectivity_dict)
+
+
+@dataclass
+class RiscStackConnectivityParent(RiscConnectivityParent):
+    """Define the parent Stack Connectivity resource model schema."""
+
+    model: ClassVar[Any] = RiscStackConnectivity
 
 
 @dataclass
@@ -228,33 +515,10 @@ class RiscDeviceConnectivity(RiscResourceModel):
 
 
 @dataclass
-class RiscDeviceConnectivityParent(RiscResourceModel):
+class RiscDeviceConnectivityParent(RiscConnectivityParent):
     """Define the parent Device Connectivity resource model schema."""
 
-    connectivity: List[Any] = field(default_factory=list)
-    returnStatus: str = ""
-    returnStatusDetail: str = ""
-
-    def __post_init__(self):
-        """Handle post initialization steps."""
-        self.connectivity = self.to_list_factory(
-            class_type=RiscDeviceConnectivity, factory_objects=self.connectivity
-        )
-
-    @property
-    def dataframe(self):
-        try:
-            import pandas as pd
-        except ImportError:
-            logger.info("Pandas currently not installed! DataFrame support disabled!")
-            return None
-        """Handle converting the connectivity list of objects to a pandas DataFrame."""
-        connectivity_dict: List[Dict[str, Any]] = self.response.json().get(
-            "connectivity", []
-        )
-        if not connectivity_dict:
-            return pd.DataFrame()
-        return pd.DataFrame.from_dict(connectivity_dict)
+    model: ClassVar[Any] = RiscDeviceConnectivity
 
 
 @dataclass
@@ -0,0 +1,171 @@
+# -*- coding: utf-8 -*-
+"""Define the RISC IaaS pricing module."""
+import json
+import logging
+import threading
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Optional
+
+from risc.cache import ResponseCache
+from risc.utils import decode_json
+
+if TYPE_CHECKING:  # pragma: no cover
+    from risc.main import RISC
+
+logger = logging.getLogger(__name__)
+
+
+def normalize_value(value: Any) -> Any:
+    """Normalize a pricing payload value, so equivalent shapes produce the same quote key.
+
+    Strings are stripped, and numeric strings and floats without a fractional part are
+    converted to integers, e.g. ``" 4.0"``, ``"4"`` and ``4`` all become ``4``.
+
+    """
+    if isinstance(value, dict):
+        return normalize_payload(value)
+    if isinstance(value, (list, tuple)):
+        return [normalize_value(item) for item in value]
+    if isinstance(value, str):
+        value = value.strip()
+        try:
+            value = float(value)
+        except ValueError:
+            return value
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    return value
+
+
+def normalize_payload(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """Normalize the keys and values of a pricing payload, dropping empty values."""
+    return {
+        str(key).strip(): normalize_value(value)
+        for key, value in sorted(payload.items())
+        if value not in (None, "")
+    }
+
+
+def quote_key(payload: Dict[str, Any]) -> str:
+    """Get the cache key of a normalized pricing payload."""
+    return json.dumps(payload, sort_keys=True, default=str)
+
+
+class PricingService:
+    """Define the memoized IaaS pricing service.
+
+    Pricing payloads are normalized and deduplicated, and each distinct quote is requested
+    once per TTL, sending the first payload seen for it unchanged. Cache misses are requested
+    concurrently through the RISC worker pool. The ``iaas/pricing`` endpoint prices a single
+    payload per call, so misses are parallelized rather than batched into one request.
+
+    Example:
+        quotes = risc.pricing.quote_many(payloads)
+
+    Args:
+        client (RISC): The RISC client used to request quotes.
+        ttl (int): The number of seconds a quote remains cached. Defaults to: 3600.
+        cache (ResponseCache): The quote cache, e.g. one backed by disk to share quotes
+            across runs. Defaults to: an in-memory cache holding up to 10000 quotes.
+        workers (int): The maximum number of concurrent pricing requests.
+            Defaults to: the RISC max_workers setting.
+
+    """
+
+    def __init__(
+        self,
+        client: "RISC",
+        ttl: int = 3600,
+        cache: Optional[ResponseCache] = None,
+        workers: int = 0,
+    ) -> None:
+        """Initialize the PricingService class."""
+        self.client: "RISC" = client
+        self.ttl: int = ttl
+        self.cache: ResponseCache = cache or ResponseCache(
+            maxsize=10000, default_ttl=ttl, ttls={}
+        )
+        self.workers: int = workers
+        self.requests: int = 0
+        self._lock = threading.Lock()
+
+    def __repr__(self):
+        """Provide the representation for the PricingService object."""
+        return f"<PricingService - Requests: {self.requests} - Cache: {self.cache!r}>"
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        """Get the number of pricing requests sent and the quote cache counters."""
+        return {"requests": self.requests, **self.cache.stats}
+
+    def providers(self) -> List[Dict[str, Any]]:
+        """Get the IaaS providers, as returned from the RISC API."""
+        response = self.client.iaas_get_providers()
+        if response.status_code != 200:
+            logger.error("Unable to retrieve the IaaS providers!")
+            return []
+        data = decode_json(response)
+        if isinstance(data, dict):
+            return data.get("providers", data.get("data", [])) or []
+        return data or []
+
+    def _cache_key(self, key: str) -> str:
+        """Get the quote cache key, scoped to the client's assessment."""
+        return f"pricing:{self.client.assessment_code}:{key}"
+
+    def _fetch(self, payload: Dict[str, Any]) -> Any:
+        """Request a single quote, returning its decoded body or None on failure."""
+        with self._lock:
+            self.requests += 1
+        try:
+            response = self.client.iaas_pricing(payload)
+        except Exception as e:
+            logger.error("Pricing request failed: (%s) - Error: (%s)" % (payload, e))
+            return None
+        if response.status_code != 200:
+            logger.error(
+                "Pricing request failed: (%s) - Status: (%s)"
+                % (payload, response.status_code)
+            )
+            return None
+        return decode_json(response)
+
+    def quote(self, payload: Dict[str, Any]) -> Any:
+        """Get the quote of a single pricing payload."""
+        return self.quote_many([payload])[0]
+
+    def quote_many(self, payloads: Iterable[Dict[str, Any]]) -> List[Any]:
+        """Get the quotes of many pricing payloads, requesting each distinct miss once.
+
+        Args:
+            payloads (iterable of dict): The iaas/pricing payloads.
+
+        Returns:
+            list: The decoded quote of each payload, in order, or None where pricing failed.
+
+        """
+        keys: List[str] = []
+        originals: Dict[str, Dict[str, Any]] = {}
+        for payload in payloads:
+            key = quote_key(normalize_payload(payload))
+            keys.append(key)
+            originals.setdefault(key, payload)
+
+        quotes: Dict[str, Any] = {}
+        misses: List[str] = []
+        for key in originals:
+            cached = self.cache.get(self._cache_key(key))
+            if cached is None:
+                misses.append(key)
+            else:
+                quotes[key] = cached
+
+        for key, quote in self.client.map_concurrent(
+            lambda item: self._fetch(originals[item]),
+            misses,
+            workers=self.workers,
+            ordered=False,
+        ):
+            quotes[key] = quote
+            if quote is not None:
+                self.cache.set(self._cache_key(key), quote, ttl=self.ttl)
+        return [quotes.get(key) for key in keys]
@@ -0,0 +1,91 @@
+# -*- coding: utf-8 -*-
+"""Define the RISC lightweight records module.
+
+Records are slotted counterparts of the high-volume RISC models. They hold no per-instance
+``__dict__``, UUID or HTTP response, which keeps the memory of large result sets low.
+
+"""
+from dataclasses import MISSING, fields
+from typing import Any, Dict, Iterable, List, Tuple
+
+from risc.models import (
+    RiscDeviceConnectivity,
+    RiscResourceModel,
+    RiscStackConnectivity,
+)
+
+
+def model_defaults(model: Any) -> Tuple[Tuple[str, Any], ...]:
+    """Get the (name, default) pairs of the data fields of the provided RISC model."""
+    base_fields = {item.name for item in fields(RiscResourceModel)}
+    defaults: List[Tuple[str, Any]] = []
+    for item in fields(model):
+        if item.name in base_fields or not item.init:
+            continue
+        if item.default is not MISSING:
+            defaults.append((item.name, item.default))
+        else:
+            defaults.append((item.name, None))
+    return tuple(defaults)
+
+
+class RiscRecord:
+    """Define the slotted base record for high-volume RISC data.
+
+    Records compare equal by value but are mutable and may hold lists, so, like the
+    dataclass models, they are unhashable.
+
+    """
+
+    __slots__: Tuple[str, ...] = ()
+    defaults: Tuple[Tuple[str, Any], ...] = ()
+    __hash__ = None  # type: ignore
+
+    def __init__(self, **kwargs) -> None:
+        """Initialize the record, ignoring keys that are not record fields."""
+        for name, default in self.defaults:
+            setattr(self, name, kwargs.get(name, default))
+
+    def __repr__(self):
+        """Provide the representation for the record."""
+        values = ", ".join(f"{name}={getattr(self, name)!r}" for name in self.__slots__)
+        return f"{self.__class__.__name__}({values})"
+
+    def __eq__(self, other: Any) -> bool:
+        """Determine whether or not two records hold the same values."""
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return self.to_tuple() == other.to_tuple()
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> Any:
+        """Build the record from a dictionary, as returned from the RISC API."""
+        return cls(**data)
+
+    @classmethod
+    def from_dicts(cls, items: Iterable[Dict[str, Any]]) -> List[Any]:
+        """Build a list of records from an iterable of dictionaries."""
+        return [cls(**item) for item in items]
+
+    @property
+    def to_dict(self) -> Dict[str, Any]:
+        """Get the dictionary representation of the record."""
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def to_tuple(self) -> Tuple[Any, ...]:
+        """Get the record values, in field order."""
+        return tuple(getattr(self, name) for name in self.__slots__)
+
+
+class DeviceConnectivityRecord(RiscRecord):
+    """Define the slotted Device Connectivity record."""
+
+    defaults = model_defaults(RiscDeviceConnectivity)
+    __slots__ = tuple(name for name, _ in defaults)
+
+
+class StackConnectivityRecord(RiscRecord):
+    """Define the slotted Stack Connectivity record."""
+
+    defaults = model_defaults(RiscStackConnectivity)
+    __slots__ = tuple(name for name, _ in defaults)
@@ -0,0 +1,378 @@
+# -*- coding: utf-8 -*-
+"""Define the RISC bulk disk sizing module.
+
+The logical disks of many hosts are parsed once into typed columns, and their usage,
+fudge-factor recommendations and per-host and per-stack totals are computed in a single
+vectorized pass (NumPy when installed, plain loops over the columns otherwise). The math
+matches :func:`risc.utils.handle_disk_sizing`.
+
+"""
+import logging
+import math
+from array import array
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Tuple,
+    Union,
+)
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None
+
+if TYPE_CHECKING:  # pragma: no cover
+    from risc.snapshot import RiscSnapshot
+
+logger = logging.getLogger(__name__)
+
+GB: int = 1024 ** 3
+
+
+def host_disks(asset: Any) -> List[Dict[str, Any]]:
+    """Get the logical disks of an asset object, device object or disks_logical list."""
+    if isinstance(asset, list):
+        return asset
+    data = asset.get("data") or asset
+    if isinstance(data, list):
+        data = next((item for item in data if isinstance(item, dict)), {})
+    return data.get("disks_logical", []) or []
+
+
+def host_deviceid(asset: Any) -> str:
+    """Get the device ID of an asset object or device object, or an empty string."""
+    if not isinstance(asset, dict):
+        return ""
+    data = asset.get("data") or asset
+    if isinstance(data, list):
+        data = next((item for item in data if isinstance(item, dict)), {})
+    deviceid = data.get("deviceid", asset.get("deviceid", ""))
+    return str(deviceid) if deviceid not in (None, "") else ""
+
+
+class DiskSizing:
+    """Define the bulk logical disk sizing table.
+
+    Hosts are keyed by device ID when it is known, and by hostname otherwise. A device added
+    more than once, e.g. because it belongs to several stacks, is sized once and counted in the
+    totals of each of its stacks. Hosts without a device ID or hostname are never merged.
+
+    Example:
+        sizing = DiskSizing.from_hosts({"web01": asset}, fudge_factor=1.5)
+        sizing.stack_totals()
+        export_rows(sizing.rows(), out="sizing.csv", format="csv")
+
+    Args:
+        fudge_factor (float): The multiplier applied to the used space to estimate the
+            recommended volume size. Defaults to: 1.5.
+        only_local_disks (bool): Whether or not to only include local disks. Defaults to: True.
+
+    """
+
+    def __init__(
+        self, fudge_factor: float = 1.5, only_local_disks: bool = True
+    ) -> None:
+        """Initialize the DiskSizing class."""
+        self.fudge_factor: float = fudge_factor
+        self.only_local_disks: bool = only_local_disks
+        self.hostnames: List[str] = []
+        self.deviceids: List[str] = []
+        self.host_stacks: List[List[int]] = []
+        self.host_codes = array("q")
+        self.disk_names: List[str] = []
+        self.total_bytes = array("q")
+        self.free_bytes = array("q")
+        self._host_ids: Dict[Tuple[str, str], int] = {}
+        self._host_disks: Dict[int, set] = {}
+        self._computed: Dict[str, Any] = {}
+
+    def __repr__(self):
+        """Provide the representation for the DiskSizing object."""
+        return f"<DiskSizing - Hosts: {len(self.hostnames)} - Disks: {len(self.disk_names)}>"
+
+    def __len__(self) -> int:
+        """Get the number of sized disks."""
+        return len(self.disk_names)
+
+    @classmethod
+    def from_hosts(
+        cls,
+        hosts: Mapping[str, Any],
+        fudge_factor: float = 1.5,
+        only_local_disks: bool = True,
+        stack_ids: Optional[Mapping[str, Union[int, Iterable[int]]]] = None,
+    ) -> "DiskSizing":
+        """Build the sizing table of many hosts.
+
+        Args:
+            hosts (dict): The mapping of hostname to its asset object or disks_logical list.
+            fudge_factor (float): The used space multiplier. Defaults to: 1.5.
+            only_local_disks (bool): Whether or not to only include local disks. Defaults to: True.
+            stack_ids (dict): The optional mapping of hostname to its stack ID, or list of stack
+                IDs. Defaults to: None.
+
+        Returns:
+            DiskSizing: The sizing table.
+
+        """
+        sizing = cls(fudge_factor=fudge_factor, only_local_disks=only_local_disks)
+        stack_ids = stack_ids or {}
+        for hostname, asset in hosts.items():
+            stacks = stack_ids.get(hostname, 0)
+            if isinstance(stacks, int):
+                stacks = [stacks]
+            for stack_id in stacks or [0]:
+                sizing.add_host(
+                    hostname, host_disks(asset), stack_id, deviceid=host_deviceid(asset)
+                )
+        return sizing
+
+    @classmethod
+    def from_snapshot(
+        cls,
+        snapshot: "RiscSnapshot",
+        fudge_factor: float = 1.5,
+        only_local_disks: bool = True,
+        stack_id: Optional[int] = None,
+    ) -> "DiskSizing":
+        """Build the sizing table of the devices stored in a local snapshot.
+
+        Args:
+            snapshot (RiscSnapshot): The snapshot to read the devices from.
+            fudge_factor (float): The used space multiplier. Defaults to: 1.5.
+            only_local_disks (bool): Whether or not to only include local disks. Defaults to: True.
+            stack_id (int): The stack to size. Defaults to: all stacks.
+
+        Returns:
+            DiskSizing: The sizing table.
+
+        """
+        sizing = cls(fudge_factor=fudge_factor, only_local_disks=only_local_disks)
+        for device_stack, deviceid, hostname, device in snapshot.iter_stack_devices(
+            stack_id
+        ):
+            sizing.add_host(
+                hostname, host_disks(device), device_stack, deviceid=deviceid
+            )
+        return sizing
+
+    def add_host(
+        self,
+        hostname: str,
+        disks: Iterable[Dict[str, Any]],
+        stack_id: int = 0,
+        deviceid: str = "",
+    ) -> None:
+        """Add the logical disks of a host, parsing their sizes once.
+
+        Adding a known host again only records the extra stack and any disk not seen before.
+
+        """
+        deviceid = str(deviceid or "")
+        if deviceid:
+            key: Optional[Tuple[str, str]] = ("deviceid", deviceid)
+        elif hostname:
+            key = ("hostname", hostname)
+        else:
+            key = None
+        host = self._host_ids.get(key) if key else None
+        if host is None:
+            host = len(self.hostnames)
+            if key:
+                self._host_ids[key] = host
+            self.hostnames.append(hostname or "")
+            self.deviceids.append(deviceid)
+            self.host_stacks.append([])
+            self._host_disks[host] = set()
+        elif hostname and not self.hostnames[host]:
+            self.hostnames[host] = hostname
+        stack_id = int(stack_id or 0)
+        if stack_id and stack_id not in self.host_stacks[host]:
+            self.host_stacks[host].append(stack_id)
+
+        seen = self._host_disks[host]
+        for disk in disks:
+            # If the disk isn't a local disk, i.e. Compact, ignore it.
+            if self.only_local_disks and disk.get("disk_type") != "Local Disk":
+                continue
+            disk_name = str(disk.get("disk_name", "")).rstrip(":")
+            if disk_name in seen:
+                continue
+            try:
+                total = int(disk["disk_size_bytes"])
+                free = int(disk["disk_free_space_bytes"])
+            except (KeyError, TypeError, ValueError) as e:
+                logger.error(
+                    "Unable to size disk: (%s) of host: (%s) - Error: (%s)"
+                    % (disk.get("disk_name"), hostname, e)
+                )
+                continue
+            seen.add(disk_name)
+            self.host_codes.append(host)
+            self.disk_names.append(disk_name)
+            self.total_bytes.append(total)
+            self.free_bytes.append(free)
+        self._computed = {}
+
+    def host_key(self, host: int) -> str:
+        """Get the key of a host in the totals: its device ID, hostname or position, in that order."""
+        return self.deviceids[host] or self.hostnames[host] or f"host-{host}"
+
+    def compute(self) -> Dict[str, Any]:
+        """Compute the used bytes, usage and recommended sizes of every disk.
+
+        Returns:
+            dict: The used_bytes, usage_gb and recommended_gb columns.
+
+        """
+        if self._computed:
+            return self._computed
+        if np is not None and len(self):
+            total = np.frombuffer(self.total_bytes, dtype="q").astype("float64")
+            used = total - np.frombuffer(self.free_bytes, dtype="q")
+
+            def recommend(fudge_factor: float) -> Any:
+                proposed = used * fudge_factor
+                keep = (proposed <= total) & (proposed != 0)
+                return np.ceil(np.where(keep, proposed, total) / GB / 10.0) * 10
+
+            self._computed = {
+                "used_bytes": used.astype("q").tolist(),
+                "usage_gb": recommend(1.0).astype("q").tolist(),
+                "recommended_gb": recommend(self.fudge_factor).astype("q").tolist(),
+            }
+            return self._computed
+
+        def recommend_disk(total: int, used: int, fudge_factor: float) -> int:
+            proposed = used * fudge_factor
+            size = proposed if proposed <= total and proposed != 0 else total
+            return int(math.ceil(size / GB / 10.0)) * 10
+
+        used_bytes = [
+            total - free for total, free in zip(self.total_bytes, self.free_bytes)
+        ]
+        self._computed = {
+            "used_bytes": used_bytes,
+            "usage_gb": [
+                recommend_disk(total, used, 1.0)
+                for total, used in zip(self.total_bytes, used_bytes)
+            ],
+            "recommended_gb": [
+                recommend_disk(total, used, self.fudge_factor)
+                for total, used in zip(self.total_bytes, used_bytes)
+            ],
+        }
+        return self._computed
+
+    def rows(self) -> Iterator[Dict[str, Any]]:
+        """Iterate through the per-disk sizing rows, e.g. to export them for cost modeling.
+
+        Yields:
+            dict: The hostname, deviceid, stackid (the first stack of the host, or 0), stackids,
+                disk, total_bytes, free_bytes, used_bytes, usage_gb and recommended_gb of a disk.
+
+        """
+        computed = self.compute()
+        for i, host in enumerate(self.host_codes):
+            stacks = self.host_stacks[host]
+            yield {
+                "hostname": self.hostnames[host],
+                "deviceid": self.deviceids[host],
+                "stackid": stacks[0] if stacks else 0,
+                "stackids": list(stacks),
+                "disk": self.disk_names[i],
+                "total_bytes": self.total_bytes[i],
+                "free_bytes": self.free_bytes[i],
+                "used_bytes": computed["used_bytes"][i],
+                "usage_gb": computed["usage_gb"][i],
+                "recommended_gb": computed["recommended_gb"][i],
+            }
+
+    def _host_sums(self) -> List[Dict[str, int]]:
+        """Sum the disk columns of each host code."""
+        computed = self.compute()
+        columns: Dict[str, Any] = {
+            "total_bytes": self.total_bytes,
+            "used_bytes": computed["used_bytes"],
+            "usage_gb": computed["usage_gb"],
+            "recommended_gb": computed["recommended_gb"],
+        }
+        size = len(self.hostnames)
+        if np is not None and len(self):
+            groups = np.frombuffer(self.host_codes, dtype="q")
+            counts = np.bincount(groups, minlength=size).tolist()
+            sums = {
+                name: np.bincount(groups, weights=values, minlength=size)
+                .astype("q")
+                .tolist()
+                for name, values in columns.items()
+            }
+            return [
+                {"disks": counts[host], **{name: sums[name][host] for name in sums}}
+                for host in range(size)
+            ]
+
+        totals = [{"disks": 0, **dict.fromkeys(columns, 0)} for _ in range(size)]
+        for i, host in enumerate(self.host_codes):
+            entry = totals[host]
+            entry["disks"] += 1
+            for name, values in columns.items():
+                entry[name] += values[i]
+        return totals
+
+    def host_totals(self) -> Dict[str, Dict[str, Any]]:
+        """Get the disk count and summed sizes of each host with sized disks.
+
+        Returns:
+            dict: The mapping of host key (device ID, or hostname if unknown) to its hostname,
+                stackids, disk count and summed sizes.
+
+        """
+        totals: Dict[str, Dict[str, Any]] = {}
+        for host, sums in enumerate(self._host_sums()):
+            if not sums["disks"]:
+                continue
+            entry = totals.setdefault(
+                self.host_key(host),
+                {
+                    "hostname": self.hostnames[host],
+                    "stackids": list(self.host_stacks[host]),
+                    "disks": 0,
+                    **dict.fromkeys(sums, 0),
+                },
+            )
+            for name, value in sums.items():
+                entry[name] += value
+        return totals
+
+    def stack_totals(self) -> Dict[int, Dict[str, int]]:
+        """Get the disk count and summed sizes of each stack, 0 holding hosts without a stack.
+
+        A host belonging to several stacks is counted in the totals of each of them.
+
+        """
+        totals: Dict[int, Dict[str, int]] = {}
+        for host, sums in enumerate(self._host_sums()):
+            if not sums["disks"]:
+                continue
+            for stack_id in self.host_stacks[host] or [0]:
+                entry = totals.setdefault(stack_id, dict.fromkeys(sums, 0))
+                for name, value in sums.items():
+                    entry[name] += value
+        return dict(sorted(totals.items()))
+
+    def to_dataframe(self):
+        """Handle converting the sizing rows to a pandas DataFrame."""
+        try:
+            import pandas as pd
+        except ImportError:
+            logger.info("Pandas currently not installed! DataFrame support disabled!")
+            return None
+        return pd.DataFrame.from_records(list(self.rows()))
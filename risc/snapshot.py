@@ -0,0 +1,612 @@
+# -*- coding: utf-8 -*-
+"""Define the RISC local snapshot module.
+
+Like the online get_server, offline lookups match hostnames, identifying IPs and device IDs
+ignoring case, so those columns (and stack names) are indexed with ``COLLATE NOCASE``.
+
+"""
+import json
+import logging
+import sqlite3
+import time
+from typing import TYPE_CHECKING, Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from risc.utils import decode_json
+
+if TYPE_CHECKING:  # pragma: no cover
+    from risc.main import RISC
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+CREATE TABLE IF NOT EXISTS stacks (
+    stackid INTEGER PRIMARY KEY,
+    stack_name TEXT,
+    data TEXT
+);
+CREATE TABLE IF NOT EXISTS tags (
+    stackid INTEGER,
+    tagid INTEGER,
+    tagkey TEXT,
+    tagvalue TEXT
+);
+CREATE TABLE IF NOT EXISTS assets (
+    deviceid TEXT,
+    stackid INTEGER,
+    device_type TEXT,
+    hostname TEXT,
+    identifying_ip TEXT,
+    data TEXT
+);
+CREATE TABLE IF NOT EXISTS connectivity (
+    stackid INTEGER,
+    connectivity_type TEXT,
+    source_deviceid INTEGER,
+    dest_deviceid INTEGER,
+    src_ip TEXT,
+    dest_ip TEXT,
+    dest_port INTEGER,
+    total_bytes INTEGER,
+    data TEXT
+);
+CREATE TABLE IF NOT EXISTS fingerprints (
+    stackid INTEGER PRIMARY KEY,
+    fingerprint TEXT,
+    synced_at REAL
+);
+CREATE INDEX IF NOT EXISTS idx_stacks_name_nocase ON stacks (stack_name COLLATE NOCASE);
+CREATE INDEX IF NOT EXISTS idx_tags_stackid ON tags (stackid);
+CREATE INDEX IF NOT EXISTS idx_assets_hostname ON assets (hostname COLLATE NOCASE);
+CREATE INDEX IF NOT EXISTS idx_assets_identifying_ip_nocase ON assets (identifying_ip COLLATE NOCASE);
+CREATE INDEX IF NOT EXISTS idx_assets_stackid ON assets (stackid);
+CREATE INDEX IF NOT EXISTS idx_assets_deviceid_nocase ON assets (deviceid COLLATE NOCASE);
+CREATE INDEX IF NOT EXISTS idx_connectivity_stackid ON connectivity (stackid);
+CREATE INDEX IF NOT EXISTS idx_connectivity_source ON connectivity (source_deviceid);
+CREATE INDEX IF NOT EXISTS idx_connectivity_dest ON connectivity (dest_deviceid);
+"""
+
+CONNECTIVITY_TYPES: Tuple[str, str] = ("internal", "external")
+SNAPSHOT_COMPARE_KEYS: Tuple[str, ...] = ("hostname", "identifying_ip", "deviceid")
+
+
+def asset_records(asset: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Flatten an asset, as returned from the RISC API, into its device records.
+
+    Asset data may be a single device object or a list of them. Each returned record holds
+    the device object along with the deviceid, hostname and identifying_ip used for indexing.
+
+    """
+    data = asset.get("data")
+    if isinstance(data, list):
+        devices = [item for item in data if isinstance(item, dict)]
+    elif isinstance(data, dict):
+        devices = [data]
+    else:
+        devices = [asset]
+
+    records: List[Dict[str, Any]] = []
+    for device in devices:
+        records.append(
+            {
+                "deviceid": str(device.get("deviceid", asset.get("deviceid", ""))),
+                "hostname": device.get("hostname", asset.get("hostname", "")) or "",
+                "identifying_ip": device.get(
+                    "identifying_ip", asset.get("identifying_ip", "")
+                )
+                or "",
+                "data": device,
+            }
+        )
+    return records
+
+
+def stack_fingerprint(stack: Dict[str, Any]) -> str:
+    """Get the change fingerprint of a stack summary entry."""
+    return json.dumps(
+        [
+            stack.get("num_stack_members"),
+            stack.get("confirmed"),
+            stack.get("num_members_with_failed_checks"),
+        ]
+    )
+
+
+class RiscSnapshot:
+    """Define the local SQLite snapshot of a RISC assessment.
+
+    The snapshot stores the stacks, tags, assets and device connectivity of an assessment,
+    indexed on hostname, identifying_ip, stackid and deviceid, so common lookups can run offline.
+
+    Example:
+        snapshot = RISC().snapshot("assessment.db")
+        snapshot.get_server("web01")
+
+    Args:
+        path (str): The path of the SQLite snapshot file. Defaults to: risc-snapshot.db.
+
+    """
+
+    def __init__(self, path: str = "risc-snapshot.db") -> None:
+        """Initialize the RiscSnapshot class."""
+        self.path: str = path
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        self.connection.executescript(SCHEMA)
+
+    def __repr__(self):
+        """Provide the representation for the RiscSnapshot object."""
+        return (
+            f"<RiscSnapshot - Path: {self.path} - Assessment: {self.assessment_code}>"
+        )
+
+    def close(self) -> None:
+        """Close the snapshot database connection."""
+        self.connection.close()
+
+    @property
+    def assessment_code(self) -> str:
+        """Get the assessment code the snapshot was taken from."""
+        return self.get_meta("assessment_code")
+
+    @property
+    def refreshed_at(self) -> float:
+        """Get the UNIX timestamp of the last snapshot refresh."""
+        return float(self.get_meta("refreshed_at") or 0)
+
+    def get_meta(self, key: str) -> str:
+        """Get a snapshot metadata value."""
+        row = self.connection.execute(
+            "SELECT value FROM meta WHERE key = ?", (key,)
+        ).fetchone()
+        return row[0] if row else ""
+
+    def set_meta(self, key: str, value: Any) -> None:
+        """Set a snapshot metadata value."""
+        self.connection.execute(
+            "INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, str(value))
+        )
+
+    def refresh(
+        self, client: "RISC", connectivity: bool = True, workers: int = 0
+    ) -> "RiscSnapshot":
+        """Replace the snapshot contents with the current assessment data.
+
+        Stack assets and connectivity are fetched concurrently through the client worker pool,
+        while all writes happen on the calling thread in a single transaction. If the stack
+        summary can't be retrieved, the snapshot is left untouched.
+
+        Args:
+            client (RISC): The RISC client to fetch the assessment data with.
+            connectivity (bool): Whether or not to include device connectivity. Defaults to: True.
+            workers (int): The maximum number of concurrent requests.
+                Defaults to: the RISC max_workers setting.
+
+        Returns:
+            RiscSnapshot: The refreshed snapshot.
+
+        """
+        stacks = self._fetch_stacks(client)
+        if not stacks:
+            return self
+
+        with self.connection:
+            for table in ("stacks", "tags", "assets", "connectivity", "fingerprints"):
+                self.connection.execute(f"DELETE FROM {table}")  # nosec
+            self.store_stacks(stacks)
+            self._sync_stacks(client, stacks, connectivity, workers)
+
+            # Devices already stored, from a stack or an earlier device type, are skipped.
+            seen = self._device_ids()
+            for device_type in self._device_types(client):
+                assets = []
+                for asset in client.iter_assets(device_type=device_type):
+                    device_ids = {record["deviceid"] for record in asset_records(asset)}
+                    if not device_ids & seen:
+                        assets.append(asset)
+                        seen.update(device_ids)
+                self.store_assets(assets, device_type=device_type)
+
+            self.set_meta("assessment_code", client.assessment_code)
+            self.set_meta("connectivity", int(connectivity))
+            self.set_meta("refreshed_at", time.time())
+        return self
+
+    def sync(
+        self, client: "RISC", connectivity: bool = True, workers: int = 0
+    ) -> Dict[str, List[int]]:
+        """Incrementally update the snapshot, re-fetching only stacks that changed.
+
+        Each stack is fingerprinted from its stack summary entry (member count, confirmation and
+        failed check count). Assets and connectivity are re-fetched for stacks that were added or
+        whose fingerprint changed, and dropped for stacks that were removed. Assets outside of any
+        stack are only updated by a full refresh. If the snapshot is empty, belongs to another
+        assessment or was taken with a different connectivity setting, a full refresh is made.
+
+        A stack is only fingerprinted once all of its data was fetched. Stacks whose fetch failed
+        keep their previous data and are retried by the next sync, and the sync is aborted
+        without changes if the stack summary can't be retrieved or lists no stacks.
+
+        Args:
+            client (RISC): The RISC client to fetch the assessment data with.
+            connectivity (bool): Whether or not to include device connectivity. Defaults to: True.
+            workers (int): The maximum number of concurrent requests.
+                Defaults to: the RISC max_workers setting.
+
+        Returns:
+            dict: The lists of added, changed, removed, unchanged and failed stack IDs.
+
+        """
+        changes: Dict[str, List[int]] = {
+            "added": [],
+            "changed": [],
+            "removed": [],
+            "unchanged": [],
+            "failed": [],
+        }
+        if (
+            not self.refreshed_at
+            or self.assessment_code != client.assessment_code
+            or self.get_meta("connectivity") != str(int(connectivity))
+        ):
+            refreshed_at = self.refreshed_at
+            self.refresh(client, connectivity=connectivity, workers=workers)
+            if self.refreshed_at == refreshed_at:
+                return changes
+            stored = self._fingerprints()
+            for (stack_id,) in self.connection.execute("SELECT stackid FROM stacks"):
+                changes["added" if stack_id in stored else "failed"].append(stack_id)
+            return changes
+
+        stacks = self._fetch_stacks(client)
+        if not stacks:
+            return changes
+
+        current = {stack["stackid"]: stack_fingerprint(stack) for stack in stacks}
+        stored = self._fingerprints()
+        changes["added"] = [stack_id for stack_id in current if stack_id not in stored]
+        changes["changed"] = [
+            stack_id
+            for stack_id, fingerprint in current.items()
+            if stack_id in stored and stored[stack_id] != fingerprint
+        ]
+        changes["removed"] = [
+            stack_id for stack_id in stored if stack_id not in current
+        ]
+        changes["unchanged"] = [
+            stack_id
+            for stack_id, fingerprint in current.items()
+            if stored.get(stack_id) == fingerprint
+        ]
+        stale_ids = set(changes["added"] + changes["changed"])
+        logger.info(
+            "Snapshot sync - Added: %s - Changed: %s - Removed: %s"
+            % (len(changes["added"]), len(changes["changed"]), len(changes["removed"]))
+        )
+
+        with self.connection:
+            self.delete_stacks(changes["removed"])
+            self.connection.execute("DELETE FROM stacks")
+            self.connection.execute("DELETE FROM tags")
+            self.store_stacks(stacks)
+            changes["failed"] = self._sync_stacks(
+                client,
+                [stack for stack in stacks if stack["stackid"] in stale_ids],
+                connectivity,
+                workers,
+            )
+            self.set_meta("refreshed_at", time.time())
+        return changes
+
+    def _fetch_stacks(self, client: "RISC") -> List[Dict[str, Any]]:
+        """Fetch the stack summary entries, or an empty list if they can't be retrieved."""
+        stacks = client.refresh_stack_data().get("assets", []) or []
+        if not stacks:
+            logger.error(
+                "No stacks retrieved for assessment: (%s)! Snapshot left unchanged."
+                % client.assessment_code
+            )
+        return stacks
+
+    def _fingerprints(self) -> Dict[int, str]:
+        """Get the mapping of stack ID to the fingerprint it was last synced with."""
+        return dict(
+            self.connection.execute("SELECT stackid, fingerprint FROM fingerprints")
+        )
+
+    def _sync_stacks(
+        self,
+        client: "RISC",
+        stacks: List[Dict[str, Any]],
+        connectivity: bool,
+        workers: int,
+    ) -> List[int]:
+        """Fetch and store the assets and connectivity of the provided stacks.
+
+        Each stack is fetched as a whole, and its stored data and fingerprint are only replaced
+        once every fetch succeeded.
+
+        Returns:
+            list of int: The IDs of the stacks that failed to fetch and were left unchanged.
+
+        """
+        fingerprints = {stack["stackid"]: stack_fingerprint(stack) for stack in stacks}
+        failed: List[int] = []
+        for stack_id, data in client.map_concurrent(
+            lambda stack_id: self._fetch_stack(client, stack_id, connectivity),
+            list(fingerprints),
+            workers=workers,
+            ordered=False,
+        ):
+            if data is None:
+                failed.append(stack_id)
+                continue
+            assets, rows = data
+            self.delete_stacks([stack_id])
+            self.store_assets(assets, stack_id=stack_id)
+            for connectivity_type, connectivity_rows in rows.items():
+                self.store_connectivity(
+                    (stack_id, connectivity_type), connectivity_rows
+                )
+            self.connection.execute(
+                "INSERT OR REPLACE INTO fingerprints (stackid, fingerprint, synced_at) VALUES (?, ?, ?)",
+                (stack_id, fingerprints[stack_id], time.time()),
+            )
+        return failed
+
+    def _fetch_stack(
+        self, client: "RISC", stack_id: int, connectivity: bool
+    ) -> Optional[Tuple[List[Dict[str, Any]], Dict[str, List[Dict[str, Any]]]]]:
+        """Fetch the assets and connectivity rows of a stack, or None if any fetch failed."""
+        try:
+            assets = list(client.iter_assets(stack_id=stack_id))
+            rows = {
+                connectivity_type: list(
+                    client.iter_device_connectivity(
+                        stack_id=stack_id, connectivity_type=connectivity_type, raw=True
+                    )
+                )
+                for connectivity_type in (CONNECTIVITY_TYPES if connectivity else ())
+            }
+        except Exception as e:
+            logger.error("Unable to sync stack: (%s) - Error: (%s)" % (stack_id, e))
+            return None
+        return assets, rows
+
+    def delete_stacks(self, stack_ids: List[int]) -> None:
+        """Remove the assets, connectivity and fingerprints of the provided stacks."""
+        for table in ("assets", "connectivity", "fingerprints"):
+            self.connection.executemany(
+                f"DELETE FROM {table} WHERE stackid = ?",  # nosec
+                ((stack_id,) for stack_id in stack_ids),
+            )
+
+    def _device_types(self, client: "RISC") -> List[str]:
+        """Get the device types listed in the assessment asset summary."""
+        response = client.assets_get_summary(use_cache=False)
+        if response.status_code != 200:
+            return []
+        summary = decode_json(response).get("assets", [])
+        return [
+            item.get("type", item.get("device_type", ""))
+            for item in summary
+            if isinstance(item, dict) and item.get("type", item.get("device_type"))
+        ]
+
+    def _device_ids(self) -> set:
+        """Get the set of device IDs stored in the snapshot."""
+        rows = self.connection.execute("SELECT deviceid FROM assets")
+        return {row[0] for row in rows if row[0]}
+
+    def store_stacks(self, stacks: List[Dict[str, Any]]) -> None:
+        """Store the provided stack summary entries and their tags."""
+        self.connection.executemany(
+            "INSERT OR REPLACE INTO stacks (stackid, stack_name, data) VALUES (?, ?, ?)",
+            (
+                (stack["stackid"], stack.get("stack_name", ""), json.dumps(stack))
+                for stack in stacks
+            ),
+        )
+        self.connection.executemany(
+            "INSERT INTO tags (stackid, tagid, tagkey, tagvalue) VALUES (?, ?, ?, ?)",
+            (
+                (
+                    stack["stackid"],
+                    tag.get("tagid", 0),
+                    tag.get("tagkey", ""),
+                    tag.get("tagvalue", ""),
+                )
+                for stack in stacks
+                for tag in stack.get("tags", []) or []
+            ),
+        )
+
+    def store_assets(
+        self,
+        assets: List[Dict[str, Any]],
+        stack_id: Optional[int] = None,
+        device_type: str = "",
+    ) -> None:
+        """Store the provided assets, as returned from the RISC API."""
+        self.connection.executemany(
+            "INSERT INTO assets (deviceid, stackid, device_type, hostname, identifying_ip, data) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (
+                (
+                    record["deviceid"],
+                    stack_id,
+                    device_type,
+                    record["hostname"],
+                    record["identifying_ip"],
+                    json.dumps(record["data"]),
+                )
+                for asset in assets
+                for record in asset_records(asset)
+            ),
+        )
+
+    def store_connectivity(
+        self, key: Tuple[int, str], rows: List[Dict[str, Any]]
+    ) -> None:
+        """Store the device connectivity rows of a (stack ID, connectivity type) pair."""
+        stack_id, connectivity_type = key
+        self.connection.executemany(
+            "INSERT INTO connectivity (stackid, connectivity_type, source_deviceid, dest_deviceid, "
+            "src_ip, dest_ip, dest_port, total_bytes, data) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                (
+                    stack_id,
+                    connectivity_type,
+                    row.get("source_deviceid"),
+                    row.get("dest_deviceid"),
+                    row.get("src_ip"),
+                    row.get("dest_ip"),
+                    row.get("dest_port"),
+                    row.get("total_bytes"),
+                    json.dumps(row),
+                )
+                for row in rows
+            ),
+        )
+
+    def lookup_stack_id(self, name: str, case_sensitive: bool = True):
+        """Look up the stack ID of the provided stack name.
+
+        Returns:
+            int: The stack ID, or an empty string if no stack matches.
+
+        """
+        query = "SELECT stackid FROM stacks WHERE stack_name = ?"
+        if not case_sensitive:
+            query += " COLLATE NOCASE"
+        row = self.connection.execute(query, (name,)).fetchone()
+        return row[0] if row else ""
+
+    def get_server(self, search: str = "", compare: str = "hostname") -> Dict[str, Any]:
+        """Get the device asset object matching the provided search value.
+
+        Args:
+            search (str): The value to search for.
+            compare (str): The key to match the search value with. Options are: hostname,
+                identifying_ip and deviceid. Defaults to: hostname.
+
+        Returns:
+            dict: The device asset object, or an empty dict if no asset matches.
+
+        """
+        if compare not in SNAPSHOT_COMPARE_KEYS:
+            raise ValueError(
+                f"Invalid option provided to get_server compare argument: {compare}"
+            )
+        row = self.connection.execute(
+            f"SELECT data FROM assets WHERE {compare} = ? COLLATE NOCASE LIMIT 1",  # nosec
+            (search,),
+        ).fetchone()
+        return json.loads(row[0]) if row else {}
+
+    def get_device_stacks(self, device_ids: Iterable[str]) -> Dict[str, List[int]]:
+        """Get the stored stack membership of the provided device IDs.
+
+        Returns:
+            dict: The mapping of device ID to the IDs of the stacks it belongs to. Devices that
+                aren't stored in any stack are left out.
+
+        """
+        device_stacks: Dict[str, List[int]] = {}
+        for deviceid in set(device_ids):
+            rows = self.connection.execute(
+                "SELECT DISTINCT stackid FROM assets WHERE deviceid = ? COLLATE NOCASE"
+                " ORDER BY stackid",
+                (deviceid,),
+            )
+            stacks = [stack_id for (stack_id,) in rows if stack_id]
+            if stacks:
+                device_stacks[deviceid] = stacks
+        return device_stacks
+
+    def get_application_ips(
+        self, application: str, identifying_ips_only: bool = True
+    ) -> List[Any]:
+        """Get all associated IP addresses for the provided application stack.
+
+        Args:
+            application (str): The application stack name, as identified in RISC.
+            identifying_ips_only (bool): Whether or not to return only the identifying_ip value
+                of each asset. If set to: False, all ips of each device are returned. Defaults to: True.
+
+        Returns:
+            list of str: The sorted list of device IP addresses present in the application stack.
+
+        """
+        stack_id = self.lookup_stack_id(application)
+        if not stack_id:
+            return []
+        if identifying_ips_only:
+            rows = self.connection.execute(
+                "SELECT DISTINCT identifying_ip FROM assets WHERE stackid = ?",
+                (stack_id,),
+            )
+            return sorted(ip for (ip,) in rows if ip and ip != "NULL")
+
+        ip_addresses = set()
+        for (data,) in self.connection.execute(
+            "SELECT data FROM assets WHERE stackid = ?", (stack_id,)
+        ):
+            for found_ip in json.loads(data).get("ips", []) or []:
+                if found_ip.get("ip") and found_ip["ip"] != "NULL":
+                    ip_addresses.add(found_ip["ip"])
+        return sorted(ip_addresses)
+
+    def iter_assets(self, stack_id: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+        """Iterate through the stored device asset objects, optionally of a single stack."""
+        if stack_id is None:
+            rows = self.connection.execute("SELECT data FROM assets")
+        else:
+            rows = self.connection.execute(
+                "SELECT data FROM assets WHERE stackid = ?", (stack_id,)
+            )
+        for (data,) in rows:
+            yield json.loads(data)
+
+    def iter_stack_devices(
+        self, stack_id: Optional[int] = None
+    ) -> Iterator[Tuple[int, str, str, Dict[str, Any]]]:
+        """Iterate through the stored (stack ID, device ID, hostname, device object) records."""
+        query = "SELECT stackid, deviceid, hostname, data FROM assets"
+        params: Tuple[Any, ...] = ()
+        if stack_id is not None:
+            query += " WHERE stackid = ?"
+            params = (stack_id,)
+        for device_stack, deviceid, hostname, data in self.connection.execute(
+            query, params
+        ):
+            yield device_stack or 0, deviceid or "", hostname or "", json.loads(data)
+
+    def iter_device_connectivity(
+        self, stack_id: Optional[int] = None, connectivity_type: str = ""
+    ) -> Iterator[Dict[str, Any]]:
+        """Iterate through the stored device connectivity rows."""
+        query = "SELECT data FROM connectivity WHERE 1 = 1"
+        params: List[Any] = []
+        if stack_id is not None:
+            query += " AND stackid = ?"
+            params.append(stack_id)
+        if connectivity_type:
+            query += " AND connectivity_type = ?"
+            params.append(connectivity_type.lower())
+        for (data,) in self.connection.execute(query, params):
+            yield json.loads(data)
+
+    def get_tags(self, stack_id: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Get the stored stack tags, optionally of a single stack."""
+        query = "SELECT stackid, tagid, tagkey, tagvalue FROM tags"
+        params: Tuple[Any, ...] = ()
+        if stack_id is not None:
+            query += " WHERE stackid = ?"
+            params = (stack_id,)
+        return [
+            {"stackid": row[0], "tagid": row[1], "tagkey": row[2], "tagvalue": row[3]}
+            for row in self.connection.execute(query, params)
+        ]
@@ -0,0 +1,68 @@
+# -*- coding: utf-8 -*-
+"""Define the RISC bulk tagging module.
+
+The RISC API documents neither the ``tags/getTags`` response nor the ``tags/addTags``
+payload for multiple devices. The helpers below assume the shapes used by the stack
+summary tags, extended with the device ID:
+
+* ``tags/getTags`` returns ``{"tags": [{"deviceid": ..., "tagkey": ..., "tagvalue": ...}]}``.
+* ``tags/addTags`` accepts ``{"tags": [{"deviceid": ..., "tagkey": ..., "tagvalue": ...}]}``.
+
+Both can be overridden through the ``existing`` and ``payload_factory`` arguments of
+``RISC.tags_add_tags_bulk`` if the API expects something else.
+
+"""
+from typing import Any, Dict, FrozenSet, Iterable, List, Mapping, Tuple
+
+TagKey = Tuple[str, str]
+
+# The validation responses worth splitting a rejected batch on. Any other failure, e.g. an
+# auth error, a rate limit or a server error, would fail every sub-batch the same way.
+SPLIT_STATUSES: FrozenSet[int] = frozenset({400, 409, 413, 422})
+
+
+def normalize_operation(operation: Any) -> Tuple[str, str, str]:
+    """Normalize a (deviceid, tagkey, tagvalue) tuple or dict into a string tuple."""
+    if isinstance(operation, Mapping):
+        values = (
+            operation.get("deviceid", ""),
+            operation.get("tagkey", ""),
+            operation.get("tagvalue", ""),
+        )
+    else:
+        values = tuple(operation)
+    if len(values) != 3:
+        raise ValueError(f"Invalid tag operation: {operation}")
+    return str(values[0]), str(values[1]), str(values[2])
+
+
+def dedupe_operations(operations: Iterable[Any]) -> List[Tuple[str, str, str]]:
+    """Normalize the tag operations, keeping only the last value set per device and key."""
+    latest: Dict[TagKey, str] = {}
+    for operation in operations:
+        deviceid, tagkey, tagvalue = normalize_operation(operation)
+        latest.pop((deviceid, tagkey), None)
+        latest[(deviceid, tagkey)] = tagvalue
+    return [(deviceid, tagkey, value) for (deviceid, tagkey), value in latest.items()]
+
+
+def existing_tags(data: Any) -> Dict[TagKey, str]:
+    """Get the mapping of (deviceid, tagkey) to tag value of a decoded tags/getTags response."""
+    items = data.get("tags", []) if isinstance(data, Mapping) else data
+    tags: Dict[TagKey, str] = {}
+    for item in items or []:
+        if isinstance(item, Mapping) and item.get("deviceid") is not None:
+            tags[(str(item["deviceid"]), str(item.get("tagkey", "")))] = str(
+                item.get("tagvalue", "")
+            )
+    return tags
+
+
+def build_tags_payload(operations: List[Tuple[str, str, str]]) -> Dict[str, Any]:
+    """Build the tags/addTags payload of a batch of tag operations."""
+    return {
+        "tags": [
+            {"deviceid": deviceid, "tagkey": tagkey, "tagvalue": tagvalue}
+            for deviceid, tagkey, tagvalue in operations
+        ]
+    }
@@ -0,0 +1,212 @@
+# -*- coding: utf-8 -*-
+"""Define the RISC HTTP transport module."""
+import logging
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Iterable, Optional, Tuple
+
+from requests.adapters import HTTPAdapter
+from requests.exceptions import ConnectionError as RequestsConnectionError
+from requests.exceptions import Timeout
+from requests.models import Response
+from requests.sessions import Session
+
+try:
+    import httpx
+except ImportError:  # pragma: no cover
+    httpx = None
+
+logger = logging.getLogger(__name__)
+
+# The connection errors worth retrying, for the requests and httpx (AsyncRISC) clients.
+RETRY_ERRORS: Tuple[type, ...] = (RequestsConnectionError, Timeout)
+if httpx is not None:
+    RETRY_ERRORS += (httpx.TransportError,)
+
+
+class RetryPolicy:
+    """Define the retry policy applied to RISC API requests.
+
+    Failed attempts are retried with exponential backoff and full jitter. When the API sends
+    a ``Retry-After`` header, it takes precedence over the computed backoff.
+
+    Args:
+        total (int): The maximum number of retries per request. Defaults to: 3.
+        backoff_factor (float): The base backoff, in seconds, doubled on each retry. Defaults to: 0.5.
+        max_backoff (float): The maximum backoff, in seconds. Defaults to: 60.
+        status_forcelist (iterable of int): The response status codes to retry.
+            Defaults to: 429, 500, 502, 503 and 504.
+        methods (iterable of str): The HTTP methods retried on server errors and connection failures.
+            429 responses are retried for every method, since the request was not processed.
+            Defaults to: GET and HEAD.
+
+    """
+
+    def __init__(
+        self,
+        total: int = 3,
+        backoff_factor: float = 0.5,
+        max_backoff: float = 60.0,
+        status_forcelist: Iterable[int] = (429, 500, 502, 503, 504),
+        methods: Iterable[str] = ("GET", "HEAD"),
+    ) -> None:
+        """Initialize the RetryPolicy class."""
+        self.total: int = total
+        self.backoff_factor: float = backoff_factor
+        self.max_backoff: float = max_backoff
+        self.status_forcelist = frozenset(status_forcelist)
+        self.methods = frozenset(method.upper() for method in methods)
+
+    def __repr__(self):
+        """Provide the representation for the RetryPolicy object."""
+        return f"<RetryPolicy - Total: {self.total} - Backoff: {self.backoff_factor}>"
+
+    def should_retry(
+        self,
+        method: str,
+        attempt: int,
+        response: Optional[Response] = None,
+        error: Optional[Exception] = None,
+    ) -> bool:
+        """Determine whether or not the failed attempt should be retried.
+
+        Args:
+            method (str): The HTTP method of the request.
+            attempt (int): The number of retries already made.
+            response (Response): The response of the attempt, if one was received.
+            error (Exception): The error raised by the attempt, if any.
+
+        Returns:
+            bool: Whether or not to retry the request.
+
+        """
+        if attempt >= self.total:
+            return False
+        if error is not None:
+            return isinstance(error, RETRY_ERRORS) and (method.upper() in self.methods)
+        if response is None or response.status_code not in self.status_forcelist:
+            return False
+        return response.status_code == 429 or method.upper() in self.methods
+
+    def backoff(self, attempt: int, response: Optional[Response] = None) -> float:
+        """Get the number of seconds to wait before the next retry.
+
+        Args:
+            attempt (int): The number of retries already made.
+            response (Response): The response of the failed attempt, if one was received.
+
+        Returns:
+            float: The number of seconds to sleep.
+
+        """
+        retry_after = self.retry_after(response)
+        if retry_after is not None:
+            return min(retry_after, self.max_backoff)
+        ceiling = min(self.max_backoff, self.backoff_factor * (2 ** attempt))
+        return random.uniform(0, ceiling)  # nosec
+
+    @staticmethod
+    def retry_after(response: Optional[Response]) -> Optional[float]:
+        """Parse the Retry-After header of the provided response, in seconds."""
+        if response is None:
+            return None
+        value = response.headers.get("Retry-After", "")
+        if not value:
+            return None
+        try:
+            return max(float(value), 0.0)
+        except ValueError:
+            pass
+        try:
+            return max(parsedate_to_datetime(value).timestamp() - time.time(), 0.0)
+        except (TypeError, ValueError):
+            return None
+
+
+class RateLimiter:
+    """Define the client-side token bucket rate limiter.
+
+    A single limiter is safe to share across threads and RISC instances. Each request takes
+    one token and blocks until a token is available.
+
+    Args:
+        rate (float): The number of requests allowed per second.
+        burst (int): The maximum number of tokens that can accumulate. Defaults to: rate.
+
+    """
+
+    def __init__(self, rate: float, burst: int = 0) -> None:
+        """Initialize the RateLimiter class."""
+        if rate <= 0:
+            raise ValueError("The rate limit must be greater than zero!")
+        self.rate: float = float(rate)
+        self.burst: float = float(burst or max(rate, 1))
+        self._tokens: float = self.burst
+        self._updated: float = time.monotonic()
+        self._lock = threading.Lock()
+
+    def __repr__(self):
+        """Provide the representation for the RateLimiter object."""
+        return f"<RateLimiter - Rate: {self.rate}/s - Burst: {self.burst}>"
+
+    def acquire(self) -> float:
+        """Take a token, blocking until one is available.
+
+        Returns:
+            float: The number of seconds spent waiting.
+
+        """
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(
+                    self.burst, self._tokens + (now - self._updated) * self.rate
+                )
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return waited
+                delay = (1 - self._tokens) / self.rate
+            time.sleep(delay)
+            waited += delay
+
+
+def build_session(
+    pool_connections: int = 0,
+    pool_maxsize: int = 0,
+    adapter: Optional[HTTPAdapter] = None,
+    session: Optional[Session] = None,
+) -> Session:
+    """Build the requests session used by the RISC client.
+
+    A provided session is never reconfigured beyond mounting a transport adapter, and only
+    when an adapter or pool size is provided. Its headers are left untouched, so per-client
+    headers such as the User-Agent must be sent with each request.
+
+    Args:
+        pool_connections (int): The number of per-host connection pools to cache.
+            Defaults to: 10 for a new session, or the adapters of the provided session.
+        pool_maxsize (int): The maximum number of connections kept per host. This should be at
+            least the number of concurrent workers to avoid discarding connections.
+            Defaults to: 10 for a new session, or the adapters of the provided session.
+        adapter (HTTPAdapter): A preconfigured transport adapter mounted for http and https.
+            Overrides pool_connections and pool_maxsize. Defaults to: None.
+        session (Session): A preconfigured session to use instead of creating one. Defaults to: None.
+
+    Returns:
+        Session: The configured requests session.
+
+    """
+    if session is None:
+        session = Session()
+    elif adapter is None and not (pool_connections or pool_maxsize):
+        return session
+    adapter = adapter or HTTPAdapter(
+        pool_connections=pool_connections or 10, pool_maxsize=pool_maxsize or 10
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
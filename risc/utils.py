@@ -1,10 +1,75 @@
 # -*- coding: utf-8 -*-
 """Define the RISC utilities."""
+import hashlib
+import json
+import logging
 import math
-from typing import Any, Dict
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Callable, Deque, Dict, Iterable, Iterator, List, Tuple
 
 from risc.__version__ import __version__ as risc_version
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+try:
+    import ujson
+except ImportError:  # pragma: no cover
+    ujson = None
+
+try:
+    import ijson
+except ImportError:  # pragma: no cover
+    ijson = None
+
+logger = logging.getLogger(__name__)
+
+if orjson is not None:
+    JSON_BACKEND: str = "orjson"
+    json_loads: Callable[[Any], Any] = orjson.loads
+elif ujson is not None:
+    JSON_BACKEND = "ujson"
+    json_loads = ujson.loads
+else:
+    JSON_BACKEND = "json"
+    json_loads = json.loads
+
+
+class RiscPageError(Exception):
+    """Define the error raised when a page of a paginated listing could not be retrieved.
+
+    Args:
+        message (str): The error message.
+        status_code (int): The status code of the failed page response, if any.
+
+    """
+
+    def __init__(self, message: str, status_code: Any = None) -> None:
+        """Initialize the RiscPageError class."""
+        super().__init__(message)
+        self.status_code: Any = status_code
+
+
+class RiscAssessmentsError(Exception):
+    """Define the error raised when a query failed for some of many assessments.
+
+    Args:
+        errors (dict): The mapping of assessment code to the error raised by its query.
+        results (dict): The mapping of assessment code to the result of each successful query.
+
+    """
+
+    def __init__(self, errors: Dict[str, Exception], results: Dict[str, Any]) -> None:
+        """Initialize the RiscAssessmentsError class."""
+        super().__init__(
+            f"Query failed for {len(errors)} assessment(s): {', '.join(sorted(errors))}"
+        )
+        self.errors: Dict[str, Exception] = errors
+        self.results: Dict[str, Any] = results
+
 
 def get_user_agent(user_agent: str = "risc-python") -> str:
     """Get the current module version."""
@@ -12,6 +77,32 @@ def get_user_agent(user_agent: str = "risc-python") -> str:
     return user_agent_str
 
 
+def build_auth_payload(
+    user_id: str, password: str, api_token: str, assessment_code: str = ""
+) -> Dict[str, str]:
+    """Build the RISC API authentication payload.
+
+    Args:
+        user_id (str): The RISC user ID.
+        password (str): The RISC user password.
+        api_token (str): The RISC API token.
+        assessment_code (str): The RISC assessment code, if any.
+
+    Returns:
+        dict: The authentication payload containing the user ID and hashed credentials.
+
+    """
+    md5_password: str = hashlib.md5(password.encode()).hexdigest().upper()
+    md5_api_token: str = f"{api_token}{md5_password}"
+    auth_string: str = hashlib.md5(md5_api_token.encode()).hexdigest()
+    logger.info("Authentication md5 hash: %s" % auth_string)
+    auth = {"userid": user_id, "password": auth_string}
+
+    if assessment_code:
+        auth["assessmentcode"] = assessment_code
+    return auth
+
+
 def roundup(x: float) -> int:
     """Round the provided float up to the nearest tens."""
     return int(math.ceil(x / 10.0)) * 10
@@ -74,3 +165,166 @@ def handle_disk_sizing(
         "label": "GB",
     }
     return formatted_recommendation
+
+
+def page_records(response: Any, key: str) -> List[Any]:
+    """Get the list of records stored under the provided key of a page response.
+
+    Only an empty 200 page marks the end of a listing. A failed page raises instead of
+    returning no records, so it never silently truncates the data being iterated.
+
+    Args:
+        response (Response): The page response.
+        key (str): The top-level key holding the records, e.g. assets.
+
+    Raises:
+        RiscPageError: If the page status isn't 200 or its body could not be decoded.
+
+    Returns:
+        list: The records of the page.
+
+    """
+    if response.status_code != 200:
+        message = "Unable to retrieve page: (%s) - Status: (%s)" % (
+            getattr(response, "url", ""),
+            response.status_code,
+        )
+        logger.error(message)
+        raise RiscPageError(message, status_code=response.status_code)
+    try:
+        return decode_json(response).get(key, []) or []
+    except Exception as e:
+        message = "Error encountered while decoding page data: (%s)" % e
+        logger.error(message)
+        raise RiscPageError(message, status_code=response.status_code) from e
+
+
+def split_values(values: Any) -> List[str]:
+    """Get the list of string values of a comma separated string or an iterable.
+
+    Command line arguments may arrive as a single string, a tuple or a scalar, so a string
+    is never iterated character by character.
+
+    Example:
+        split_values("1, 2")
+        # ["1", "2"]
+
+    """
+    if values is None:
+        return []
+    if isinstance(values, (str, int, float)):
+        values = str(values).split(",")
+    return [str(value).strip() for value in values if str(value).strip()]
+
+
+def split_ints(values: Any) -> List[int]:
+    """Get the list of integer values of a comma separated string or an iterable.
+
+    Example:
+        split_ints("1, 2")
+        # [1, 2]
+
+    """
+    return [int(value) for value in split_values(values)]
+
+
+def map_concurrent(
+    func: Callable[[Any], Any],
+    items: Iterable[Any],
+    workers: int = 8,
+    ordered: bool = True,
+) -> Iterator[Tuple[Any, Any]]:
+    """Apply the provided callable to each item using a bounded thread pool.
+
+    At most ``workers`` calls are in flight at any time, so ``items`` may be a lazy or
+    unbounded iterable. Closing the returned generator cancels the calls not yet started.
+
+    Args:
+        func (callable): The callable to apply to each item.
+        items (iterable): The items to pass to the callable.
+        workers (int): The maximum number of concurrent calls. Defaults to: 8.
+        ordered (bool): Whether or not to yield results in the order of the provided items.
+            If set to: False, results are yielded as they complete. Defaults to: True.
+
+    Yields:
+        tuple: The item and the result of the callable for that item.
+
+    """
+    workers = max(int(workers), 1)
+    items_iter = iter(items)
+    pending: Deque[Tuple[Any, Any]] = deque()
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+
+        def submit_next() -> bool:
+            try:
+                item = next(items_iter)
+            except StopIteration:
+                return False
+            pending.append((item, executor.submit(func, item)))
+            return True
+
+        try:
+            for _ in range(workers):
+                if not submit_next():
+                    break
+
+            while pending:
+                if ordered:
+                    item, future = pending.popleft()
+                    result = future.result()
+                else:
+                    wait([future for _, future in pending], return_when=FIRST_COMPLETED)
+                    item, future = next(entry for entry in pending if entry[1].done())
+                    pending.remove((item, future))
+                    result = future.result()
+                submit_next()
+                yield item, result
+        finally:
+            for _, future in pending:
+                future.cancel()
+
+
+def decode_json(response: Any) -> Any:
+    """Decode the JSON body of the provided response with the fastest installed backend.
+
+    orjson is used when installed, then ujson, then the response's own (stdlib) decoder.
+    Works with both requests and httpx responses.
+
+    Args:
+        response (Response): The response to decode.
+
+    Returns:
+        any: The decoded JSON body.
+
+    """
+    if JSON_BACKEND == "json":
+        return response.json()
+    return json_loads(response.content)
+
+
+def iter_json_items(response: Any, key: str) -> Iterator[Any]:
+    """Iterate through the items of the list stored under the provided top-level key.
+
+    When ijson is installed and the response was requested with ``stream=True``, items are
+    parsed incrementally from the socket and yielded before the whole body has arrived.
+    Otherwise the full body is decoded with :func:`decode_json`.
+
+    Args:
+        response (Response): The (preferably streamed) requests response to decode.
+        key (str): The top-level key holding the list of items, e.g. connectivity.
+
+    Yields:
+        any: The decoded items.
+
+    """
+    # A body that was already read (not streamed) can't be parsed from the raw socket.
+    streamed = not getattr(response, "_content_consumed", True)
+    if ijson is None or getattr(response, "raw", None) is None or not streamed:
+        yield from (decode_json(response) or {}).get(key, []) or []
+        return
+    response.raw.decode_content = True
+    try:
+        yield from ijson.items(response.raw, f"{key}.item", use_float=True)
+    finally:
+        response.close()
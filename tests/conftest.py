@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+"""Define the shared RISC test fixtures."""
+import pytest
+
+from risc.main import RISC
+from risc.transport import RetryPolicy
+
+from .fakes import FakeSession
+
+ENV_VARS = (
+    "RISC_API_ENDPOINT",
+    "RISC_API_HOST",
+    "RISC_API_VERSION",
+    "RISC_ASSESSMENT_FILTERS",
+    "RISC_CACHE_DIR",
+    "RISC_CACHE_MAX_ENTRIES",
+    "RISC_KEEP_ALIVE",
+    "RISC_LAZY",
+    "RISC_MAX_RETRIES",
+    "RISC_MAX_WORKERS",
+    "RISC_POOL_CONNECTIONS",
+    "RISC_POOL_MAXSIZE",
+    "RISC_RATE_LIMIT",
+    "RISC_SNAPSHOT_PATH",
+    "RISC_TOKEN_CACHE",
+)
+
+
+@pytest.fixture(autouse=True)
+def risc_env(monkeypatch, tmp_path):
+    """Isolate the tests from the RISC settings of the environment."""
+    for name in ENV_VARS:
+        monkeypatch.delenv(name, raising=False)
+    monkeypatch.setenv("RISC_ASSESSMENT_CODE", "test-assessment")
+    monkeypatch.setenv("HOME", str(tmp_path))
+
+
+@pytest.fixture
+def session() -> FakeSession:
+    """Get a fake RISC API session."""
+    return FakeSession()
+
+
+@pytest.fixture
+def client(session) -> RISC:
+    """Get a lazy RISC client using the fake session, without request retries."""
+    return RISC(
+        user_id="user",
+        password="password",
+        lazy=True,
+        session=session,
+        retry_policy=RetryPolicy(total=0),
+        max_workers=2,
+    )
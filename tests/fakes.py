@@ -0,0 +1,206 @@
+# -*- coding: utf-8 -*-
+"""Define the fake RISC API used by the tests.
+
+:class:`FakeSession` answers the endpoints used by the client from in-memory data, so no
+test makes a network request.
+
+"""
+import json
+from typing import Any, Dict, List, Optional, Set
+
+from requests.models import Response
+
+try:
+    import httpx
+except ImportError:  # pragma: no cover
+    httpx = None
+
+
+def make_response(data: Any, status_code: int = 200, url: str = "") -> Response:
+    """Build a requests response holding the provided JSON data."""
+    response = Response()
+    response.status_code = status_code
+    response.url = url
+    response._content = json.dumps(data).encode()
+    response._content_consumed = True
+    return response
+
+
+def make_stack(stack_id: int, members: int = 1) -> Dict[str, Any]:
+    """Build a stacks/getSummary entry."""
+    return {
+        "stackid": stack_id,
+        "stack_name": f"stack{stack_id}",
+        "num_stack_members": members,
+        "confirmed": "y",
+        "num_members_with_failed_checks": 0,
+    }
+
+
+def make_assessment(
+    code: str, company: str = "Acme", demo: bool = False
+) -> Dict[str, Any]:
+    """Build a getAssessments entry, optionally matching the demo assessment fields."""
+    assessment = {
+        "assessment_code": code,
+        "company_name": company,
+        "assessment_stage_name": "Active",
+    }
+    if demo:
+        assessment.update(
+            company_name="Customer Sandbox",
+            state="Kentucky",
+            zip="12345",
+            appliance_public_ip="unknown",
+        )
+    return assessment
+
+
+class FakeSession:
+    """Define the in-memory stand-in for the requests session used by RISC.
+
+    Args:
+        pages (int): The number of non-empty asset and connectivity pages per stack.
+        per_page (int): The number of records per page.
+
+    The ``statuses`` mapping queues failed response status codes for the URLs ending with
+    its keys, e.g. ``{"stacks/getSummary": [503]}``. Each token request issues a new token.
+    The ``search`` mapping holds the assets returned by ``assets/search`` for each term, and
+    ``device_types`` maps each device type of the asset summary to the stack whose devices
+    are listed for it, or 0 for devices outside of any stack. ``assessments`` holds the
+    entries returned by ``getAssessments``, and ``iaas/pricing`` quotes echo their payload.
+
+    """
+
+    def __init__(self, pages: int = 2, per_page: int = 2) -> None:
+        """Initialize the FakeSession class."""
+        self.headers: Dict[str, str] = {}
+        self.pages: int = pages
+        self.per_page: int = per_page
+        self.stacks: List[Dict[str, Any]] = [make_stack(i) for i in range(1, 4)]
+        self.costs: Dict[str, Dict[int, float]] = {}
+        self.summary_status: int = 200
+        self.failed_pages: Dict[int, int] = {}
+        self.failed_stacks: Set[int] = set()
+        self.calls: List[str] = []
+        self.requests: List[Dict[str, Any]] = []
+        self.statuses: Dict[str, List[int]] = {}
+        self.search: Dict[str, List[Dict[str, Any]]] = {}
+        self.device_types: Dict[str, int] = {}
+        self.assessments: List[Dict[str, Any]] = []
+        self.tokens: int = 0
+
+    def mount(self, prefix: str, adapter: Any) -> None:
+        """Ignore transport adapters, as no request reaches the network."""
+
+    def request(
+        self, method: str, url: str, headers: Optional[Dict[str, str]] = None, **kwargs
+    ) -> Response:
+        """Answer a RISC API request."""
+        self.calls.append(url)
+        headers = headers or {}
+        self.requests.append(
+            {"method": method, "url": url, "headers": dict(headers), **kwargs}
+        )
+        page = int(headers.get("page", 0) or 0)
+        for suffix, statuses in self.statuses.items():
+            if url.endswith(suffix) and statuses:
+                return make_response({}, status_code=statuses.pop(0), url=url)
+        if url.endswith("getAuthToken"):
+            self.tokens += 1
+            token = "token" if self.tokens == 1 else f"token{self.tokens}"
+            return make_response({"token": token}, url=url)
+        if url.endswith("getAssessments"):
+            return make_response({"assessments": self.assessments}, url=url)
+        if url.endswith("iaas/pricing"):
+            return make_response({"quote": kwargs.get("json")}, url=url)
+        if url.endswith("stacks/getSummary"):
+            return make_response(
+                {"assets": self.stacks}, status_code=self.summary_status, url=url
+            )
+        if "stacks/getSummaryWithCost/" in url:
+            provider = url.rsplit("/", 1)[1]
+            if provider not in self.costs:
+                return make_response({}, status_code=404, url=url)
+            return make_response(
+                {
+                    "assets": [
+                        dict(make_stack(stack_id), total_cost=cost)
+                        for stack_id, cost in self.costs[provider].items()
+                    ]
+                },
+                url=url,
+            )
+        if url.endswith("assets/getSummary"):
+            summary = [{"type": device_type} for device_type in self.device_types]
+            return make_response({"assets": summary}, url=url)
+        if "assets/search/" in url:
+            term = url.rsplit("/", 1)[1]
+            return make_response({"assets": self.search.get(term, [])}, url=url)
+        if page in self.failed_pages:
+            return make_response({}, status_code=self.failed_pages[page], url=url)
+
+        last = url.rstrip("/").rsplit("/", 1)[1]
+        stack_id = int(last) if last.isdigit() else self.device_types.get(last, 0)
+        if stack_id in self.failed_stacks:
+            return make_response({}, status_code=403, url=url)
+        if "Connectivity" in url:
+            key = "connectivity"
+            rows = [
+                {
+                    "src_ip": f"10.{stack_id}.{page}.{index}",
+                    "dest_ip": "10.0.0.1",
+                    "dest_port": 443,
+                    "total_bytes": 100,
+                    "avg_rtt": 1.5,
+                }
+                for index in range(self.per_page)
+            ]
+        else:
+            key = "assets"
+            rows = [
+                {
+                    "deviceid": stack_id * 100 + page * 10 + index,
+                    "data": {
+                        "hostname": f"host{stack_id}{page}{index}",
+                        "identifying_ip": f"10.{stack_id}.{page}.{index}",
+                    },
+                }
+                for index in range(self.per_page)
+            ]
+        return make_response({key: rows if page <= self.pages else []}, url=url)
+
+    def get(self, url: str, **kwargs) -> Response:
+        """Send a GET request."""
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url: str, **kwargs) -> Response:
+        """Send a POST request."""
+        return self.request("POST", url, **kwargs)
+
+
+def mock_transport(session: FakeSession, errors: int = 0) -> Any:
+    """Build an httpx mock transport answering AsyncRISC requests from a fake session.
+
+    Args:
+        session (FakeSession): The fake session answering the requests.
+        errors (int): The number of requests failing with a connection error first.
+
+    """
+    failures = [errors]
+
+    def handle(request: Any) -> Any:
+        if failures[0]:
+            failures[0] -= 1
+            raise httpx.ConnectError("Connection refused", request=request)
+        kwargs: Dict[str, Any] = {"headers": dict(request.headers)}
+        if request.content:
+            kwargs["json"] = json.loads(request.content)
+        response = session.request(request.method, str(request.url), **kwargs)
+        return httpx.Response(
+            response.status_code,
+            headers=dict(response.headers),
+            content=response.content,
+        )
+
+    return httpx.MockTransport(handle)
@@ -0,0 +1,198 @@
+# -*- coding: utf-8 -*-
+"""Test the RISC asyncio client."""
+import asyncio
+
+import pytest
+
+from risc import RiscPageError
+from risc.cache import ResponseCache, TokenCache
+from risc.transport import RetryPolicy
+
+from .fakes import mock_transport
+
+httpx = pytest.importorskip("httpx")
+
+from risc.aio import AsyncRISC  # noqa: E402 isort:skip
+
+
+def make_client(session, errors=0, **kwargs):
+    """Get an AsyncRISC client answered by the fake session."""
+    kwargs.setdefault("retry_policy", RetryPolicy(total=2, backoff_factor=0))
+    return AsyncRISC(
+        user_id="user",
+        password="password",
+        client=httpx.AsyncClient(transport=mock_transport(session, errors=errors)),
+        **kwargs,
+    )
+
+
+def run(session, scenario, **kwargs):
+    """Run the scenario coroutine against a connected client and return its result."""
+
+    async def main():
+        async with make_client(session, **kwargs) as client:
+            return await scenario(client)
+
+    return asyncio.run(main())
+
+
+def auth_calls(session):
+    """Get the number of token requests sent."""
+    return len([url for url in session.calls if url.endswith("getAuthToken")])
+
+
+def test_connect(session):
+    """Test that connecting authenticates and indexes the stacks."""
+
+    async def scenario(client):
+        return client.token, sorted(client.stacks.by_id)
+
+    assert run(session, scenario) == ("token", [1, 2, 3])
+    auth, summary = session.requests
+    assert "token" not in auth["headers"]
+    assert auth["json"]["assessmentcode"] == "test-assessment"
+    assert summary["headers"]["token"] == "token"
+
+
+@pytest.mark.parametrize("prefetch", [False, True])
+def test_iter_assets(session, prefetch):
+    """Test that every asset page is yielded until the first empty page."""
+
+    async def scenario(client):
+        return [
+            asset async for asset in client.iter_assets(stack_id=1, prefetch=prefetch)
+        ]
+
+    assets = run(session, scenario)
+    assert len(assets) == session.pages * session.per_page
+
+
+def test_iter_assets_page_error(session):
+    """Test that a failed page raises rather than silently truncating the assets."""
+    session.failed_pages[2] = 403
+
+    async def scenario(client):
+        return [asset async for asset in client.iter_assets(stack_id=1)]
+
+    with pytest.raises(RiscPageError):
+        run(session, scenario)
+
+
+def test_assets_get_assets_no_filter(session):
+    """Test that a missing filter is logged and returns an empty response, like RISC."""
+
+    async def scenario(client):
+        return await client.assets_get_assets()
+
+    assert run(session, scenario).status_code is None
+    assert not [url for url in session.calls if "getAssets" in url]
+
+
+def test_retry_status(session):
+    """Test that server errors are retried until the request succeeds."""
+    session.statuses["assets/getSummary"] = [503, 502]
+
+    async def scenario(client):
+        return (await client.assets_get_summary()).status_code
+
+    assert run(session, scenario) == 200
+    assert len([url for url in session.calls if "assets/getSummary" in url]) == 3
+
+
+def test_retry_exhausted(session):
+    """Test that the last failed response is returned once the retries run out."""
+    session.statuses["assets/getSummary"] = [503, 503, 503]
+
+    async def scenario(client):
+        return (await client.assets_get_summary()).status_code
+
+    assert run(session, scenario) == 503
+
+
+def test_retry_connection_error(session):
+    """Test that connection errors are retried for the methods of the retry policy."""
+    policy = RetryPolicy(total=2, backoff_factor=0, methods=("GET", "POST"))
+
+    async def scenario(client):
+        return client.token
+
+    assert run(session, scenario, errors=2, retry_policy=policy) == "token"
+
+
+def test_connection_error_not_retried(session):
+    """Test that a connection error of a method outside the retry policy is raised."""
+
+    async def scenario(client):
+        return client.token
+
+    with pytest.raises(httpx.ConnectError):
+        run(session, scenario, errors=1)
+
+
+def test_reauthenticate(session):
+    """Test that a rejected token is replaced and the request is sent again."""
+
+    async def scenario(client):
+        session.statuses["assets/getSummary"] = [401]
+        response = await client.assets_get_summary()
+        return response.status_code, client.token
+
+    assert run(session, scenario) == (200, "token2")
+    assert auth_calls(session) == 2
+    assert session.requests[-1]["headers"]["token"] == "token2"
+
+
+def test_token_cache(session, tmp_path):
+    """Test that a cached token is shared by clients instead of authenticating again."""
+    cache = TokenCache(path=str(tmp_path / "tokens.json"))
+
+    async def scenario(client):
+        return client.token
+
+    assert run(session, scenario, token_cache=cache) == "token"
+    assert run(session, scenario, token_cache=cache) == "token"
+    assert auth_calls(session) == 1
+
+
+def test_response_cache(session):
+    """Test that cacheable GET requests are only sent once."""
+
+    async def scenario(client):
+        first = await client.assets_get_summary()
+        second = await client.assets_get_summary()
+        await client.assets_get_summary(use_cache=False)
+        return first is second
+
+    assert run(session, scenario, response_cache=ResponseCache())
+    assert len([url for url in session.calls if "assets/getSummary" in url]) == 2
+
+
+@pytest.mark.parametrize("ordered", [True, False])
+def test_map_concurrent_bounded(session, ordered):
+    """Test that no more than the worker count of tasks exist, even for a lazy iterable."""
+    state = {"running": 0, "peak": 0, "consumed": 0}
+
+    def items():
+        for index in range(10):
+            state["consumed"] += 1
+            yield index
+
+    async def call(item):
+        state["running"] += 1
+        state["peak"] = max(state["peak"], state["running"])
+        await asyncio.sleep(0.001 * (item % 3))
+        state["running"] -= 1
+        return item * 2
+
+    async def scenario(client):
+        results = client.map_concurrent(call, items(), ordered=ordered, workers=3)
+        first = await results.__anext__()
+        consumed = state["consumed"]
+        return [first] + [result async for result in results], consumed
+
+    results, consumed = run(session, scenario)
+    assert consumed <= 4
+    assert state["peak"] <= 3
+    assert sorted(results) == [(index, index * 2) for index in range(10)]
+    if ordered:
+        assert results == sorted(results)
@@ -0,0 +1,104 @@
+# -*- coding: utf-8 -*-
+"""Test the RISC assessment selection."""
+import time
+
+import pytest
+
+from risc import RiscAssessmentsError
+from risc.models import RiscAssessments
+
+from .fakes import make_assessment
+
+
+@pytest.fixture
+def assessments(session):
+    """Get the fake assessments available to the user."""
+    session.assessments = [
+        make_assessment("demo", demo=True),
+        make_assessment("acme-1"),
+        dict(make_assessment("acme-2"), assessment_stage_name="Closed", city="Paris"),
+        make_assessment("other-1", company="Other"),
+    ]
+    return RiscAssessments(assessments=session.assessments)
+
+
+def codes(items):
+    """Get the assessment codes of the provided assessments."""
+    return [item.assessment_code for item in items]
+
+
+def test_filter(assessments):
+    """Test that indexed and other fields are matched ignoring case."""
+    assert codes(assessments.filter(company_name="ACME")) == ["acme-1", "acme-2"]
+    assert codes(
+        assessments.filter(company_name="acme", assessment_stage_name="closed")
+    ) == ["acme-2"]
+    assert codes(assessments.filter(company_name="Acme", city="PARIS")) == ["acme-2"]
+    assert codes(assessments.filter(company_name="missing")) == []
+    assert assessments.filter(company="Acme") == []
+    assert assessments.get_by_code("ACME-1").assessment_code == "acme-1"
+    assert assessments.get_by_code("missing") is None
+
+
+def test_select_demo(assessments):
+    """Test that demo assessments are only selected by their assessment code."""
+    assert assessments.select(company_name="Customer Sandbox").assessment_code == ""
+    assert assessments.select(assessment_code="demo").is_demo
+    assert assessments.select(assessment_stage_name="active").assessment_code == (
+        "acme-1"
+    )
+
+
+def test_get_assessment(client, session, assessments):
+    """Test that the assessment list is fetched once and filtered locally."""
+    assert client.get_assessment(company_name="other").assessment_code == "other-1"
+    assert client.get_assessment(assessment_code="acme-2").city == "Paris"
+    assert [url for url in session.calls if url.endswith("getAssessments")] == [
+        session.calls[0]
+    ]
+
+
+def test_assessment_filters(client, assessments):
+    """Test that the configured assessment filters apply when no filter is provided."""
+    client.assessment_filters = {"company_name": "Acme", "city": "paris"}
+    assert client.get_assessment().assessment_code == "acme-2"
+
+
+def test_across_assessments(client, session, assessments):
+    """Test that every non-demo assessment is queried with its own client."""
+    results = client.across_assessments(lambda risc: risc.assessment_code.upper())
+    assert results == {"acme-1": "ACME-1", "acme-2": "ACME-2", "other-1": "OTHER-1"}
+
+
+def test_across_assessments_errors(client, session, assessments):
+    """Test that failed queries are raised together, keyed by assessment code."""
+
+    def query(risc):
+        if risc.assessment.company_name == "Acme":
+            raise KeyError(risc.assessment_code)
+        return risc.assessment_code
+
+    with pytest.raises(RiscAssessmentsError) as error:
+        client.across_assessments(query, workers=3)
+    assert sorted(error.value.errors) == ["acme-1", "acme-2"]
+    assert isinstance(error.value.errors["acme-1"], KeyError)
+    assert error.value.results == {"other-1": "other-1"}
+
+
+def test_across_assessment_codes(client, session, assessments, monkeypatch):
+    """Test that concurrent workers share a single fetch of the assessment list."""
+    request = session.request
+
+    def slow_request(method, url, **kwargs):
+        if url.endswith("getAssessments"):
+            time.sleep(0.05)
+        return request(method, url, **kwargs)
+
+    monkeypatch.setattr(session, "request", slow_request)
+    results = client.across_assessments(
+        lambda risc: risc.assessment.city,
+        assessment_codes="acme-1,acme-2,other-1",
+        workers=3,
+    )
+    assert results == {"acme-1": "", "acme-2": "Paris", "other-1": ""}
+    assert len([url for url in session.calls if url.endswith("getAssessments")]) == 1
@@ -0,0 +1,62 @@
+# -*- coding: utf-8 -*-
+"""Test the RISC authentication and request headers."""
+from risc.main import RISC
+
+
+def test_auth_token_request(client, session):
+    """Test that the token request carries the credentials but no session state."""
+    client.assets_get_summary()
+    auth, summary = session.requests
+    assert auth["url"].endswith("getAuthToken")
+    assert auth["json"]["userid"] == "user"
+    assert auth["json"]["assessmentcode"] == "test-assessment"
+    assert "token" not in auth["headers"]
+    assert summary["headers"]["token"] == "token"
+    assert summary["headers"]["assessmentcode"] == "test-assessment"
+
+
+def test_headers_per_request(client, session):
+    """Test that auth and page headers are sent per request, never set on the session."""
+    list(client.iter_assets(stack_id=1))
+    client.stacks_get_listeners(stack_id=1)
+    assert session.headers == {}
+    pages = [request["headers"].get("page") for request in session.requests[1:]]
+    assert pages == ["1", "2", "3", None]
+    assert all(request["headers"]["token"] for request in session.requests[1:])
+
+
+def test_lazy_client_sends_no_request(client, session):
+    """Test that a lazy client defers authentication and the stack data fetch."""
+    assert session.calls == []
+    assert [stack["stackid"] for stack in client.stack_data["assets"]] == [1, 2, 3]
+    assert [url.rsplit("/", 1)[1] for url in session.calls] == [
+        "getAuthToken",
+        "getSummary",
+    ]
+    assert client.stacks.get_by_id(1).stack_name == "stack1"
+    assert len(session.calls) == 2
+
+
+def test_lazy_env(monkeypatch, session):
+    """Test that RISC_LAZY enables lazy initialization."""
+    monkeypatch.setenv("RISC_LAZY", "true")
+    RISC(user_id="user", password="password", session=session)
+    assert session.calls == []
+
+
+def test_eager_client(session):
+    """Test that an eager client authenticates and fetches the stack data on init."""
+    client = RISC(user_id="user", password="password", session=session)
+    assert client.token == "token"
+    assert len(client.stack_data["assets"]) == 3
+    assert len(session.calls) == 2
+
+
+def test_failed_auth_retried(client, session):
+    """Test that a failed token request is retried by the next authenticated call."""
+    session.statuses["getAuthToken"] = [500]
+    client.assets_get_summary()
+    assert client.token == ""
+    client.stacks_get_listeners(stack_id=1)
+    assert client.token == "token"
+    assert session.requests[-1]["headers"]["token"] == "token"
@@ -0,0 +1,253 @@
+# -*- coding: utf-8 -*-
+"""Test the RISC token, response and stack cost comparison caches."""
+import json
+import os
+import time
+
+import pytest
+
+from risc.cache import DiskCacheBackend, ResponseCache, TokenCache
+from risc.costs import StackCostComparison
+
+from .fakes import make_response
+
+
+def test_token_cache(tmp_path):
+    """Test that tokens are keyed by user and assessment and expire after the TTL."""
+    path = str(tmp_path / "tokens.json")
+    TokenCache(path=path).set("user", "assessment", "token")
+    cache = TokenCache(path=path)
+    assert cache.get("user", "assessment") == "token"
+    assert cache.get("user", "other") == ""
+    assert TokenCache(path=path, ttl=-1).get("user", "missing") == ""
+
+    with open(path) as cache_file:
+        entries = json.load(cache_file)
+    for entry in entries.values():
+        entry["expires"] -= 6000
+    with open(path, "w") as cache_file:
+        json.dump(entries, cache_file)
+    assert cache.get("user", "assessment") == ""
+
+
+def test_token_cache_invalidate_stale(tmp_path):
+    """Test that a token refreshed by another process is not invalidated."""
+    cache = TokenCache(path=str(tmp_path / "tokens.json"))
+    cache.set("user", "assessment", "fresh")
+    cache.invalidate("user", "assessment", stale_token="stale")
+    assert cache.get("user", "assessment") == "fresh"
+    cache.invalidate("user", "assessment", stale_token="fresh")
+    assert cache.get("user", "assessment") == ""
+
+
+def test_client_token_cache(client, session, tmp_path):
+    """Test that a cached token is used instead of authenticating again."""
+    client.token_cache = TokenCache(path=str(tmp_path / "tokens.json"))
+    client.token_cache.set("user", "test-assessment", "cached")
+    client.assets_get_summary()
+    assert session.calls[0].endswith("assets/getSummary")
+    assert session.requests[0]["headers"]["token"] == "cached"
+
+
+def test_client_reauthenticate(client, session, tmp_path):
+    """Test that a rejected token is replaced in the cache and the request is resent."""
+    client.token_cache = TokenCache(path=str(tmp_path / "tokens.json"))
+    client.token_cache.set("user", "test-assessment", "expired")
+    session.statuses["assets/getSummary"] = [401]
+    assert client.assets_get_summary().status_code == 200
+    assert client.token == "token"
+    assert client.token_cache.get("user", "test-assessment") == "token"
+    assert [request["headers"].get("token") for request in session.requests] == [
+        "expired",
+        None,
+        "token",
+    ]
+
+
+def test_response_cache_lru():
+    """Test that the least recently used entries are evicted first."""
+    cache = ResponseCache(maxsize=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert (cache.get("a"), cache.get("c")) == (1, 3)
+    assert cache.stats == {"hits": 3, "misses": 1, "size": 2}
+
+
+def test_response_cache_ttl():
+    """Test that entries expire after the TTL of their endpoint."""
+    cache = ResponseCache(default_ttl=60, ttls={"stacks/getSummary": 0})
+    cache.set("GET:https://api/stacks/getSummary", 1)
+    cache.set("GET:https://api/assets/getSummary", 2)
+    assert cache.ttl_for("GET:https://api/iaas/getProviders") == 60
+    assert cache.get("GET:https://api/stacks/getSummary") is None
+    assert cache.get("GET:https://api/assets/getSummary") == 2
+
+
+def test_response_cache_disk_backend(tmp_path):
+    """Test that entries written through to disk are shared across caches."""
+    ResponseCache(backend=DiskCacheBackend(str(tmp_path))).set("key", {"value": 1})
+    cache = ResponseCache(backend=DiskCacheBackend(str(tmp_path)))
+    assert cache.get("key") == {"value": 1}
+    cache.invalidate("key")
+    assert ResponseCache(backend=DiskCacheBackend(str(tmp_path))).get("key") is None
+
+
+def test_disk_backend_response(tmp_path):
+    """Test that responses are stored as JSON and restored with their body and headers."""
+    backend = DiskCacheBackend(str(tmp_path))
+    response = make_response({"assets": [1]}, url="https://api/assets/getSummary")
+    response.headers["Content-Type"] = "application/json"
+    backend.set("key", (time.time() + 60, response))
+
+    with open(backend._entry_path("key"), "rb") as entry_file:
+        data = json.loads(entry_file.read())
+    assert data["value"]["type"] == "requests"
+
+    _, cached = backend.get("key")
+    assert cached.status_code == 200
+    assert cached.json() == {"assets": [1]}
+    assert cached.headers["content-type"] == "application/json"
+    assert cached.url == "https://api/assets/getSummary"
+
+
+def test_disk_backend_httpx_response(tmp_path):
+    """Test that httpx responses are restored as httpx responses."""
+    httpx = pytest.importorskip("httpx")
+    backend = DiskCacheBackend(str(tmp_path))
+    request = httpx.Request("GET", "https://api/iaas/getProviders")
+    response = httpx.Response(200, json={"providers": []}, request=request)
+    backend.set("key", (time.time() + 60, response))
+    _, cached = backend.get("key")
+    assert isinstance(cached, httpx.Response)
+    assert cached.json() == {"providers": []}
+    assert str(cached.url) == "https://api/iaas/getProviders"
+
+
+def test_disk_backend_expired(tmp_path):
+    """Test that expired and unreadable entries are removed when read."""
+    backend = DiskCacheBackend(str(tmp_path))
+    backend.set("expired", (time.time() - 1, 1))
+    assert backend.get("expired") is None
+    with open(backend._entry_path("corrupt"), "wb") as entry_file:
+        entry_file.write(b"not json")
+    assert backend.get("corrupt") is None
+    assert os.listdir(str(tmp_path)) == []
+
+
+def test_disk_backend_max_entries(tmp_path):
+    """Test that the least recently used entries are removed beyond the maximum count."""
+    backend = DiskCacheBackend(str(tmp_path), max_entries=2)
+    expires = time.time() + 60
+    for age, key in enumerate(["a", "b"]):
+        backend.set(key, (expires, key))
+        os.utime(backend._entry_path(key), (expires - 100 + age, expires - 100 + age))
+    backend.get("a")
+    backend.set("c", (expires, "c"))
+    assert len(os.listdir(str(tmp_path))) == 2
+    assert backend.get("b") is None
+    assert backend.get("a") == (expires, "a")
+
+
+def test_request_cache(client, session):
+    """Test that cacheable GET requests are only sent once."""
+    client.response_cache = ResponseCache()
+    first = client.stacks_get_summary()
+    second = client.stacks_get_summary()
+    assert first is second
+    assert len([url for url in session.calls if url.endswith("getSummary")]) == 1
+    client.stacks_get_summary(use_cache=False)
+    assert len([url for url in session.calls if url.endswith("getSummary")]) == 2
+
+
+@pytest.fixture
+def cost_session(session):
+    """Get a fake session pricing the stacks on two providers."""
+    session.costs = {"aws": {1: 10.0, 2: 30.0}, "azure": {1: 20.0, 2: 15.0}}
+    return session
+
+
+def cost_calls(session):
+    """Get the number of stack cost requests sent."""
+    return len([url for url in session.calls if "getSummaryWithCost" in url])
+
+
+def test_compare_stack_costs(client, cost_session):
+    """Test that the provider costs are joined on the stack ID."""
+    comparison = client.compare_stack_costs(provider_ids="aws,azure")
+    assert comparison.providers == ["aws", "azure"]
+    assert comparison.cheapest() == {
+        1: {"provider": "aws", "cost": 10.0},
+        2: {"provider": "azure", "cost": 15.0},
+    }
+    assert comparison.totals()["optimal"] == 25.0
+
+
+def test_compare_stack_costs_response_cache(client, cost_session):
+    """Test that a complete comparison is served from the response cache."""
+    client.response_cache = ResponseCache()
+    client.compare_stack_costs(provider_ids=["aws", "azure"])
+    calls = cost_calls(cost_session)
+    comparison = client.compare_stack_costs(provider_ids="azure, aws")
+    assert cost_calls(cost_session) == calls
+    assert sorted(comparison.providers) == ["aws", "azure"]
+    client.compare_stack_costs(provider_ids="aws,azure", use_cache=False)
+    assert cost_calls(cost_session) == calls * 2
+
+
+def test_compare_stack_costs_partial(client, cost_session, tmp_path):
+    """Test that a comparison missing a provider is returned but never cached."""
+    client.response_cache = ResponseCache()
+    cache_path = str(tmp_path / "costs.json")
+    comparison = client.compare_stack_costs(
+        provider_ids="aws,gcp", cache_path=cache_path
+    )
+    assert comparison.totals()["providers"]["aws"] == 40.0
+    assert not (tmp_path / "costs.json").exists()
+    assert client.response_cache.size == 0
+
+
+def test_compare_stack_costs_cache_path(client, cost_session, tmp_path):
+    """Test that the comparison file is reused for the same query until it expires."""
+    cache_path = str(tmp_path / "costs.json")
+    client.compare_stack_costs(provider_ids="aws,azure", cache_path=cache_path)
+    calls = cost_calls(cost_session)
+
+    client.compare_stack_costs(provider_ids="aws,azure", cache_path=cache_path)
+    assert cost_calls(cost_session) == calls
+
+    client.compare_stack_costs(provider_ids="aws", cache_path=cache_path)
+    assert cost_calls(cost_session) == calls + 1
+
+    with open(cache_path) as cache_file:
+        data = json.load(cache_file)
+    data["saved_at"] -= 7200
+    with open(cache_path, "w") as cache_file:
+        json.dump(data, cache_file)
+    client.compare_stack_costs(provider_ids="aws", cache_path=cache_path)
+    assert cost_calls(cost_session) == calls + 2
+
+
+def test_stack_cost_comparison_load(tmp_path):
+    """Test that a saved comparison is only loaded for its key and while fresh."""
+    path = str(tmp_path / "costs.json")
+    comparison = StackCostComparison(providers=["aws"])
+    comparison.add_provider("aws", [{"stackid": 1, "total_cost": 5}])
+    comparison.save(path, key="aws")
+    assert StackCostComparison.load(path, max_age=60, key="aws").to_dict() == (
+        comparison.to_dict()
+    )
+    assert StackCostComparison.load(path, key="azure") is None
+    assert StackCostComparison.load(str(tmp_path / "missing.json")) is None
+
+
+def test_compare_stack_costs_out(client, cost_session, tmp_path):
+    """Test that the per-stack table is exported in the requested output format."""
+    out = tmp_path / "costs.ndjson"
+    client.compare_stack_costs(
+        provider_ids="aws,azure", out=str(out), output_format="ndjson"
+    )
+    rows = [json.loads(line) for line in out.read_text().splitlines()]
+    assert [row["stackid"] for row in rows] == [1, 2]
@@ -0,0 +1,89 @@
+# -*- coding: utf-8 -*-
+"""Test the handling of RISC command line arguments."""
+import fire
+import pytest
+
+
+def run(client, *args):
+    """Run the RISC CLI against the provided client."""
+    return fire.Fire(client, command=list(args))
+
+
+@pytest.mark.parametrize(
+    "value,expected", [("3", [3]), ("1,2", [1, 2]), ("'1, 2'", [1, 2])]
+)
+def test_assets_get_assets_bulk_stack_ids(client, session, value, expected):
+    """Test that a single stack ID and comma separated stack IDs are accepted."""
+    run(client, "assets_get_assets_bulk", "--stack_ids", value)
+    stacks = [url.rsplit("/", 1)[1] for url in session.calls if "byStack" in url]
+    assert [int(stack_id) for stack_id in stacks] == expected
+
+
+def test_device_connectivity_columns(client, session):
+    """Test that comma separated stack IDs are fetched once each."""
+    columns = run(client, "device_connectivity_columns", "--stack_ids", "1,3")
+    assert len(columns) == 2 * session.pages * session.per_page
+    stacks = {url.rsplit("/", 1)[1] for url in session.calls if "Connectivity" in url}
+    assert stacks == {"1", "3"}
+
+
+def test_connectivity_graph(client, session):
+    """Test that the graph stack IDs and connectivity types accept a single value."""
+    run(
+        client,
+        "connectivity_graph",
+        "--stack_ids",
+        "2",
+        "--connectivity_types",
+        "internal",
+    )
+    connectivity = [url for url in session.calls if "Connectivity" in url]
+    assert connectivity
+    assert all("Internal" in url and url.endswith("/2") for url in connectivity)
+
+
+def test_get_device_stacks(client, session):
+    """Test that the devices of comma separated stack IDs are mapped to their stacks."""
+    device_stacks = run(client, "get_device_stacks", "--stack_ids", "1,2")
+    assert len(device_stacks) == 2 * session.pages * session.per_page
+    assert device_stacks["110"] == [1]
+    assert device_stacks["211"] == [2]
+    stacks = {url.rsplit("/", 1)[1] for url in session.calls if "byStack" in url}
+    assert stacks == {"1", "2"}
+
+
+@pytest.mark.parametrize(
+    "value,expected",
+    [
+        ("aws", ["aws"]),
+        ("aws,azure", ["aws", "azure"]),
+        ("'aws, azure'", ["aws", "azure"]),
+    ],
+)
+def test_compare_stack_costs_providers(client, session, value, expected):
+    """Test that a single provider isn't split into characters, and lists are kept."""
+    session.costs = {"aws": {1: 10.0}, "azure": {1: 20.0}}
+    comparison = run(client, "compare_stack_costs", "--provider_ids", value)
+    assert comparison.providers == expected
+    assert [url.rsplit("/", 1)[1] for url in session.calls if "Cost" in url] == (
+        expected
+    )
+
+
+def test_export_output_format(client, session, tmp_path):
+    """Test that the export output format is passed as output_format."""
+    out = tmp_path / "assets.csv"
+    summary = run(
+        client,
+        "export",
+        "assets",
+        "--stack_id",
+        "1",
+        "--output_format",
+        "csv",
+        "--out",
+        str(out),
+    )
+    assert summary["format"] == "csv"
+    assert summary["rows"] == session.pages * session.per_page
+    assert out.read_text().splitlines()[0].startswith("deviceid")
@@ -0,0 +1,72 @@
+# -*- coding: utf-8 -*-
+"""Test the RISC columnar connectivity container."""
+import pytest
+
+from risc import columnar
+from risc.columnar import ConnectivityColumns
+
+ROWS = [
+    {"src_ip": "10.0.0.1", "dest_ip": "10.0.0.9", "dest_port": 443, "total_bytes": 10},
+    {"src_ip": "10.0.0.2", "dest_ip": "10.0.0.9", "dest_port": 80, "total_bytes": 5},
+    {"src_ip": "10.0.0.1", "dest_ip": "10.0.0.8", "dest_port": 443, "total_bytes": 30},
+    {"src_ip": None, "dest_ip": "10.0.0.8", "dest_port": "x", "total_bytes": None},
+]
+
+
+@pytest.fixture(params=["numpy", "array"])
+def backend(request, monkeypatch):
+    """Run the test with NumPy and with the stdlib array fallback."""
+    if request.param == "numpy":
+        pytest.importorskip("numpy")
+    else:
+        monkeypatch.setattr(columnar, "np", None)
+    return request.param
+
+
+def test_from_rows(backend):
+    """Test that rows are stored by column, with missing and invalid values defaulted."""
+    columns = ConnectivityColumns.from_rows(ROWS)
+    assert len(columns) == 4
+    assert columns.values("src_ip") == ["10.0.0.1", "10.0.0.2", "10.0.0.1", ""]
+    assert columns.values("dest_port") == [443, 80, 443, 0]
+    assert columns.values("avg_rtt") == [0.0] * 4
+    assert columns.data["src_ip"].values == ["10.0.0.1", "10.0.0.2", ""]
+
+
+def test_unknown_columns():
+    """Test that columns missing from the connectivity model are rejected."""
+    with pytest.raises(ValueError):
+        ConnectivityColumns(columns=["src_ip", "flows"])
+
+
+def test_where(backend):
+    """Test that rows are filtered on single and multiple accepted values."""
+    columns = ConnectivityColumns.from_rows(ROWS)
+    selected = columns.where(dest_port=443, src_ip=["10.0.0.1", "10.0.0.3"])
+    assert len(selected) == 2
+    assert selected.values("dest_ip") == ["10.0.0.9", "10.0.0.8"]
+    assert len(columns.where(dest_ip="10.0.0.7")) == 0
+    assert len(columns.where()) == 4
+
+
+def test_aggregates(backend):
+    """Test the column totals, grouped totals sorted by descending total."""
+    columns = ConnectivityColumns.from_rows(ROWS)
+    assert columns.sum("total_bytes") == 45
+    assert columns.group_sum("dest_ip", "total_bytes") == {
+        "10.0.0.8": 30,
+        "10.0.0.9": 15,
+    }
+    assert columns.group_sum("dest_port", "total_bytes") == {443: 40, 80: 5, 0: 0}
+    assert ConnectivityColumns().sum("total_bytes") == 0
+
+
+def test_client_columns(client, session):
+    """Test that the connectivity of every stack is appended to one container."""
+    columns = client.device_connectivity_columns(
+        stack_ids="1,3", columns=["src_ip", "total_bytes"]
+    )
+    assert len(columns) == 2 * session.pages * session.per_page
+    assert list(columns.types) == ["src_ip", "total_bytes"]
+    stacks = {url.rsplit("/", 1)[1] for url in session.calls if "Connectivity" in url}
+    assert stacks == {"1", "3"}
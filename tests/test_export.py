@@ -0,0 +1,148 @@
+# -*- coding: utf-8 -*-
+"""Test the RISC streaming exports."""
+import csv
+import gzip
+import io
+import json
+
+import pytest
+
+from risc.export import export_rows, write_csv
+
+ROWS = [
+    {"deviceid": 1, "data": {"hostname": "web01"}},
+    {"deviceid": 2, "data": {"hostname": "db01", "os": "linux"}, "tags": ["a"]},
+    {"deviceid": "3", "total_bytes": 1.5},
+]
+
+
+def read_csv(output):
+    """Read back the header and rows of a CSV export."""
+    output.seek(0)
+    reader = csv.DictReader(output)
+    return reader.fieldnames, list(reader)
+
+
+def test_write_csv_inferred_header():
+    """Test that the CSV header holds the columns of the first rows, in order of appearance."""
+    output = io.StringIO()
+    assert write_csv(ROWS, output) == 3
+    header, rows = read_csv(output)
+    assert header == ["deviceid", "data.hostname", "data.os", "tags", "total_bytes"]
+    assert rows[1]["data.os"] == "linux"
+    assert rows[1]["tags"] == json.dumps(["a"])
+    assert rows[2]["total_bytes"] == "1.5"
+
+
+def test_write_csv_infer_rows(caplog):
+    """Test that keys first seen after the inferred rows are dropped with a warning."""
+    output = io.StringIO()
+    assert write_csv(ROWS, output, infer_rows=1) == 3
+    header, rows = read_csv(output)
+    assert header == ["deviceid", "data.hostname"]
+    assert [row["data.hostname"] for row in rows] == ["web01", "db01", ""]
+    warnings = [record for record in caplog.records if "Dropping" in record.message]
+    assert len(warnings) == 2
+
+
+def test_write_csv_lazy():
+    """Test that rows past the inferred rows are consumed as they are written."""
+    consumed = []
+
+    def rows():
+        for index in range(10):
+            consumed.append(index)
+            yield {"deviceid": index}
+
+    class Output(io.StringIO):
+        def write(self, value):
+            lines.append(len(consumed))
+            return super().write(value)
+
+    lines = []
+    write_csv(rows(), Output(), infer_rows=2)
+    assert lines[0] == 2
+    assert lines[-1] == 10
+
+
+def test_write_csv_columns():
+    """Test that the provided columns are kept and other keys are dropped."""
+    output = io.StringIO()
+    assert write_csv(ROWS, output, columns=["deviceid", "data.hostname"]) == 3
+    assert output.getvalue().splitlines() == [
+        "deviceid,data.hostname",
+        "1,web01",
+        "2,db01",
+        "3,",
+    ]
+
+
+def test_write_csv_empty():
+    """Test that an export without rows writes nothing."""
+    output = io.StringIO()
+    assert write_csv([], output) == 0
+    assert output.getvalue() == ""
+
+
+def test_export_ndjson(tmp_path):
+    """Test that ndjson exports are written and compressed from the path suffix."""
+    path = str(tmp_path / "rows.ndjson.gz")
+    summary = export_rows(ROWS, out=path)
+    assert (summary["rows"], summary["compression"]) == (3, "gzip")
+    with gzip.open(path, "rt") as export_file:
+        assert [json.loads(line) for line in export_file] == ROWS
+
+
+def test_export_invalid_format():
+    """Test that unknown formats are rejected."""
+    with pytest.raises(ValueError):
+        export_rows(ROWS, out="-", output_format="xml")
+
+
+def test_export_parquet_stdout():
+    """Test that Parquet exports can't be written to stdout."""
+    with pytest.raises(ValueError):
+        export_rows(ROWS, out="-", output_format="parquet")
+
+
+def test_export_parquet_schema(tmp_path):
+    """Test that Parquet column types are inferred from the first rows."""
+    pq = pytest.importorskip("pyarrow.parquet")
+    path = str(tmp_path / "rows.parquet")
+    summary = export_rows(ROWS, out=path, output_format="parquet", batch_size=1)
+    assert summary["rows"] == 3
+    table = pq.read_table(path)
+    assert table.column_names == [
+        "deviceid",
+        "data.hostname",
+        "data.os",
+        "tags",
+        "total_bytes",
+    ]
+    assert str(table.schema.field("deviceid").type) == "string"
+    assert str(table.schema.field("total_bytes").type) == "double"
+    assert table.column("deviceid").to_pylist() == ["1", "2", "3"]
+
+
+def test_export_parquet_infer_rows(tmp_path):
+    """Test that later keys are dropped and mismatched values are written as null."""
+    pq = pytest.importorskip("pyarrow.parquet")
+    path = str(tmp_path / "rows.parquet")
+    rows = [{"deviceid": 1, "port": 80}, {"deviceid": 2, "port": "any", "os": "linux"}]
+    summary = export_rows(rows, out=path, output_format="parquet", infer_rows=1)
+    assert summary["rows"] == 2
+    table = pq.read_table(path)
+    assert table.column_names == ["deviceid", "port"]
+    assert table.column("port").to_pylist() == [80, None]
+
+
+def test_export_parquet_explicit_schema(tmp_path):
+    """Test that an explicit schema is used as-is, restricted to the provided columns."""
+    pa = pytest.importorskip("pyarrow")
+    pq = pytest.importorskip("pyarrow.parquet")
+    path = str(tmp_path / "rows.parquet")
+    schema = pa.schema([("deviceid", pa.string()), ("total_bytes", pa.float32())])
+    export_rows(ROWS, out=path, output_format="parquet", schema=schema)
+    table = pq.read_table(path)
+    assert table.schema == schema
+    assert table.column("deviceid").to_pylist() == ["1", "2", "3"]
@@ -0,0 +1,90 @@
+# -*- coding: utf-8 -*-
+"""Test the RISC connectivity graph."""
+import pytest
+
+from risc import graph as graph_module
+from risc.graph import ConnectivityGraph
+
+
+def make_row(source, dest, total_bytes=10, port=443, rtt=1.0, **kwargs):
+    """Build a device connectivity row between two device IDs."""
+    return dict(
+        source_deviceid=source,
+        dest_deviceid=dest,
+        total_bytes=total_bytes,
+        dest_port=port,
+        avg_rtt=rtt,
+        **kwargs,
+    )
+
+
+@pytest.fixture(params=["numpy", "array"])
+def backend(request, monkeypatch):
+    """Run the test with NumPy and with the stdlib array fallback."""
+    if request.param == "numpy":
+        pytest.importorskip("numpy")
+    else:
+        monkeypatch.setattr(graph_module, "np", None)
+    return request.param
+
+
+def test_merge_edges(backend):
+    """Test that the rows of a device pair are merged into one edge."""
+    graph = ConnectivityGraph()
+    graph.add_rows([make_row(1, 2, 10, rtt=1.0), make_row(1, 2, 30, port=80, rtt=3.0)])
+    graph.add_rows([make_row(2, 3, 5)], stack_id=2)
+    assert graph.edge_count == 2
+    assert list(graph.edges())[0] == {
+        "source": 1,
+        "dest": 2,
+        "total_bytes": 40,
+        "rows": 2,
+        "avg_rtt": 2.0,
+    }
+
+
+def test_duplicate_rows(backend):
+    """Test that a connection reported twice, e.g. by both stacks, is only counted once."""
+    graph = ConnectivityGraph()
+    graph.add_rows([make_row(1, 2, 10), make_row(1, 3, 5)], stack_id=1)
+    graph.add_rows([make_row(1, 2, 10), make_row(1, 2, 7, source_process="java")])
+    assert graph.duplicate_rows == 1
+    assert graph.top_pairs(1)[0]["total_bytes"] == 17
+    assert graph.top_pairs(1, weight="rows")[0]["rows"] == 2
+
+
+def test_queries(backend):
+    """Test the neighbor, component, cut edge and top pair queries."""
+    graph = ConnectivityGraph()
+    graph.add_rows([make_row(1, 2, 10)], stack_id=1)
+    graph.add_rows([make_row(3, 2, 50, rtt=9.0)], stack_id=2)
+    graph.add_rows([{"src_ip": "10.0.0.9", "dest_ip": "10.0.0.8"}])
+    assert sorted(edge["node"] for edge in graph.neighbors(2)) == [1, 3]
+    assert graph.neighbors(99) == []
+    assert graph.components() == [[1, 2, 3], ["10.0.0.9", "10.0.0.8"]]
+    assert graph.components(min_size=3) == [[1, 2, 3]]
+    assert graph.node_stack(3) == 2
+    assert [edge["source"] for edge in graph.top_pairs(1)] == [3]
+    assert [edge["source"] for edge in graph.top_pairs(1, weight="avg_rtt")] == [3]
+    with pytest.raises(ValueError):
+        graph.top_pairs(weight="total_flows")
+
+
+def test_cut_edges(backend):
+    """Test that only edges between two known, different stacks are cut edges."""
+    graph = ConnectivityGraph()
+    graph.add_rows([make_row(1, 2)], stack_id=1)
+    graph.add_rows([make_row(2, 4)], stack_id=2)
+    graph.add_rows([make_row(3, 5)], stack_id=3)
+    cuts = list(graph.cut_edges())
+    assert [(cut["source"], cut["dest"]) for cut in cuts] == [(1, 2)]
+    assert (cuts[0]["source_stack"], cuts[0]["dest_stack"]) == (1, 2)
+
+
+def test_client_graph(client, session):
+    """Test that rows repeated by the internal and external connectivity are deduplicated."""
+    graph = client.connectivity_graph(stack_ids="1,2")
+    rows = 2 * session.pages * session.per_page
+    assert graph.edge_count == rows
+    assert graph.duplicate_rows == rows
+    assert all(edge["rows"] == 1 for edge in graph.edges())
@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+"""Test the RISC models."""
+import pytest
+
+from risc.models import RiscDeviceConnectivityParent, RiscStacks
+
+from .fakes import make_stack
+
+
+def test_stacks_index():
+    """Test that stacks are indexed by ID and name, keeping the first duplicate name."""
+    duplicate = dict(make_stack(4), stack_name="Stack1")
+    stacks = RiscStacks(stacks=[make_stack(1), make_stack(2), duplicate])
+    assert stacks.get_by_id("2").stackid == 2
+    assert stacks.get_by_id(9) is None
+    assert stacks.get_by_name("stack1").stackid == 1
+    assert stacks.get_by_name("STACK1") is None
+    assert stacks.get_by_name("STACK1", case_sensitive=False).stackid == 1
+    assert stacks.get_by_name("Stack1").stackid == 4
+
+
+def test_lookup_stack_id(client, session):
+    """Test that stack names are resolved from the stack index."""
+    assert client.lookup_stack_id("stack2") == 2
+    assert client.lookup_stack_id("STACK3", case_sensitive=False) == 3
+    assert client.lookup_stack_id("missing") == ""
+    assert len([url for url in session.calls if url.endswith("getSummary")]) == 1
+
+
+def test_stack_index_refresh(client, session):
+    """Test that refreshing the stack data rebuilds the index."""
+    assert client.stacks.get_by_id(4) is None
+    session.stacks.append(make_stack(4))
+    client.refresh_stack_data()
+    assert client.stacks.get_by_id(4).stack_name == "stack4"
+    assert client.lookup_stack_id("stack4") == 4
+
+
+CONNECTIVITY = [
+    {"src_ip": "10.0.0.1", "total_bytes": 2 ** 40, "avg_rtt": 0.1, "vlan": 7},
+    {"src_ip": "10.0.0.2", "total_bytes": 10, "avg_rtt": 0.2, "vlan": 8},
+]
+
+
+def test_connectivity_unknown_keys():
+    """Test that keys missing from the model are ignored by the models but kept as rows."""
+    parent = RiscDeviceConnectivityParent(connectivity=CONNECTIVITY)
+    assert parent.connectivity[0].src_ip == "10.0.0.1"
+    assert parent.rows is CONNECTIVITY
+
+
+def test_connectivity_dataframe():
+    """Test that the DataFrame keeps unknown columns and wide numeric dtypes by default."""
+    pytest.importorskip("pandas")
+    frame = RiscDeviceConnectivityParent(connectivity=CONNECTIVITY).dataframe
+    assert frame["total_bytes"].dtype == "int64"
+    assert frame["total_bytes"].iloc[0] == 2 ** 40
+    assert frame["avg_rtt"].dtype == "float64"
+    assert frame["src_ip"].dtype == "category"
+    assert frame["vlan"].tolist() == [7, 8]
+
+
+def test_connectivity_dataframe_narrow():
+    """Test that narrowing the numeric dtypes is opt-in."""
+    pytest.importorskip("pandas")
+    parents = [
+        RiscDeviceConnectivityParent(connectivity=CONNECTIVITY[:1]),
+        RiscDeviceConnectivityParent(connectivity=CONNECTIVITY[1:]),
+    ]
+    frame = RiscDeviceConnectivityParent.concat_dataframes(
+        parents, keys=[1, 2], narrow=True
+    )
+    assert frame["stackid"].tolist() == [1, 2]
+    assert frame["avg_rtt"].dtype == "float32"
+    assert frame["vlan"].tolist() == [7, 8]
@@ -0,0 +1,115 @@
+# -*- coding: utf-8 -*-
+"""Test the RISC page iterators."""
+import pytest
+
+from risc import RiscPageError
+from risc.utils import page_records
+
+from .fakes import make_response
+
+PAGE_OPTIONS = pytest.mark.parametrize(
+    "options",
+    [{}, {"prefetch": True}, {"workers": 3}],
+    ids=["serial", "prefetch", "workers"],
+)
+
+
+def test_page_records_success():
+    """Test that the records of a 200 page are returned."""
+    response = make_response({"assets": [{"deviceid": 1}]})
+    assert page_records(response, "assets") == [{"deviceid": 1}]
+    assert page_records(make_response({"assets": None}), "assets") == []
+
+
+@pytest.mark.parametrize("status_code", [401, 403, 404, 500])
+def test_page_records_status_error(status_code):
+    """Test that a failed page raises instead of ending the listing."""
+    with pytest.raises(RiscPageError) as error:
+        page_records(make_response({}, status_code=status_code), "assets")
+    assert error.value.status_code == status_code
+
+
+def test_page_records_decode_error():
+    """Test that an undecodable page raises."""
+    response = make_response({})
+    response._content = b"not json"
+    with pytest.raises(RiscPageError):
+        page_records(response, "assets")
+
+
+@PAGE_OPTIONS
+def test_iter_assets_all_pages(client, session, options):
+    """Test that every page is yielded until the first empty page."""
+    assets = list(client.iter_assets(stack_id=1, **options))
+    assert len(assets) == session.pages * session.per_page
+    assert len({asset["deviceid"] for asset in assets}) == len(assets)
+
+
+def test_iter_assets_start_page(client, session):
+    """Test that pages before the start page are skipped."""
+    assets = list(client.iter_assets(stack_id=1, start_page=2))
+    assert len(assets) == session.per_page
+    pages = [request["headers"].get("page") for request in session.requests]
+    assert pages[-2:] == ["2", "3"]
+
+
+@PAGE_OPTIONS
+def test_iter_assets_page_error(client, session, options):
+    """Test that a failed page raises rather than silently truncating the assets."""
+    session.failed_pages[2] = 403
+    with pytest.raises(RiscPageError):
+        list(client.iter_assets(stack_id=1, **options))
+
+
+def test_iter_device_connectivity(client, session):
+    """Test that the connectivity of every page is yielded as model objects."""
+    rows = list(client.iter_device_connectivity(stack_id=1))
+    assert len(rows) == session.pages * session.per_page
+    assert rows[0].src_ip == "10.1.1.0"
+
+
+def test_iter_device_connectivity_page_error(client, session):
+    """Test that a failed connectivity page raises."""
+    session.failed_pages[1] = 500
+    with pytest.raises(RiscPageError):
+        list(client.iter_device_connectivity(stack_id=1))
+
+
+def test_iter_device_connectivity_invalid_type(client, session):
+    """Test that an unknown connectivity type yields nothing without any request."""
+    assert (
+        list(client.iter_device_connectivity(stack_id=1, connectivity_type="x")) == []
+    )
+    assert session.calls == []
+
+
+def test_iter_ucel_assets(client, session):
+    """Test that the UCEL asset pages of a check are followed to the end."""
+    assets = list(client.iter_ucel_assets(check_id="7"))
+    assert len(assets) == session.pages * session.per_page
+    assert all("ucel/getAssets/paginated/7" in url for url in session.calls[1:])
+
+
+def test_assets_get_assets_bulk(client, session):
+    """Test that the assets of every stack are fetched and returned in order."""
+    results = list(client.assets_get_assets_bulk(stack_ids=[3, 1, 2]))
+    assert [stack_id for stack_id, _ in results] == [3, 1, 2]
+    assert all(response.status_code == 200 for _, response in results)
+
+
+def test_assets_get_assets_bulk_device_ids(client, session):
+    """Test that device IDs are used when no stack IDs are provided."""
+    results = dict(client.assets_get_assets_bulk(device_ids="a1,b2"))
+    assert sorted(results) == ["a1", "b2"]
+    assert sorted(url.rsplit("/", 1)[1] for url in session.calls[1:]) == ["a1", "b2"]
+
+
+def test_stacks_get_device_connectivity_bulk(client, session):
+    """Test that the connectivity of every stack is fetched concurrently."""
+    results = dict(
+        client.stacks_get_device_connectivity_bulk(stack_ids="1,2", ordered=False)
+    )
+    assert sorted(results) == [1, 2]
+    assert all(
+        len(parent.connectivity) == session.per_page for parent in results.values()
+    )
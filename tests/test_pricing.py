@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+"""Test the RISC IaaS pricing service."""
+import pytest
+
+from risc.cache import ResponseCache
+from risc.pricing import PricingService, normalize_payload, quote_key
+
+
+def pricing_calls(session):
+    """Get the payloads of the iaas/pricing requests sent."""
+    return [
+        request["json"]
+        for request in session.requests
+        if request["url"].endswith("iaas/pricing")
+    ]
+
+
+@pytest.mark.parametrize("value", [4, 4.0, "4", " 4.0 "])
+def test_normalize_payload(value):
+    """Test that equivalent payload shapes produce the same quote key."""
+    payload = normalize_payload({"cpus": value, " region ": " us-east-1", "os": ""})
+    assert payload == {"cpus": 4, "region": "us-east-1"}
+    assert quote_key(payload) == quote_key(
+        normalize_payload({"region": "us-east-1", "cpus": 4})
+    )
+
+
+def test_quote_many_dedupe(client, session):
+    """Test that each distinct quote is requested once, sending the first payload seen."""
+    payloads = [{"cpus": "2"}, {"cpus": 4}, {"cpus": 2.0}, {"cpus": "4 "}]
+    quotes = client.iaas_pricing_bulk(payloads)
+    assert sorted(pricing_calls(session), key=str) == [{"cpus": "2"}, {"cpus": 4}]
+    assert quotes == [{"quote": {"cpus": "2"}}, {"quote": {"cpus": 4}}] * 2
+    assert client.pricing.requests == 2
+
+
+def test_quote_cached(client, session):
+    """Test that cached quotes aren't requested again, and failures aren't cached."""
+    session.statuses["iaas/pricing"] = [500]
+    client.retry_policy.total = 0
+    assert client.pricing.quote({"cpus": 1}) is None
+    assert client.pricing.quote({"cpus": 1}) == {"quote": {"cpus": 1}}
+    assert client.pricing.quote({"cpus": "1"}) == {"quote": {"cpus": 1}}
+    assert len(pricing_calls(session)) == 2
+    assert client.pricing.stats["requests"] == 2
+
+
+def test_quote_assessment_scope(client, session):
+    """Test that a shared quote cache is scoped to the assessment of each client."""
+    cache = ResponseCache(maxsize=10, default_ttl=60, ttls={})
+    PricingService(client, cache=cache).quote({"cpus": 1})
+    other = client.for_assessment("other-assessment")
+    PricingService(other, cache=cache).quote({"cpus": 1})
+    assert len(pricing_calls(session)) == 2
@@ -0,0 +1,38 @@
+# -*- coding: utf-8 -*-
+"""Test the RISC slotted records."""
+import pytest
+
+from risc.records import DeviceConnectivityRecord, StackConnectivityRecord
+
+
+def test_record_fields():
+    """Test that records keep their model fields only, with the model defaults."""
+    record = DeviceConnectivityRecord.from_dict(
+        {"src_ip": "10.0.0.1", "dest_port": 443, "unknown": 1}
+    )
+    assert record.src_ip == "10.0.0.1"
+    assert record.dest_port == 443
+    assert "unknown" not in record.to_dict
+    assert set(record.to_dict) == set(DeviceConnectivityRecord.__slots__)
+    assert not hasattr(record, "__dict__")
+    assert not hasattr(record, "response")
+
+
+def test_record_equality():
+    """Test that records compare by value and are deliberately unhashable."""
+    first, second, third = DeviceConnectivityRecord.from_dicts(
+        [{"src_ip": "10.0.0.1"}, {"src_ip": "10.0.0.1"}, {"src_ip": "10.0.0.2"}]
+    )
+    assert first == second
+    assert first != third
+    assert first != StackConnectivityRecord()
+    with pytest.raises(TypeError):
+        hash(first)
+
+
+def test_compact_connectivity(client, session):
+    """Test that compact connectivity holds records instead of models."""
+    parent = client.stacks_get_device_connectivity(stack_id=1, page=1, compact=True)
+    assert len(parent.connectivity) == session.per_page
+    assert all(isinstance(row, DeviceConnectivityRecord) for row in parent.connectivity)
+    assert parent.connectivity[0].src_ip == "10.1.1.0"
@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+"""Test the RISC host resolution helpers."""
+from risc.main import RISC
+
+
+def make_host(hostname, disks=()):
+    """Build an asset search result for the provided hostname."""
+    return {
+        "hostname": hostname,
+        "data": {"hostname": hostname, "disks_logical": list(disks)},
+    }
+
+
+def make_disk(name, size, free, disk_type="Local Disk"):
+    """Build a logical disk of an asset."""
+    return {
+        "disk_name": name,
+        "disk_type": disk_type,
+        "disk_size_bytes": str(size),
+        "disk_free_space_bytes": str(free),
+    }
+
+
+def search_calls(session):
+    """Get the search terms sent to the asset search endpoint."""
+    return [url.rsplit("/", 1)[1] for url in session.calls if "assets/search/" in url]
+
+
+def test_index_servers():
+    """Test that list data, top-level values and nested values are indexed in that order."""
+    index = RISC.index_servers(
+        [
+            {"data": [{"hostname": "Web"}, {"other": 1}]},
+            {"hostname": "db", "data": {"ips": []}},
+            {"data": {"hostname": "app"}},
+            {"data": {"hostname": "WEB"}},
+        ]
+    )
+    assert index["web"] == {"hostname": "Web"}
+    assert index["db"] == {"ips": []}
+    assert index["app"] == {"data": {"hostname": "app"}}
+
+
+def test_get_server(client, session):
+    """Test that the search result matching the hostname is returned."""
+    session.search["web"] = [make_host("web1"), make_host("web")]
+    assert client.get_server("web")["hostname"] == "web"
+    assert client.get_server("missing") == {}
+
+
+def test_get_servers(client, session):
+    """Test that duplicate hosts are searched once and indexed hosts aren't searched."""
+    session.search["web"] = [make_host("web"), make_host("web2")]
+    session.search["db"] = [make_host("db")]
+    servers = client.get_servers("web, WEB,web2,db,missing", workers=1)
+    assert list(servers) == ["web", "WEB", "web2", "db", "missing"]
+    assert servers["WEB"]["hostname"] == "web"
+    assert servers["web2"]["hostname"] == "web2"
+    assert servers["missing"] == {}
+    assert search_calls(session) == ["web", "db", "missing"]
+
+
+def test_get_disks_bulk(client, session):
+    """Test that the disks of every host are sized, skipping non-local disks."""
+    gib = 1024 ** 3
+    session.search["web"] = [
+        make_host(
+            "web",
+            [make_disk("C:", 100 * gib, 60 * gib), make_disk("D:", gib, 0, "CD-ROM")],
+        )
+    ]
+    disks = client.get_disks_bulk(["web", "db"], fudge_factor=2)
+    assert list(disks["web"]) == ["C"]
+    assert disks["web"]["C"]["usage"] == {"size": 40, "label": "GB"}
+    assert disks["web"]["C"]["drive_sizing_estimations"] == {"size": 80, "label": "GB"}
+    assert disks["db"] == {}
@@ -0,0 +1,213 @@
+# -*- coding: utf-8 -*-
+"""Test the RISC local snapshot."""
+import pytest
+
+from risc.snapshot import RiscSnapshot
+
+from .fakes import make_stack
+
+
+@pytest.fixture
+def snapshot(client, tmp_path):
+    """Get a snapshot of the fake assessment."""
+    snapshot = RiscSnapshot(str(tmp_path / "snapshot.db"))
+    snapshot.refresh(client, connectivity=False)
+    yield snapshot
+    snapshot.close()
+
+
+def stack_counts(snapshot):
+    """Get the number of stored assets per stack."""
+    return dict(
+        snapshot.connection.execute(
+            "SELECT stackid, COUNT(*) FROM assets GROUP BY stackid"
+        ).fetchall()
+    )
+
+
+def fingerprints(snapshot):
+    """Get the stored fingerprint of each stack."""
+    return dict(
+        snapshot.connection.execute("SELECT stackid, fingerprint FROM fingerprints")
+    )
+
+
+def index_names(snapshot):
+    """Get the names of the snapshot indexes."""
+    rows = snapshot.connection.execute(
+        "SELECT name FROM sqlite_master WHERE type = 'index' AND sql IS NOT NULL"
+    )
+    return sorted(name for (name,) in rows)
+
+
+def test_refresh(snapshot, session):
+    """Test that a refresh stores the assets of every stack."""
+    per_stack = session.pages * session.per_page
+    assert stack_counts(snapshot) == {1: per_stack, 2: per_stack, 3: per_stack}
+    assert snapshot.assessment_code == "test-assessment"
+    assert snapshot.refreshed_at
+
+
+def test_indexes(snapshot):
+    """Test that stack names and lookup columns are only indexed ignoring case."""
+    assert index_names(snapshot) == [
+        "idx_assets_deviceid_nocase",
+        "idx_assets_hostname",
+        "idx_assets_identifying_ip_nocase",
+        "idx_assets_stackid",
+        "idx_connectivity_dest",
+        "idx_connectivity_source",
+        "idx_connectivity_stackid",
+        "idx_stacks_name_nocase",
+        "idx_tags_stackid",
+    ]
+
+
+def test_lookups(snapshot):
+    """Test that offline lookups ignore case like the online lookups."""
+    assert snapshot.lookup_stack_id("stack2") == 2
+    assert snapshot.lookup_stack_id("STACK2") == ""
+    assert snapshot.lookup_stack_id("STACK2", case_sensitive=False) == 2
+    assert snapshot.get_server("HOST210")["identifying_ip"] == "10.2.1.0"
+    assert snapshot.get_server("10.3.2.1", compare="identifying_ip")["hostname"] == (
+        "host321"
+    )
+    assert snapshot.get_server("321", compare="deviceid")["hostname"] == "host321"
+    assert snapshot.get_server("missing") == {}
+    assert snapshot.get_application_ips("stack1") == [
+        "10.1.1.0",
+        "10.1.1.1",
+        "10.1.2.0",
+        "10.1.2.1",
+    ]
+    with pytest.raises(ValueError):
+        snapshot.get_server("host110", compare="os")
+
+
+def test_client_snapshot_path(snapshot, client, session):
+    """Test that a configured snapshot serves the client lookups without any request."""
+    client.snapshot_path = snapshot.path
+    calls = len(session.calls)
+    assert client.lookup_stack_id("stack3") == 3
+    assert client.get_server("HOST311") == {
+        "hostname": "host311",
+        "identifying_ip": "10.3.1.1",
+    }
+    assert client.get_application_ips("stack2") == [
+        "10.2.1.0",
+        "10.2.1.1",
+        "10.2.2.0",
+        "10.2.2.1",
+    ]
+    assert len(session.calls) == calls
+
+
+def test_client_snapshot_fallback(snapshot, client, session, tmp_path):
+    """Test that a missing or foreign snapshot falls back to the RISC API."""
+    client.snapshot_path = str(tmp_path / "missing.db")
+    assert client.local_snapshot is None
+    assert not (tmp_path / "missing.db").exists()
+
+    client.snapshot_path = snapshot.path
+    client.assessment_code = "other-assessment"
+    assert client.local_snapshot is None
+    session.search["host110"] = [{"hostname": "host110", "data": {"deviceid": 1}}]
+    assert client.get_server("host110") == {"deviceid": 1}
+
+
+def test_refresh_device_types(client, session, tmp_path, monkeypatch):
+    """Test that devices outside of any stack are stored once, under their first type."""
+    session.device_types = {"server": 1, "switch": 0, "printer": 0}
+    calls = []
+    device_ids = RiscSnapshot._device_ids
+    monkeypatch.setattr(
+        RiscSnapshot,
+        "_device_ids",
+        lambda self: calls.append(1) or device_ids(self),
+    )
+    snapshot = RiscSnapshot(str(tmp_path / "types.db"))
+    snapshot.refresh(client, connectivity=False)
+    rows = snapshot.connection.execute(
+        "SELECT device_type, COUNT(*) FROM assets WHERE stackid IS NULL "
+        "GROUP BY device_type"
+    ).fetchall()
+    assert rows == [("switch", session.pages * session.per_page)]
+    assert len(calls) == 1
+    snapshot.close()
+
+
+def test_sync_unchanged(snapshot, client, session):
+    """Test that a sync without changes only fetches the stack summary."""
+    calls = len(session.calls)
+    changes = snapshot.sync(client, connectivity=False)
+    assert changes["unchanged"] == [1, 2, 3]
+    assert not changes["added"] + changes["changed"] + changes["removed"]
+    assert all("getSummary" in url for url in session.calls[calls:])
+
+
+def test_sync_changes(snapshot, client, session):
+    """Test that a sync re-fetches changed and added stacks and deletes removed ones."""
+    session.stacks = [make_stack(1, members=5), make_stack(2), make_stack(4)]
+    changes = snapshot.sync(client, connectivity=False)
+    assert changes["added"] == [4]
+    assert changes["changed"] == [1]
+    assert changes["removed"] == [3]
+    assert changes["unchanged"] == [2]
+    assert changes["failed"] == []
+    assert sorted(stack_counts(snapshot)) == [1, 2, 4]
+    assert sorted(fingerprints(snapshot)) == [1, 2, 4]
+
+
+@pytest.mark.parametrize("status_code", [500, 200])
+def test_sync_summary_failure(snapshot, client, session, status_code):
+    """Test that a failed or empty stack summary leaves the snapshot untouched."""
+    before = (stack_counts(snapshot), fingerprints(snapshot))
+    session.summary_status = status_code
+    session.stacks = []
+    changes = snapshot.sync(client, connectivity=False)
+    assert not any(changes.values())
+    assert (stack_counts(snapshot), fingerprints(snapshot)) == before
+
+
+def test_sync_stack_failure(snapshot, client, session):
+    """Test that a stack failing to fetch keeps its data and fingerprint until retried."""
+    before = fingerprints(snapshot)
+    session.stacks = [make_stack(1, members=5), make_stack(2), make_stack(3)]
+    session.failed_stacks.add(1)
+    changes = snapshot.sync(client, connectivity=False)
+    assert changes["changed"] == [1]
+    assert changes["failed"] == [1]
+    assert fingerprints(snapshot)[1] == before[1]
+    assert stack_counts(snapshot)[1] == session.pages * session.per_page
+
+    session.failed_stacks.clear()
+    changes = snapshot.sync(client, connectivity=False)
+    assert changes["changed"] == [1]
+    assert changes["failed"] == []
+    assert fingerprints(snapshot)[1] != before[1]
+
+
+def test_device_stacks(snapshot, client, session):
+    """Test that device membership is read from the snapshot when no stack is provided."""
+    assert snapshot.get_device_stacks(["110", "321", "999"]) == {
+        "110": [1],
+        "321": [3],
+    }
+    client.snapshot_path = snapshot.path
+    calls = len(session.calls)
+    assert client.get_device_stacks(device_ids="110,221") == {"110": [1], "221": [2]}
+    assert len(session.calls) == calls
+
+
+def test_device_stacks_scope(client, session):
+    """Test that only the provided stacks are fetched, never every stack."""
+    assert client.get_device_stacks(stack_ids="2", device_ids="110,211") == {"211": [2]}
+    assert [url.rsplit("/", 1)[1] for url in session.calls if "byStack" in url] == [
+        "2"
+    ] * (session.pages + 1)
+
+    session.calls.clear()
+    assert client.get_device_stacks(device_ids="110") == {}
+    assert session.calls == []
+    with pytest.raises(ValueError):
+        client.get_device_stacks()
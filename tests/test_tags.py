@@ -0,0 +1,104 @@
+# -*- coding: utf-8 -*-
+"""Test the RISC bulk device tagging."""
+import pytest
+
+from risc.tags import dedupe_operations, existing_tags
+
+from .fakes import make_response
+
+
+@pytest.fixture
+def rejected(session, monkeypatch):
+    """Reject the tags/addTags batches holding any of the returned device IDs with a 400."""
+    devices = {"bad"}
+    request = session.request
+
+    def validate(method, url, **kwargs):
+        if url.endswith("tags/addTags"):
+            batch = {tag["deviceid"] for tag in kwargs["json"]["tags"]}
+            if batch & devices:
+                session.calls.append(url)
+                return make_response({"error": "invalid"}, status_code=400, url=url)
+        return request(method, url, **kwargs)
+
+    monkeypatch.setattr(session, "request", validate)
+    return devices
+
+
+def tag_batches(session):
+    """Get the device IDs of every tags/addTags request sent."""
+    return [
+        [tag["deviceid"] for tag in request["json"]["tags"]]
+        for request in session.requests
+        if request["url"].endswith("tags/addTags")
+    ]
+
+
+def statuses(report):
+    """Get the status of each device ID in a tagging report."""
+    return {item["deviceid"]: item["status"] for item in report}
+
+
+def test_dedupe_operations():
+    """Test that the last value set per device and key is kept, in its latest position."""
+    operations = [("1", "wave", "1"), {"deviceid": 2, "tagkey": "wave"}, (1, "wave", 2)]
+    assert dedupe_operations(operations) == [("2", "wave", ""), ("1", "wave", "2")]
+    with pytest.raises(ValueError):
+        dedupe_operations([("1", "wave")])
+    assert existing_tags(
+        {"tags": [{"deviceid": 1, "tagkey": "wave", "tagvalue": 3}]}
+    ) == {("1", "wave"): "3"}
+
+
+def test_skip_existing(client, session):
+    """Test that tags already set to the same value aren't sent."""
+    report = client.tags_add_tags_bulk(
+        [("1", "wave", "1"), ("2", "wave", "1")], existing={("1", "wave"): "1"}
+    )
+    assert statuses(report) == {"1": "skipped", "2": "added"}
+    assert tag_batches(session) == [["2"]]
+
+
+def test_validation_error_split(client, session, rejected):
+    """Test that a batch failing validation is split until the failing operation is isolated."""
+    operations = [(device, "wave", "1") for device in ("1", "2", "bad", "4")]
+    report = client.tags_add_tags_bulk(operations, existing={}, batch_size=4)
+    assert statuses(report) == {
+        "1": "added",
+        "2": "added",
+        "bad": "failed",
+        "4": "added",
+    }
+    assert report[2]["error"].startswith("HTTP 400")
+    assert session.calls.count(session.calls[-1]) == 5
+
+
+@pytest.mark.parametrize("status_code", [403, 404, 429, 500, 503])
+def test_batch_error_not_split(client, session, status_code):
+    """Test that a failure unrelated to the operations fails the batch without splitting it."""
+    session.statuses["tags/addTags"] = [status_code]
+    client.retry_policy.total = 0
+    operations = [(device, "wave", "1") for device in ("1", "2", "3", "4")]
+    report = client.tags_add_tags_bulk(operations, existing={}, batch_size=2)
+    assert [item["status"] for item in report].count("failed") == 2
+    assert [item["status"] for item in report].count("added") == 2
+    assert all(
+        item["error"].startswith(f"HTTP {status_code}")
+        for item in report
+        if item["status"] == "failed"
+    )
+    assert len([url for url in session.calls if url.endswith("tags/addTags")]) == 2
+
+
+def test_batch_exception(client, session, monkeypatch):
+    """Test that a request error fails the whole batch."""
+
+    def fail(payload):
+        raise RuntimeError("Connection reset")
+
+    monkeypatch.setattr(client, "tags_add_tags", fail)
+    report = client.tags_add_tags_bulk(
+        [("1", "wave", "1"), ("2", "wave", "1")], existing={}
+    )
+    assert statuses(report) == {"1": "failed", "2": "failed"}
+    assert all(item["error"] == "Connection reset" for item in report)
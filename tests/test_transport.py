@@ -0,0 +1,156 @@
+# -*- coding: utf-8 -*-
+"""Test the RISC HTTP transport."""
+import pytest
+from requests.adapters import HTTPAdapter
+from requests.exceptions import ConnectionError as RequestsConnectionError
+from requests.sessions import Session
+
+from risc.main import RISC
+from risc.transport import RateLimiter, RetryPolicy, build_session
+
+from .fakes import make_response
+
+
+def test_retry_policy_should_retry():
+    """Test that retries depend on the status, the method and the attempt count."""
+    policy = RetryPolicy(total=2)
+    assert policy.should_retry("GET", 0, response=make_response({}, status_code=503))
+    assert not policy.should_retry(
+        "GET", 2, response=make_response({}, status_code=503)
+    )
+    assert not policy.should_retry("GET", 0, response=make_response({}))
+    assert not policy.should_retry(
+        "GET", 0, response=make_response({}, status_code=404)
+    )
+    assert not policy.should_retry(
+        "POST", 0, response=make_response({}, status_code=503)
+    )
+    assert policy.should_retry("POST", 0, response=make_response({}, status_code=429))
+
+
+def test_retry_policy_should_retry_error():
+    """Test that only connection errors of idempotent methods are retried."""
+    policy = RetryPolicy()
+    assert policy.should_retry("get", 0, error=RequestsConnectionError())
+    assert not policy.should_retry("POST", 0, error=RequestsConnectionError())
+    assert not policy.should_retry("GET", 0, error=ValueError())
+
+
+def test_retry_policy_backoff():
+    """Test that the backoff is jittered below the exponential ceiling."""
+    policy = RetryPolicy(backoff_factor=1, max_backoff=5)
+    assert all(0 <= policy.backoff(1) <= 2 for _ in range(20))
+    assert all(policy.backoff(10) <= 5 for _ in range(20))
+
+
+@pytest.mark.parametrize(
+    "value,expected", [("3", 3.0), ("-1", 0.0), ("120", 60.0), ("soon", None)]
+)
+def test_retry_policy_retry_after(value, expected):
+    """Test that the Retry-After header takes precedence over the computed backoff."""
+    policy = RetryPolicy(backoff_factor=0, max_backoff=60)
+    response = make_response({}, status_code=429)
+    response.headers["Retry-After"] = value
+    if expected is None:
+        assert policy.retry_after(response) is None
+        assert policy.backoff(0, response=response) == 0
+    else:
+        assert policy.backoff(0, response=response) == expected
+
+
+def test_retry_after_date():
+    """Test that an HTTP date Retry-After header is converted to seconds."""
+    response = make_response({}, status_code=503)
+    response.headers["Retry-After"] = "Wed, 21 Oct 2015 07:28:00 GMT"
+    assert RetryPolicy.retry_after(response) == 0.0
+
+
+def test_rate_limiter(monkeypatch):
+    """Test that requests beyond the burst wait for a token."""
+    sleeps = []
+    monkeypatch.setattr("risc.transport.time.sleep", sleeps.append)
+    limiter = RateLimiter(rate=10, burst=2)
+    assert limiter.acquire() == 0
+    assert limiter.acquire() == 0
+    assert limiter.acquire() > 0
+    assert sleeps and sleeps[0] <= 0.1
+
+
+def test_rate_limiter_invalid():
+    """Test that a rate limit must be positive."""
+    with pytest.raises(ValueError):
+        RateLimiter(rate=0)
+
+
+def test_send_retries(client, session, monkeypatch):
+    """Test that failed GET requests are retried with the client retry policy."""
+    sleeps = []
+    monkeypatch.setattr("risc.main.time.sleep", sleeps.append)
+    client.retry_policy = RetryPolicy(total=2, backoff_factor=0)
+    session.statuses["assets/getSummary"] = [503, 500]
+    assert client.assets_get_summary().status_code == 200
+    assert len([url for url in session.calls if "assets/getSummary" in url]) == 3
+    assert len(sleeps) == 2
+
+
+def test_send_retries_exhausted(client, session, monkeypatch):
+    """Test that the last failed response is returned once the retries run out."""
+    monkeypatch.setattr("risc.main.time.sleep", lambda delay: None)
+    client.retry_policy = RetryPolicy(total=1, backoff_factor=0)
+    session.statuses["assets/getSummary"] = [503, 503, 503]
+    assert client.assets_get_summary().status_code == 503
+
+
+def test_send_rate_limit(client, session, monkeypatch):
+    """Test that every request, including the token request, takes a limiter token."""
+    acquired = []
+    client.rate_limiter = RateLimiter(rate=1000)
+    monkeypatch.setattr(client.rate_limiter, "acquire", lambda: acquired.append(1))
+    client.assets_get_summary()
+    assert len(acquired) == len(session.calls) == 2
+
+
+def test_build_session():
+    """Test that a new session mounts a pooled adapter."""
+    session = build_session(pool_maxsize=32)
+    adapter = session.get_adapter("https://api.riscnetworks.com")
+    assert adapter._pool_maxsize == 32
+    assert adapter._pool_connections == 10
+
+
+def test_build_session_provided():
+    """Test that a provided session is left alone unless an adapter or pool is set."""
+    session = Session()
+    adapter = session.get_adapter("https://api.riscnetworks.com")
+    headers = dict(session.headers)
+    assert build_session(session=session) is session
+    assert session.get_adapter("https://api.riscnetworks.com") is adapter
+
+    build_session(pool_maxsize=20, session=session)
+    assert session.get_adapter("https://api.riscnetworks.com")._pool_maxsize == 20
+    custom = HTTPAdapter()
+    build_session(adapter=custom, session=session)
+    assert session.get_adapter("http://localhost") is custom
+    assert dict(session.headers) == headers
+
+
+def test_client_provided_session(monkeypatch):
+    """Test that RISC only mounts an adapter on a provided session for explicit pools."""
+    session = Session()
+    adapter = session.get_adapter("https://api.riscnetworks.com")
+    headers = dict(session.headers)
+    RISC(lazy=True, session=session)
+    assert session.get_adapter("https://api.riscnetworks.com") is adapter
+    monkeypatch.setenv("RISC_POOL_MAXSIZE", "24")
+    RISC(lazy=True, session=session)
+    assert session.get_adapter("https://api.riscnetworks.com")._pool_maxsize == 24
+    assert dict(session.headers) == headers
+
+
+def test_client_headers(client, session):
+    """Test that the User-Agent and keep-alive headers are sent with each request."""
+    client.keep_alive = False
+    client.assets_get_summary()
+    for request in session.requests:
+        assert request["headers"]["User-Agent"].startswith("risc-python")
+        assert request["headers"]["Connection"] == "close"
@@ -0,0 +1,131 @@
+# -*- coding: utf-8 -*-
+"""Test the RISC utilities."""
+import io
+import json
+import threading
+import time
+
+import pytest
+from requests.models import Response
+
+from risc import utils
+
+from .fakes import make_response
+
+
+@pytest.mark.parametrize(
+    "values,expected",
+    [
+        (None, []),
+        ("", []),
+        ("aws", ["aws"]),
+        ("aws, azure,,gcp", ["aws", "azure", "gcp"]),
+        (("aws", "azure"), ["aws", "azure"]),
+        (["aws", " "], ["aws"]),
+        (3, ["3"]),
+        ((1, 2), ["1", "2"]),
+    ],
+)
+def test_split_values(values, expected):
+    """Test that strings are split on commas and never iterated by character."""
+    assert utils.split_values(values) == expected
+
+
+@pytest.mark.parametrize(
+    "values,expected", [("12", [12]), (12, [12]), ("1, 2", [1, 2]), ((3, "4"), [3, 4])]
+)
+def test_split_ints(values, expected):
+    """Test that comma separated and iterable values are converted to integers."""
+    assert utils.split_ints(values) == expected
+
+
+def test_map_concurrent_ordered():
+    """Test that results are yielded in input order, whatever order they complete in."""
+    delays = [0.03, 0.01, 0.02, 0.0]
+
+    def call(index):
+        time.sleep(delays[index])
+        return index * 10
+
+    results = list(utils.map_concurrent(call, range(len(delays)), workers=4))
+    assert results == [(0, 0), (1, 10), (2, 20), (3, 30)]
+
+
+def test_map_concurrent_unordered():
+    """Test that unordered results are yielded as they complete."""
+    results = list(
+        utils.map_concurrent(
+            lambda delay: time.sleep(delay), [0.05, 0.0], ordered=False
+        )
+    )
+    assert [item for item, _ in results] == [0.0, 0.05]
+
+
+def test_map_concurrent_bounded():
+    """Test that no more than the worker count is in flight, even for a lazy iterable."""
+    lock = threading.Lock()
+    state = {"running": 0, "peak": 0, "consumed": 0}
+
+    def items():
+        for index in range(20):
+            state["consumed"] += 1
+            yield index
+
+    def call(item):
+        with lock:
+            state["running"] += 1
+            state["peak"] = max(state["peak"], state["running"])
+        time.sleep(0.002)
+        with lock:
+            state["running"] -= 1
+        return item
+
+    results = utils.map_concurrent(call, items(), workers=3)
+    next(results)
+    assert state["consumed"] <= 4
+    assert len(list(results)) == 19
+    assert state["peak"] <= 3
+
+
+def test_map_concurrent_error():
+    """Test that an error of the callable is raised to the consumer."""
+
+    def call(item):
+        if item == 2:
+            raise ValueError(item)
+        return item
+
+    with pytest.raises(ValueError):
+        list(utils.map_concurrent(call, range(4), workers=2))
+
+
+@pytest.mark.parametrize("backend", ["installed", "json"])
+def test_decode_json(monkeypatch, backend):
+    """Test that the body is decoded the same way by the fast and stdlib backends."""
+    if backend == "json":
+        monkeypatch.setattr(utils, "JSON_BACKEND", "json")
+    data = {"assets": [{"deviceid": 1, "ratio": 0.5, "name": "\u00e9"}]}
+    assert utils.decode_json(make_response(data)) == data
+
+
+def test_decode_json_httpx():
+    """Test that httpx responses are decoded too."""
+    httpx = pytest.importorskip("httpx")
+    assert utils.decode_json(httpx.Response(200, json={"token": "a"})) == {"token": "a"}
+
+
+def test_iter_json_items():
+    """Test that the items of a read body are yielded from the decoded body."""
+    response = make_response({"connectivity": [{"a": 1}, {"a": 2}]})
+    assert list(utils.iter_json_items(response, "connectivity")) == [{"a": 1}, {"a": 2}]
+    assert list(utils.iter_json_items(make_response({"connectivity": None}), "x")) == []
+
+
+def test_iter_json_items_streamed():
+    """Test that the items of a streamed body are parsed incrementally with ijson."""
+    pytest.importorskip("ijson")
+    response = Response()
+    response.status_code = 200
+    response.raw = io.BytesIO(json.dumps({"connectivity": [{"a": 1.5}]}).encode())
+    response.raw.decode_content = False
+    assert list(utils.iter_json_items(response, "connectivity")) == [{"a": 1.5}]